@@ -4,9 +4,30 @@
 
 use Illuminate\Http\Request;
 use Illuminate\Http\JsonResponse;
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
 
 class ArticleController extends Controller
 {
+    /**
+     * Articles 1-4 are fixed samples, one per status, that never change. Any other
+     * numeric id is a stored article: it starts as a draft and keeps its status,
+     * version and transition history in the cache.
+     */
+    private const SAMPLE_ARTICLE_IDS = [1, 2, 3, 4];
+
+    private const TRANSITION_RULES = [
+        'draft' => ['submit' => 'review'],
+        'review' => ['approve' => 'published', 'reject' => 'rejected'],
+        'published' => [],
+        'rejected' => ['resubmit' => 'review']
+    ];
+
+    /**
+     * Seconds a transition may hold, or wait for, an article's lock
+     */
+    private const LOCK_SECONDS = 5;
+
     /**
      * Get article workflow demo data
      *
@@ -17,6 +38,21 @@ class ArticleController extends Controller
     public function demo(Request $request, $id = 1)
     {
         try {
+            if ($this->isStoredArticle($id)) {
+                $article = $this->loadArticle($id);
+                $lastChange = end($article['history']);
+
+                // Every transition bumps the version, so it identifies the representation without hashing it
+                return $this->conditionalJson($request, [
+                    'success' => true,
+                    'data' => [
+                        'article' => $this->withoutHistory($article),
+                        'availableTransitions' => array_keys(self::TRANSITION_RULES[$article['status']]),
+                        'history' => $article['history']
+                    ]
+                ], "article-{$article['id']}-v{$article['version']}", $lastChange ? $lastChange['at'] : null);
+            }
+
             // Simulate article data
             $articles = [
                 1 => [
@@ -48,17 +84,10 @@ public function demo(Request $request, $id = 1)
             // Get the article or default to draft
             $article = $articles[$id] ?? $articles[1];
 
-            // Define available transitions based on current status
-            $transitions = [
-                'draft' => ['submit'],
-                'review' => ['approve', 'reject'],
-                'published' => [],
-                'rejected' => ['resubmit']
-            ];
-
-            $availableTransitions = $transitions[$article['status']] ?? [];
+            // Available transitions based on current status
+            $availableTransitions = array_keys(self::TRANSITION_RULES[$article['status']] ?? []);
 
-            return response()->json([
+            return $this->conditionalJson($request, [
                 'success' => true,
                 'data' => [
                     'article' => $article,
@@ -84,6 +113,10 @@ public function demo(Request $request, $id = 1)
     public function transition(Request $request, $id, $transition)
     {
         try {
+            if ($this->isStoredArticle($id)) {
+                return $this->transitionStoredArticle($id, $transition);
+            }
+
             // Simulate article data
             $articles = [
                 1 => [
@@ -115,13 +148,7 @@ public function transition(Request $request, $id, $transition)
             // Get the article or default to draft
             $article = $articles[$id] ?? $articles[1];
 
-            // Define transition rules
-            $transitionRules = [
-                'draft' => ['submit' => 'review'],
-                'review' => ['approve' => 'published', 'reject' => 'rejected'],
-                'published' => [],
-                'rejected' => ['resubmit' => 'review']
-            ];
+            $transitionRules = self::TRANSITION_RULES;
 
             // Check if transition is valid
             $availableTransitions = $transitionRules[$article['status']] ?? [];
@@ -161,4 +188,103 @@ public function transition(Request $request, $id, $transition)
             ], 500);
         }
     }
-}
\ No newline at end of file
+
+    /**
+     * Apply a transition to a stored article while holding its lock, so concurrent
+     * editors are serialised and every applied transition lands in the history
+     *
+     * @param string $id
+     * @param string $transition
+     * @return JsonResponse
+     */
+    private function transitionStoredArticle($id, $transition)
+    {
+        try {
+            return Cache::lock("article:{$id}:lock", self::LOCK_SECONDS)->block(self::LOCK_SECONDS, function () use ($id, $transition) {
+                $article = $this->loadArticle($id);
+                $previousStatus = $article['status'];
+                $availableTransitions = self::TRANSITION_RULES[$previousStatus];
+
+                if (!isset($availableTransitions[$transition])) {
+                    return response()->json([
+                        'success' => false,
+                        'error' => 'Invalid transition',
+                        'current_status' => $previousStatus,
+                        'available_transitions' => array_keys($availableTransitions),
+                        'version' => $article['version']
+                    ], 400);
+                }
+
+                $newStatus = $availableTransitions[$transition];
+                $article['status'] = $newStatus;
+                $article['version']++;
+                $article['history'][] = [
+                    'version' => $article['version'],
+                    'from' => $previousStatus,
+                    'transition' => $transition,
+                    'to' => $newStatus,
+                    'at' => microtime(true)
+                ];
+                Cache::forever($this->articleKey($id), $article);
+
+                return response()->json([
+                    'success' => true,
+                    'data' => [
+                        'article' => $this->withoutHistory($article),
+                        'previous_status' => $previousStatus,
+                        'transition_applied' => $transition,
+                        'new_status' => $newStatus,
+                        'available_transitions' => array_keys(self::TRANSITION_RULES[$newStatus]),
+                        'version' => $article['version'],
+                        'message' => "Article successfully transitioned from {$previousStatus} to {$newStatus} via {$transition}"
+                    ]
+                ]);
+            });
+        } catch (LockTimeoutException $e) {
+            return response()->json([
+                'success' => false,
+                'error' => 'Article is being updated by another request, please retry'
+            ], 409);
+        }
+    }
+
+    /**
+     * Whether the id refers to a stored article rather than one of the fixed samples
+     *
+     * @param mixed $id
+     * @return bool
+     */
+    private function isStoredArticle($id): bool
+    {
+        return ctype_digit((string) $id) && (int) $id > 0 && !in_array((int) $id, self::SAMPLE_ARTICLE_IDS, true);
+    }
+
+    private function articleKey($id): string
+    {
+        return "article:{$id}";
+    }
+
+    /**
+     * Load a stored article, creating it as a draft on first use
+     *
+     * @param string $id
+     * @return array
+     */
+    private function loadArticle($id): array
+    {
+        return Cache::get($this->articleKey($id)) ?? [
+            'id' => (int) $id,
+            'title' => "Article {$id}",
+            'content' => 'This is a sample article content.',
+            'status' => 'draft',
+            'version' => 0,
+            'history' => []
+        ];
+    }
+
+    private function withoutHistory(array $article): array
+    {
+        unset($article['history']);
+        return $article;
+    }
+}
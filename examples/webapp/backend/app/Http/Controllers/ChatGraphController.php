@@ -72,7 +72,12 @@ public function processChat(Request $request)
                     // Create model factory with API keys from config
                     $modelConfigs = [
                         'deepseek_api_key' => config('services.deepseek.key'),
-                        'qwen_api_key' => config('services.qwen.key')
+                        'qwen_api_key' => config('services.qwen.key'),
+                        'deepseek_base_url' => config('services.deepseek.base_url'),
+                        'qwen_base_url' => config('services.qwen.base_url'),
+                        'model_timeout' => config('services.model.timeout'),
+                        'model_retries' => config('services.model.retries'),
+                        'model_retry_delay' => config('services.model.retry_delay')
                     ];
                     
                     $factory = new ModelFactory($modelConfigs);
@@ -135,6 +140,7 @@ public function processChat(Request $request)
 
             // Compile the graph
             $compiled = $graph->compile();
+            $tracker = $this->trackNodeTimings($compiled);
 
             // Create initial state with channel definitions
             $channelDefs = [
@@ -155,11 +161,11 @@ public function processChat(Request $request)
             // Execute the workflow
             $finalState = $compiled->execute($initialState);
 
-            // Return the final state as JSON
-            return response()->json([
+            // Return the final state as JSON, with per-node times in the Server-Timing header
+            return $this->withServerTiming(response()->json([
                 'success' => true,
                 'data' => $finalState->getData()
-            ]);
+            ]), $compiled, $tracker);
         } catch (\Exception $e) {
             return response()->json([
                 'success' => false,
@@ -180,7 +186,7 @@ public function getConversationHistory(Request $request, $conversationId)
         try {
             // In a real implementation, you would fetch the conversation history from a database
             // For this example, we'll return a mock response
-            return response()->json([
+            return $this->conditionalJson($request, [
                 'success' => true,
                 'data' => [
                     'conversation_id' => $conversationId,
@@ -4,9 +4,76 @@
 
 use Illuminate\Foundation\Auth\Access\AuthorizesRequests;
 use Illuminate\Foundation\Validation\ValidatesRequests;
+use Illuminate\Http\JsonResponse;
+use Illuminate\Http\Request;
 use Illuminate\Routing\Controller as BaseController;
+use LangGraph\Agent\Monitoring\ExecutionTracker;
+use LangGraph\UnifiedGraph\CompiledGraph;
+use Symfony\Component\HttpFoundation\Response;
 
 class Controller extends BaseController
 {
     use AuthorizesRequests, ValidatesRequests;
+
+    /**
+     * Record the execution time of every node the compiled graph runs
+     *
+     * @param CompiledGraph $compiled
+     * @return ExecutionTracker
+     */
+    protected function trackNodeTimings(CompiledGraph $compiled): ExecutionTracker
+    {
+        $tracker = new ExecutionTracker();
+        $compiled->onNodeTiming(function (string $node, float $duration) use ($tracker) {
+            $tracker->recordTiming($node, $duration);
+        });
+
+        return $tracker;
+    }
+
+    /**
+     * Add the graph and per-node times to the response as a Server-Timing header
+     *
+     * @param Response $response
+     * @param CompiledGraph $compiled
+     * @param ExecutionTracker $tracker
+     * @return Response
+     */
+    protected function withServerTiming(Response $response, CompiledGraph $compiled, ExecutionTracker $tracker): Response
+    {
+        $response->headers->set('Server-Timing', $tracker->toServerTiming([
+            'graph' => $compiled->getExecutionTime()
+        ]));
+
+        return $response;
+    }
+
+    /**
+     * Return JSON with ETag/Last-Modified validators, or 304 Not Modified when the client's copy is current
+     *
+     * The ETag defaults to a hash of the body; callers that know a version can
+     * pass one instead. If-None-Match takes precedence over If-Modified-Since.
+     * Clients may keep the body but must revalidate before each use, so polling
+     * stays fresh while unchanged resources cost only a 304.
+     *
+     * @param Request $request
+     * @param array $data
+     * @param string|null $etag
+     * @param float|null $lastModified Unix timestamp of the last change
+     * @return JsonResponse
+     */
+    protected function conditionalJson(Request $request, array $data, ?string $etag = null, ?float $lastModified = null): JsonResponse
+    {
+        $response = response()->json($data);
+        $response->setEtag($etag ?? sha1($response->getContent()));
+        if ($lastModified !== null) {
+            $response->setLastModified((new \DateTime())->setTimestamp((int) $lastModified));
+        }
+        $response->headers->set('Cache-Control', 'private, no-cache');
+
+        // Turns the response into an empty 304 when If-None-Match / If-Modified-Since match
+        $response->isNotModified($request);
+
+        return $response;
+    }
 }
@@ -45,13 +45,14 @@ public function executeSimpleWorkflow(Request $request)
             
             // Compile and execute
             $compiled = $graph->compile();
+            $tracker = $this->trackNodeTimings($compiled);
             $initialState = new State(['workflow' => 'web_example']);
             $finalState = $compiled->execute($initialState);
             
-            return response()->json([
+            return $this->withServerTiming(response()->json([
                 'success' => true,
                 'data' => $finalState->getData()
-            ]);
+            ]), $compiled, $tracker);
         } catch (\Exception $e) {
             return response()->json([
                 'success' => false,
@@ -127,13 +128,14 @@ public function executeAdvancedWorkflow(Request $request)
             
             // Compile and execute
             $compiled = $graph->compile();
+            $tracker = $this->trackNodeTimings($compiled);
             $initialState = new State(['workflow' => 'advanced_web_example']);
             $finalState = $compiled->execute($initialState);
             
-            return response()->json([
+            return $this->withServerTiming(response()->json([
                 'success' => true,
                 'data' => $finalState->getData()
-            ]);
+            ]), $compiled, $tracker);
         } catch (\Exception $e) {
             return response()->json([
                 'success' => false,
@@ -44,7 +44,11 @@ public function testModel(Request $request)
             }
 
             $modelConfigs = [
-                $modelType . '_api_key' => $apiKey
+                $modelType . '_api_key' => $apiKey,
+                $modelType . '_base_url' => Config::get("services.{$modelType}.base_url"),
+                'model_timeout' => Config::get('services.model.timeout'),
+                'model_retries' => Config::get('services.model.retries'),
+                'model_retry_delay' => Config::get('services.model.retry_delay')
             ];
 
             // Create the model client using the factory
@@ -41,10 +41,11 @@ public function streamWorkflow(Request $request)
 
             // Return a streamed response
             return response()->stream(function () use ($workflowType, $task) {
-                // Send initial message
+                // Send initial message; every event carries its send time so clients can measure delivery lag
                 echo 'data: ' . json_encode([
                     'status' => 'started',
-                    'message' => 'Workflow started'
+                    'message' => 'Workflow started',
+                    'timestamp' => microtime(true)
                 ]) . "\n\n";
                 flush();
 
@@ -64,7 +65,8 @@ public function streamWorkflow(Request $request)
                     echo 'data: ' . json_encode([
                         'status' => 'processing',
                         'step' => $step,
-                        'progress' => ($i + 1) . '/' . count($steps)
+                        'progress' => ($i + 1) . '/' . count($steps),
+                        'timestamp' => microtime(true)
                     ]) . "\n\n";
                     flush();
                 }
@@ -73,13 +75,15 @@ public function streamWorkflow(Request $request)
                 echo 'data: ' . json_encode([
                     'status' => 'completed',
                     'message' => 'Workflow completed successfully',
-                    'result' => $this->generateSampleResult($workflowType, $task)
+                    'result' => $this->generateSampleResult($workflowType, $task),
+                    'timestamp' => microtime(true)
                 ]) . "\n\n";
                 flush();
 
                 // Send finish message
                 echo 'data: ' . json_encode([
-                    'status' => 'finished'
+                    'status' => 'finished',
+                    'timestamp' => microtime(true)
                 ]) . "\n\n";
                 flush();
             }, 200, [
@@ -5,11 +5,18 @@
 use Illuminate\Http\Request;
 use Illuminate\Http\JsonResponse;
 use Illuminate\Http\StreamedResponse;
+use Illuminate\Support\Facades\Cache;
 use LangGraph\UnifiedGraph\StateGraph;
 use LangGraph\UnifiedGraph\State\State;
 
 class WorkflowValidationController extends Controller
 {
+    /**
+     * Seconds a polled report keeps its generation time (and so its validators); ids are chosen by
+     * the client, so the cache entries must expire rather than accumulate
+     */
+    private const REPORT_TTL_SECONDS = 86400;
+
     /**
      * Validate a workflow and stream the validation process
      *
@@ -186,30 +193,45 @@ public function validateWorkflow(Request $request)
                 'validation_id' => $validationId
             ]);
 
+            $requestId = $request->attributes->get('request_id');
+
             // Return a streamed response
-            return response()->stream(function () use ($compiled, $initialState) {
+            return response()->stream(function () use ($compiled, $initialState, $requestId) {
                 try {
                     // Send initial message
                     echo "data: " . json_encode([
                         'status' => 'started',
-                        'message' => 'Starting workflow validation...'
+                        'message' => 'Starting workflow validation...',
+                        'request_id' => $requestId
                     ]) . "\n\n";
                     flush();
 
                     // Execute the workflow and get final state
                     $finalState = $compiled->execute($initialState);
                     $data = $finalState->getData();
+
+                    // Headers are already sent, so node times travel on the events instead of Server-Timing
+                    $nodeTimings = [];
+                    foreach ($compiled->getNodeTimings() as $timing) {
+                        $nodeTimings[$timing['node']] = ($nodeTimings[$timing['node']] ?? 0) + $timing['duration'];
+                    }
                     
                     // Send progress updates
                     $progressSteps = [
-                        ['progress' => 10, 'status' => 'input_validation', 'message' => 'Validating input...'],
-                        ['progress' => 30, 'status' => 'structure_validation', 'message' => 'Validating structure...'],
-                        ['progress' => 60, 'status' => 'rule_validation', 'message' => 'Applying validation rules...'],
-                        ['progress' => 90, 'status' => 'execution_simulation', 'message' => 'Simulating execution...'],
-                        ['progress' => 100, 'status' => 'report_generation', 'message' => 'Generating report...']
+                        ['progress' => 10, 'status' => 'input_validation', 'message' => 'Validating input...', 'node' => 'input_validator'],
+                        ['progress' => 30, 'status' => 'structure_validation', 'message' => 'Validating structure...', 'node' => 'structure_validator'],
+                        ['progress' => 60, 'status' => 'rule_validation', 'message' => 'Applying validation rules...', 'node' => 'rule_validator'],
+                        ['progress' => 90, 'status' => 'execution_simulation', 'message' => 'Simulating execution...', 'node' => 'execution_simulator'],
+                        ['progress' => 100, 'status' => 'report_generation', 'message' => 'Generating report...', 'node' => 'report_generator']
                     ];
                     
                     foreach ($progressSteps as $step) {
+                        $node = $step['node'];
+                        unset($step['node']);
+                        $step['timing'] = [
+                            'node' => $node,
+                            'duration_ms' => round(($nodeTimings[$node] ?? 0) * 1000, 3)
+                        ];
                         echo "data: " . json_encode($step) . "\n\n";
                         flush();
                         usleep(500000); // 0.5 second delay for demo
@@ -221,7 +243,11 @@ public function validateWorkflow(Request $request)
 
                     // Send finish message
                     echo "data: " . json_encode([
-                        'status' => 'finished'
+                        'status' => 'finished',
+                        'timing' => [
+                            'graph_ms' => round($compiled->getExecutionTime() * 1000, 3),
+                            'nodes_ms' => round(array_sum($nodeTimings) * 1000, 3)
+                        ]
                     ]) . "\n\n";
                     flush();
                 } catch (\Exception $e) {
@@ -257,12 +283,17 @@ public function getValidationReport(Request $request, $validationId)
     {
         try {
             // In a real implementation, you would fetch the validation report from a database
-            // For this example, we'll return a mock response
-            return response()->json([
+            // For this example, we'll return a mock response. The report is generated once per
+            // validation id (for a day), so repeated polls see the same representation and can be answered with 304.
+            $generatedAt = Cache::remember("validation_report:{$validationId}:generated_at", self::REPORT_TTL_SECONDS, function () {
+                return time();
+            });
+
+            return $this->conditionalJson($request, [
                 'success' => true,
                 'data' => [
                     'validation_id' => $validationId,
-                    'timestamp' => date('Y-m-d H:i:s'),
+                    'timestamp' => date('Y-m-d H:i:s', $generatedAt),
                     'workflow_name' => 'Sample Workflow',
                     'is_valid' => true,
                     'errors' => [],
@@ -272,7 +303,7 @@ public function getValidationReport(Request $request, $validationId)
                         'error_count' => 0
                     ]
                 ]
-            ]);
+            ], null, $generatedAt);
         } catch (\Exception $e) {
             return response()->json([
                 'success' => false,
@@ -0,0 +1,39 @@
+<?php
+
+namespace App\Http\Middleware;
+
+use Closure;
+use Illuminate\Http\Request;
+use Symfony\Component\HttpFoundation\Response;
+
+class ServerTiming
+{
+    /**
+     * Tag every request with an id and report the total application time.
+     *
+     * The incoming X-Request-Id is kept (or one is generated) and echoed back so
+     * client-side measurements can be correlated with server-side ones. An
+     * "app" metric, measured from LARAVEL_START, is appended to whatever
+     * Server-Timing entries the controller already set (graph and node times).
+     *
+     * @param  \Closure(\Illuminate\Http\Request): (\Symfony\Component\HttpFoundation\Response)  $next
+     */
+    public function handle(Request $request, Closure $next): Response
+    {
+        $requestId = $request->header('X-Request-Id') ?: uniqid('req_', true);
+        $request->attributes->set('request_id', $requestId);
+
+        $response = $next($request);
+
+        // For streamed responses this covers the time until the stream starts, not the stream itself
+        $start = defined('LARAVEL_START') ? LARAVEL_START : $request->server('REQUEST_TIME_FLOAT', microtime(true));
+        $app = sprintf('app;dur=%.3f', (microtime(true) - $start) * 1000);
+        $existing = $response->headers->get('Server-Timing');
+
+        $response->headers->set('Server-Timing', $existing ? "{$app}, {$existing}" : $app);
+        $response->headers->set('X-Request-Id', $requestId);
+        $response->headers->set('Timing-Allow-Origin', '*');
+
+        return $response;
+    }
+}
@@ -25,7 +25,7 @@
 
     'allowed_headers' => ['*'],
 
-    'exposed_headers' => [],
+    'exposed_headers' => ['Server-Timing', 'X-Request-Id'],
 
     'max_age' => 0,
 
@@ -39,10 +39,21 @@
 
     'deepseek' => [
         'key' => env('DEEPSEEK_API_KEY'),
+        // Point at any OpenAI-compatible server, e.g. the harness's mock model
+        'base_url' => env('DEEPSEEK_BASE_URL'),
     ],
 
     'qwen' => [
         'key' => env('QWEN_API_KEY'),
+        'base_url' => env('QWEN_BASE_URL'),
+    ],
+
+    'model' => [
+        // Upstream request timeout in seconds (the clients default to 60)
+        'timeout' => env('MODEL_TIMEOUT'),
+        // Retries of failed non-streaming requests through RetryMechanism (off by default) and the delay in ms
+        'retries' => env('MODEL_RETRIES'),
+        'retry_delay' => env('MODEL_RETRY_DELAY'),
     ],
 
 ];
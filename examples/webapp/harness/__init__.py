@@ -0,0 +1,9 @@
+"""
+Performance and load-testing helpers for the LangGraph PHP MVP web application.
+
+The validation scripts (test_apis.py, test_core_features.py) check that each
+endpoint works; the modules in this package measure how the endpoints behave
+under load.
+"""
+
+BASE_URL = "http://localhost:8000/api"
@@ -0,0 +1,224 @@
+"""
+Capacity search: the highest request rate each endpoint sustains within a latency SLO.
+
+For every endpoint the offered load is ramped geometrically with open-loop
+(constant arrival) steps until the p99 SLO, the error budget or the achieved
+throughput breaks, then refined by binary search between the last passing and
+the first failing rate. The report lists the knee (max sustainable req/s) and
+the full saturation curve. With --record the result is appended to the
+benchmark history under a label, so backend configurations (worker count,
+opcache on/off) can be compared with --baseline.
+
+Usage:
+    python3 -m harness.capacity --endpoints langgraph_advanced --slo-ms 500 --record --label opcache-on
+    python3 -m harness.capacity --endpoints langgraph_advanced --slo-ms 500 --baseline opcache-on
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional
+
+from . import BASE_URL
+from .history import DEFAULT_HISTORY_PATH, HistoryStore, new_record
+from .load import DEFAULT_ENDPOINTS
+from .open_loop import OpenLoopTester
+from .scenarios import Scenario
+
+
+class CapacityStep:
+    """Outcome of one open-loop step at a fixed offered rate."""
+
+    __slots__ = ('rate', 'achieved', 'requests', 'error_rate', 'p50', 'p99', 'passed', 'reason')
+
+    def __init__(self, rate: float, achieved: float, requests: int, error_rate: float,
+                 p50: float, p99: float, passed: bool, reason: str):
+        self.rate = rate
+        self.achieved = achieved
+        self.requests = requests
+        self.error_rate = error_rate
+        self.p50 = p50
+        self.p99 = p99
+        self.passed = passed
+        self.reason = reason
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CapacitySearch:
+    """Ramp and bisect the offered load per endpoint until the SLO breaks."""
+
+    def __init__(self, base_url: str = BASE_URL, endpoints: List[Scenario] = None, slo_ms: float = 500.0,
+                 error_budget: float = 0.01, start_rate: float = 1.0, growth: float = 2.0,
+                 max_rate: float = 2000.0, refine_steps: int = 4, step_duration: float = 10.0,
+                 cooldown: float = 2.0, max_in_flight: int = 256, processes: int = 1, seed: int = 1,
+                 timeout: float = 30.0):
+        self.base_url = base_url
+        self.endpoints = endpoints or DEFAULT_ENDPOINTS
+        self.slo_ms = slo_ms
+        self.error_budget = error_budget
+        self.start_rate = start_rate
+        self.growth = growth
+        self.max_rate = max_rate
+        self.refine_steps = refine_steps
+        self.step_duration = step_duration
+        self.cooldown = cooldown
+        self.max_in_flight = max_in_flight
+        self.processes = processes
+        self.seed = seed
+        self.timeout = timeout
+        self.curves: Dict[str, List[CapacityStep]] = {}
+        self.knees: Dict[str, Optional[float]] = {}
+
+    def _step(self, endpoint: Scenario, rate: float) -> CapacityStep:
+        tester = OpenLoopTester(self.base_url, rate=rate, duration=self.step_duration, endpoints=[endpoint],
+                                arrival='constant', max_in_flight=self.max_in_flight,
+                                timeout=self.timeout, processes=self.processes, seed=self.seed)
+        stats = tester.run()[endpoint.name]
+        # Successful completions over the whole run including the drain: arrivals are never skipped, so
+        # counting scheduled requests would always report the offered rate even when the backend falls behind
+        achieved = (stats.count - stats.errors) / max(tester.elapsed, 1e-9)
+        summary = stats.summary(tester.elapsed)
+
+        reason = ''
+        if summary['p99'] > self.slo_ms:
+            reason = f"p99 {summary['p99']:.0f}ms > {self.slo_ms:.0f}ms"
+        elif summary['error_rate'] > self.error_budget:
+            reason = f"errors {summary['error_rate']:.1%} > {self.error_budget:.1%}"
+        elif achieved < rate * 0.9:
+            reason = f"achieved {achieved:.1f} req/s"
+
+        step = CapacityStep(rate, achieved, stats.count, summary['error_rate'], summary['p50'],
+                            summary['p99'], not reason, reason)
+        print(f"  {rate:>9.1f} req/s → p50 {step.p50:>8.1f} ms, p99 {step.p99:>8.1f} ms, "
+              f"errors {step.error_rate:>6.1%}  {'✅' if step.passed else '❌ ' + reason}")
+        if self.cooldown > 0:
+            time.sleep(self.cooldown)
+        return step
+
+    def search(self, endpoint: Scenario) -> Optional[float]:
+        """Return the highest passing rate for one endpoint (None if even the start rate fails)."""
+        print(f"\n🔎 {endpoint.name} ({endpoint.method} {endpoint.path})")
+        curve = self.curves[endpoint.name] = []
+
+        good, bad = None, None
+        rate = self.start_rate
+        while rate <= self.max_rate:
+            step = self._step(endpoint, rate)
+            curve.append(step)
+            if not step.passed:
+                bad = rate
+                break
+            good = rate
+            rate *= self.growth
+
+        if good is not None and bad is not None:
+            for _ in range(self.refine_steps):
+                rate = (good + bad) / 2
+                step = self._step(endpoint, rate)
+                curve.append(step)
+                if step.passed:
+                    good = rate
+                else:
+                    bad = rate
+
+        curve.sort(key=lambda step: step.rate)
+        self.knees[endpoint.name] = good
+        return good
+
+    def run(self) -> Dict[str, Optional[float]]:
+        for endpoint in self.endpoints:
+            self.search(endpoint)
+        return self.knees
+
+    def print_report(self, baseline: Dict = None):
+        """Print the knee per endpoint and, when given, the change against a baseline record."""
+        print(f"\n📈 Capacity (p99 < {self.slo_ms:.0f} ms, errors ≤ {self.error_budget:.1%})")
+        print("=" * 100)
+        print(f"{'endpoint':<22}{'max req/s':>12}{'p99 at knee':>14}{'breaks at':>12}  limited by")
+        print("-" * 100)
+        for name, curve in self.curves.items():
+            knee = self.knees.get(name)
+            passing = [step for step in curve if step.passed and step.rate == knee]
+            failing = [step for step in curve if not step.passed]
+            first_fail = failing[0] if failing else None
+            knee_text = f"{knee:.1f}" if knee is not None else '< start'
+            p99_text = f"{passing[0].p99:.1f}" if passing else '-'
+            fail_text = f"{first_fail.rate:.1f}" if first_fail else f"> {self.max_rate:.0f}"
+            line = (f"{name:<22}{knee_text:>12}{p99_text:>14}{fail_text:>12}  "
+                    f"{first_fail.reason if first_fail else 'max rate reached'}")
+
+            base = (baseline or {}).get('endpoints', {}).get(name, {}).get('max_rps')
+            if base and knee is not None:
+                line += f"  ({(knee - base) / base:+.0%} vs {base:.1f})"
+            print(line)
+
+    def to_record(self, label: str = '') -> Dict:
+        record = new_record('capacity', label, {
+            'slo_ms': self.slo_ms, 'error_budget': self.error_budget, 'start_rate': self.start_rate,
+            'growth': self.growth, 'refine_steps': self.refine_steps, 'step_duration': self.step_duration,
+            'processes': self.processes, 'seed': self.seed
+        })
+        for name, curve in self.curves.items():
+            record['endpoints'][name] = {
+                'max_rps': self.knees.get(name),
+                'curve': [step.to_dict() for step in curve]
+            }
+        return record
+
+
+def main(argv: List[str] = None) -> int:
+    names = [scenario.name for scenario in DEFAULT_ENDPOINTS]
+    parser = argparse.ArgumentParser(description="Find the max sustainable req/s per endpoint under a p99 SLO")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--endpoints', default=None, help=f"comma-separated, from {', '.join(names)}")
+    parser.add_argument('--slo-ms', type=float, default=500.0, help="p99 latency objective")
+    parser.add_argument('--error-budget', type=float, default=0.01, help="maximum error rate")
+    parser.add_argument('--start-rate', type=float, default=1.0)
+    parser.add_argument('--growth', type=float, default=2.0, help="rate multiplier between ramp steps")
+    parser.add_argument('--max-rate', type=float, default=2000.0)
+    parser.add_argument('--refine', type=int, default=4, help="binary-search steps after the ramp")
+    parser.add_argument('--step-duration', type=float, default=10.0, help="seconds per step")
+    parser.add_argument('--cooldown', type=float, default=2.0, help="idle seconds between steps")
+    parser.add_argument('--in-flight', type=int, default=256)
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--record', action='store_true', help="append the result to the benchmark history")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH)
+    parser.add_argument('--label', default='', help="configuration label stored with the record")
+    parser.add_argument('--baseline', default=None,
+                        help="label or run id of an earlier capacity record to compare against")
+    args = parser.parse_args(argv)
+
+    endpoints = DEFAULT_ENDPOINTS
+    if args.endpoints:
+        wanted = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+        unknown = [name for name in wanted if name not in names]
+        if unknown:
+            parser.error(f"unknown endpoints: {', '.join(unknown)}")
+        endpoints = [scenario for scenario in DEFAULT_ENDPOINTS if scenario.name in wanted]
+
+    store = HistoryStore(args.history)
+    baseline = None
+    if args.baseline:
+        records = store.records(kind='capacity')
+        labelled = [record for record in records if record.get('label') == args.baseline]
+        baseline = labelled[-1] if labelled else store.find(args.baseline, records)
+        if baseline is None:
+            print(f"❌ No capacity record matching '{args.baseline}' in {args.history}")
+            return 2
+
+    search = CapacitySearch(args.base_url, endpoints, args.slo_ms, args.error_budget, args.start_rate,
+                            args.growth, args.max_rate, args.refine, args.step_duration, args.cooldown,
+                            args.in_flight, args.processes, args.seed)
+    search.run()
+    search.print_report(baseline)
+
+    if args.record:
+        store.append(search.to_record(args.label))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Conversation-length scaling benchmark for /chat/process and /chat/history.
+
+Drives several conversations concurrently, each with its own conversation_id,
+to increasing depths. Every turn sends the full history back to
+/chat/process, as the frontend does, so the cost of carrying the history
+through the graph state grows with depth. At each checkpoint depth the
+history is also fetched from /chat/history. The report shows per-turn
+latency and payload sizes against depth, plus the fitted growth exponent.
+
+Usage:
+    python3 -m harness.chat_depth --conversations 8 --depths 1,10,100,1000
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from . import BASE_URL
+from .runner import create_session
+from .stats import fit_exponent, percentile
+
+DEFAULT_DEPTHS = (1, 10, 100, 1000)
+
+
+class TurnSample:
+    """Measurements for one turn of one conversation."""
+
+    __slots__ = ('depth', 'latency', 'request_bytes', 'response_bytes', 'messages', 'ok')
+
+    def __init__(self, depth: int, latency: float, request_bytes: int, response_bytes: int,
+                 messages: int, ok: bool):
+        self.depth = depth
+        self.latency = latency
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.messages = messages
+        self.ok = ok
+
+
+class ChatDepthBenchmark:
+    """Grows concurrent conversations turn by turn and records cost against depth."""
+
+    def __init__(self, base_url: str = BASE_URL, conversations: int = 8, depths: List[int] = None,
+                 message_size: int = 80, model_type: str = 'qwen', timeout: float = 60.0):
+        self.base_url = base_url
+        self.conversations = conversations
+        self.depths = sorted(depths or DEFAULT_DEPTHS)
+        self.max_depth = self.depths[-1]
+        self.message_size = message_size
+        self.model_type = model_type
+        self.timeout = timeout
+        self.run_id = uuid.uuid4().hex[:8]
+        # turns[depth - 1] holds one TurnSample per conversation
+        self.turns: List[List[TurnSample]] = [[] for _ in range(self.max_depth)]
+        # history[depth] holds (latency, response bytes, ok) per conversation
+        self.history: Dict[int, List[Tuple[float, int, bool]]] = {depth: [] for depth in self.depths}
+        self.failed_conversations = 0
+        self.elapsed = 0.0
+
+    def _message(self, conversation: int, depth: int, role: str) -> str:
+        text = f"[{role} {conversation}:{depth}] "
+        return text + 'x' * max(0, self.message_size - len(text))
+
+    def _conversation(self, index: int) -> List[TurnSample]:
+        session = create_session()
+        conversation_id = f"bench_{self.run_id}_{index}"
+        history: List[Dict] = []
+        samples: List[TurnSample] = []
+        checkpoints = set(self.depths)
+        try:
+            for depth in range(1, self.max_depth + 1):
+                body = json.dumps({
+                    'message': self._message(index, depth, 'user'),
+                    'model_type': self.model_type,
+                    'conversation_id': conversation_id,
+                    'history': history
+                }).encode()
+
+                start = time.perf_counter()
+                response = session.post(f"{self.base_url}/chat/process", data=body, timeout=self.timeout)
+                content = response.content
+                latency = time.perf_counter() - start
+
+                ok = response.status_code == 200
+                data = response.json().get('data', {}) if ok else {}
+                messages = data.get('messages') or history + [{'role': 'user', 'content': '...'}]
+                # Without a configured model the responder returns no reply; stand one in so the
+                # history grows by a full user/assistant exchange per turn as it would in production
+                if not data.get('response'):
+                    messages.append({'role': 'assistant', 'content': self._message(index, depth, 'assistant')})
+                history = messages
+
+                samples.append(TurnSample(depth, latency, len(body), len(content), len(history), ok))
+
+                if depth in checkpoints:
+                    start = time.perf_counter()
+                    response = session.get(f"{self.base_url}/chat/history/{conversation_id}", timeout=self.timeout)
+                    self.history[depth].append((time.perf_counter() - start, len(response.content),
+                                                response.status_code == 200))
+        finally:
+            session.close()
+        return samples
+
+    def run(self):
+        print(f"💬 Driving {self.conversations} conversations to depth {self.max_depth} "
+              f"(run {self.run_id})")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.conversations) as executor:
+            futures = [executor.submit(self._conversation, index) for index in range(self.conversations)]
+            for future in futures:
+                try:
+                    for sample in future.result():
+                        self.turns[sample.depth - 1].append(sample)
+                except requests.RequestException as e:
+                    self.failed_conversations += 1
+                    print(f"  ❌ Conversation aborted: {e}")
+        self.elapsed = time.perf_counter() - start
+
+    def rows(self) -> List[Dict]:
+        """Aggregate each checkpoint depth across conversations."""
+        rows = []
+        for depth in self.depths:
+            samples = self.turns[depth - 1]
+            if not samples:
+                continue
+            latencies = sorted(sample.latency for sample in samples)
+            history = self.history.get(depth, [])
+            history_latencies = sorted(latency for latency, _, _ in history)
+            rows.append({
+                'depth': depth,
+                'samples': len(samples),
+                'errors': sum(1 for sample in samples if not sample.ok),
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'request_bytes': sum(sample.request_bytes for sample in samples) / len(samples),
+                'response_bytes': sum(sample.response_bytes for sample in samples) / len(samples),
+                'messages': samples[0].messages,
+                'history_p50_ms': percentile(history_latencies, 50) * 1000,
+                'history_bytes': sum(size for _, size, _ in history) / len(history) if history else 0,
+            })
+        return rows
+
+    def print_report(self):
+        rows = self.rows()
+        print("\n📊 Per-turn Cost by Conversation Depth")
+        print("=" * 100)
+        print(f"{'depth':>7}{'msgs':>7}{'p50 ms':>10}{'p99 ms':>10}{'req KiB':>10}{'resp KiB':>10}"
+              f"{'hist ms':>10}{'hist KiB':>10}  latency")
+        print("-" * 100)
+        slowest = max((row['p50_ms'] for row in rows), default=0) or 1
+        for row in rows:
+            bar = '█' * max(1, int(row['p50_ms'] / slowest * 24))
+            print(f"{row['depth']:>7}{row['messages']:>7}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+                  f"{row['request_bytes'] / 1024:>10.1f}{row['response_bytes'] / 1024:>10.1f}"
+                  f"{row['history_p50_ms']:>10.1f}{row['history_bytes'] / 1024:>10.1f}  {bar}")
+        print("-" * 100)
+
+        # Fit over every turn (median across conversations) rather than just the checkpoints
+        per_turn = [(depth, percentile(sorted(sample.latency for sample in samples), 50))
+                    for depth, samples in enumerate(self.turns, start=1) if samples]
+        latency_exponent = fit_exponent(per_turn)
+        payload_exponent = fit_exponent([(row['depth'], row['request_bytes']) for row in rows])
+        history_exponent = fit_exponent([(row['depth'], row['history_bytes']) for row in rows])
+
+        def fmt(value: Optional[float]) -> str:
+            return f"{value:.2f}" if value is not None else 'n/a'
+
+        turns = sum(len(samples) for samples in self.turns)
+        print(f"⏱️  {turns} turns in {self.elapsed:.1f}s across {self.conversations} conversations")
+        print(f"📈 Growth with depth (y ~ depth^k): turn latency k={fmt(latency_exponent)}, "
+              f"request size k={fmt(payload_exponent)}, history size k={fmt(history_exponent)}")
+        if latency_exponent is not None and latency_exponent > 0.5:
+            print(f"  ⚠️  Per-turn latency grows with depth (~depth^{latency_exponent:.2f}); "
+                  f"a full conversation costs ~depth^{latency_exponent + 1:.2f}")
+        if history_exponent is not None and history_exponent < 0.1 and self.max_depth > 10:
+            print("  ⚠️  /chat/history size does not grow with depth; the endpoint is not returning "
+                  "the stored conversation")
+        if self.failed_conversations:
+            print(f"  ❌ {self.failed_conversations} conversations aborted")
+
+    def write_csv(self, path: str):
+        """Write one row per conversation turn, for plotting."""
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['depth', 'latency_ms', 'request_bytes', 'response_bytes', 'messages', 'ok'])
+            for samples in self.turns:
+                for sample in samples:
+                    writer.writerow([sample.depth, f"{sample.latency * 1000:.3f}", sample.request_bytes,
+                                     sample.response_bytes, sample.messages, int(sample.ok)])
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Conversation-length scaling benchmark for the chat API")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--conversations', type=int, default=8, help="concurrent conversations")
+    parser.add_argument('--depths', default=','.join(map(str, DEFAULT_DEPTHS)),
+                        help="comma-separated checkpoint depths; conversations run to the largest")
+    parser.add_argument('--message-size', type=int, default=80, help="characters per message")
+    parser.add_argument('--model-type', default='qwen')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--csv', default=None, help="write every turn to a CSV file for plotting")
+    args = parser.parse_args(argv)
+
+    benchmark = ChatDepthBenchmark(args.base_url, args.conversations,
+                                   [int(depth) for depth in args.depths.split(',')],
+                                   args.message_size, args.model_type, args.timeout)
+    benchmark.run()
+    benchmark.print_report()
+    if args.csv:
+        benchmark.write_csv(args.csv)
+        print(f"📝 Per-turn samples written to {args.csv}")
+    return 1 if benchmark.failed_conversations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""
+Concurrent article transitions: throughput, tail latency and correctness under contention.
+
+Many editors work on the same small set of stored articles at once. Each
+editor reads an article, picks one of its available transitions (weighted by
+the submit/approve/reject/resubmit mix) and applies it, so two editors acting
+on the same article race exactly like two people in the UI: one transition
+wins, the other must be refused as invalid (400) or, if the article lock
+cannot be taken in time, as a conflict (409). Published articles (and any
+the mix cannot move on) are retired and replaced by fresh ones.
+
+The run is repeated for each article count; one article means every editor
+contends for the same lock. Afterwards every article's transition history is
+fetched and checked. The chain must start at draft and follow the rules,
+versions must be consecutive and the final status must match. Every 200
+response must correspond to exactly one history entry; a gap or a duplicate
+means a lost update.
+
+Usage:
+    python3 -m harness.contention --articles 1,8,64 --editors 16 --duration 10
+    python3 -m harness.contention --articles 1 --editors 32 --blind --mix submit=1,approve=1,reject=1
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from . import BASE_URL
+from .runner import create_session
+from .stats import LatencyHistogram
+from .stub_server import ARTICLE_TRANSITIONS
+
+DEFAULT_MIX = {'submit': 1.0, 'approve': 0.25, 'reject': 1.0, 'resubmit': 1.0}
+OUTCOMES = ('applied', 'invalid', 'conflict', 'error')
+
+# Violations listed in the report; the rest are only counted
+MAX_LISTED_VIOLATIONS = 10
+
+
+class Attempt:
+    """One transition request and what the server answered."""
+
+    __slots__ = ('article_id', 'transition', 'outcome', 'version', 'previous', 'new')
+
+    def __init__(self, article_id: str, transition: str, outcome: str, version: Optional[int] = None,
+                 previous: str = None, new: str = None):
+        self.article_id = article_id
+        self.transition = transition
+        self.outcome = outcome
+        self.version = version
+        self.previous = previous
+        self.new = new
+
+
+def check_history(article_id: str, article: Dict, history: List[Dict], applied: List[Attempt]) -> List[str]:
+    """Return the ways in which an article's history and the applied responses disagree."""
+    violations = []
+    status = 'draft'
+    for index, entry in enumerate(history):
+        if entry.get('version') != index + 1:
+            violations.append(f"article {article_id}: entry {index} has version {entry.get('version')}")
+        if entry.get('from') != status:
+            violations.append(f"article {article_id} v{index + 1}: starts from {entry.get('from')} "
+                              f"but the article was {status}")
+        if ARTICLE_TRANSITIONS.get(entry.get('from'), {}).get(entry.get('transition')) != entry.get('to'):
+            violations.append(f"article {article_id} v{index + 1}: illegal {entry.get('from')} "
+                              f"-{entry.get('transition')}-> {entry.get('to')}")
+        status = entry.get('to')
+
+    if article.get('status') != status:
+        violations.append(f"article {article_id}: status {article.get('status')} but history ends at {status}")
+    if article.get('version', len(history)) != len(history):
+        violations.append(f"article {article_id}: version {article.get('version')} with "
+                          f"{len(history)} history entries")
+
+    claimed: Dict[int, int] = {}
+    for attempt in applied:
+        claimed[attempt.version] = claimed.get(attempt.version, 0) + 1
+        if attempt.version is None or not 1 <= attempt.version <= len(history):
+            violations.append(f"article {article_id}: applied {attempt.transition} reported version "
+                              f"{attempt.version}, not in the history")
+            continue
+        entry = history[attempt.version - 1]
+        if (entry.get('from'), entry.get('transition'), entry.get('to')) != \
+                (attempt.previous, attempt.transition, attempt.new):
+            violations.append(f"article {article_id} v{attempt.version}: response said {attempt.previous} "
+                              f"-{attempt.transition}-> {attempt.new}, history says {entry.get('from')} "
+                              f"-{entry.get('transition')}-> {entry.get('to')}")
+    for version, count in claimed.items():
+        if version is not None and count > 1:
+            violations.append(f"article {article_id}: {count} applied responses claim version {version} (lost update)")
+    missing = len(history) - sum(1 for version in claimed if version is not None and 1 <= version <= len(history))
+    if missing > 0:
+        violations.append(f"article {article_id}: {missing} history entries without an applied response")
+    return violations
+
+
+class LevelResult:
+    """Outcome of one run at a fixed number of articles."""
+
+    def __init__(self, articles: int, editors: int):
+        self.articles = articles
+        self.editors = editors
+        self.elapsed = 0.0
+        self.latency = {outcome: LatencyHistogram() for outcome in OUTCOMES}
+        self.writes = LatencyHistogram()
+        self.touched = 0
+        self.retired = 0
+        self.violations: List[str] = []
+
+    @property
+    def attempts(self) -> int:
+        return self.writes.count
+
+    def count(self, outcome: str) -> int:
+        return self.latency[outcome].count
+
+
+class ContentionBenchmark:
+    """Run concurrent editors against 1..N stored articles and verify the resulting histories."""
+
+    def __init__(self, base_url: str = BASE_URL, article_counts: List[int] = None, editors: int = 16,
+                 duration: float = 10.0, mix: Dict[str, float] = None, blind: bool = False,
+                 timeout: float = 30.0, seed: Optional[int] = None):
+        self.base_url = base_url
+        self.article_counts = article_counts or [1, 8, 64]
+        self.editors = editors
+        self.duration = duration
+        self.mix = mix or DEFAULT_MIX
+        self.blind = blind
+        self.timeout = timeout
+        self.seed = seed
+        self.results: List[LevelResult] = []
+
+        self._lock = threading.Lock()
+        # Fresh article ids per run; the sample articles 1-4 never change
+        self._next_id = int(time.time() * 1000) * 1000
+        self._slots: List[str] = []
+        self._applied: Dict[str, List[Attempt]] = {}
+
+    def _new_article(self) -> str:
+        self._next_id += 1
+        article_id = str(self._next_id)
+        self._applied[article_id] = []
+        return article_id
+
+    def _choose(self, rng: random.Random, transitions: List[str]) -> Optional[str]:
+        weighted = [(name, self.mix.get(name, 0.0)) for name in transitions if self.mix.get(name, 0.0) > 0]
+        if not weighted:
+            return None
+        total = sum(weight for _, weight in weighted)
+        pick = rng.uniform(0, total)
+        for name, weight in weighted:
+            pick -= weight
+            if pick <= 0:
+                return name
+        return weighted[-1][0]
+
+    def _retire(self, slot: int, article_id: str, result: LevelResult):
+        with self._lock:
+            if self._slots[slot] == article_id:
+                self._slots[slot] = self._new_article()
+                result.retired += 1
+
+    def _editor(self, index: int, deadline: float, result: LevelResult):
+        rng = random.Random(None if self.seed is None else self.seed * 1000 + index)
+        session = create_session()
+        try:
+            while time.perf_counter() < deadline:
+                slot = rng.randrange(len(self._slots))
+                article_id = self._slots[slot]
+
+                if self.blind:
+                    transition = self._choose(rng, list(self.mix))
+                else:
+                    # Read, then act on what was read: the window in which another editor can step in
+                    try:
+                        response = session.get(f"{self.base_url}/article/{article_id}", timeout=self.timeout)
+                        data = response.json().get('data', {})
+                    except (requests.RequestException, ValueError):
+                        continue
+                    transition = self._choose(rng, data.get('availableTransitions', []))
+                    if transition is None:
+                        self._retire(slot, article_id, result)
+                        continue
+                if transition is None:
+                    break
+
+                attempt = self._transition(session, article_id, transition, result)
+                if attempt.outcome == 'applied':
+                    with self._lock:
+                        self._applied[article_id].append(attempt)
+                # Published articles (or states the mix cannot leave) are replaced by fresh drafts
+                status = attempt.new if attempt.outcome == 'applied' else attempt.previous
+                if status in ARTICLE_TRANSITIONS and self._choose(rng, list(ARTICLE_TRANSITIONS[status])) is None:
+                    self._retire(slot, article_id, result)
+        finally:
+            session.close()
+
+    def _transition(self, session: requests.Session, article_id: str, transition: str,
+                    result: LevelResult) -> Attempt:
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{self.base_url}/article/{article_id}/transition/{transition}", json={},
+                                    timeout=self.timeout)
+            status = response.status_code
+            body = response.json() if status in (200, 400) else {}
+        except (requests.RequestException, ValueError):
+            status, body = 0, {}
+        elapsed = time.perf_counter() - start
+
+        if status == 200:
+            data = body.get('data', {})
+            attempt = Attempt(article_id, transition, 'applied', data.get('version'),
+                              data.get('previous_status'), data.get('new_status'))
+        elif status == 400 and body.get('error') == 'Invalid transition':
+            attempt = Attempt(article_id, transition, 'invalid', body.get('version'), body.get('current_status'))
+        elif status == 409:
+            attempt = Attempt(article_id, transition, 'conflict')
+        else:
+            attempt = Attempt(article_id, transition, 'error')
+
+        with self._lock:
+            result.latency[attempt.outcome].record(elapsed)
+            result.writes.record(elapsed)
+        return attempt
+
+    def _verify(self, article_id: str) -> List[str]:
+        session = create_session()
+        try:
+            response = session.get(f"{self.base_url}/article/{article_id}", timeout=self.timeout)
+            data = response.json().get('data', {})
+        except (requests.RequestException, ValueError) as exc:
+            return [f"article {article_id}: could not read back ({exc})"]
+        finally:
+            session.close()
+        if 'history' not in data:
+            return [f"article {article_id}: no history in the response; the backend does not store articles"]
+        return check_history(article_id, data.get('article', {}), data['history'], self._applied[article_id])
+
+    def run_level(self, articles: int) -> LevelResult:
+        result = LevelResult(articles, self.editors)
+        self._applied = {}
+        self._slots = [self._new_article() for _ in range(articles)]
+
+        start = time.perf_counter()
+        deadline = start + self.duration
+        with ThreadPoolExecutor(max_workers=self.editors) as pool:
+            for future in [pool.submit(self._editor, i, deadline, result) for i in range(self.editors)]:
+                future.result()
+        result.elapsed = time.perf_counter() - start
+
+        touched = list(self._applied)
+        result.touched = len(touched)
+        with ThreadPoolExecutor(max_workers=min(16, max(1, len(touched)))) as pool:
+            for violations in pool.map(self._verify, touched):
+                result.violations.extend(violations)
+
+        self.results.append(result)
+        print(f"  {articles:>5} article(s): {result.count('applied')} applied, {result.count('invalid')} invalid, "
+              f"{result.count('conflict')} conflicts, {result.count('error')} errors, "
+              f"{len(result.violations)} violation(s)")
+        return result
+
+    def run(self) -> List[LevelResult]:
+        print(f"✍️  {self.editors} editors, {self.duration:.0f}s per level, "
+              f"{'blind writes' if self.blind else 'read-then-write'}")
+        for count in self.article_counts:
+            self.run_level(count)
+        return self.results
+
+    def print_report(self):
+        print(f"\n🔒 Article Transition Contention ({self.editors} editors)")
+        print("=" * 100)
+        print(f"{'articles':>9}{'applied/s':>11}{'writes/s':>10}{'invalid':>9}{'conflict':>10}{'errors':>8}"
+              f"{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'checked':>9}{'violations':>12}")
+        print("-" * 100)
+        for result in self.results:
+            attempts = result.attempts or 1
+            elapsed = result.elapsed or 1e-9
+            print(f"{result.articles:>9}{result.count('applied') / elapsed:>11.1f}{result.attempts / elapsed:>10.1f}"
+                  f"{result.count('invalid') / attempts:>9.1%}{result.count('conflict') / attempts:>10.1%}"
+                  f"{result.count('error'):>8}{result.writes.percentile(50) * 1000:>9.1f}"
+                  f"{result.writes.percentile(99) * 1000:>9.1f}{result.writes.max * 1000:>9.1f}"
+                  f"{result.touched:>9}{len(result.violations):>12}")
+        print("-" * 100)
+        print("invalid = refused because another editor changed the article first; "
+              "conflict = lock not acquired in time (409)")
+
+        if len(self.results) > 1:
+            low, high = self.results[0], self.results[-1]
+            low_rate = low.count('applied') / (low.elapsed or 1e-9)
+            high_rate = high.count('applied') / (high.elapsed or 1e-9)
+            if low_rate > 0:
+                print(f"Spreading from {low.articles} to {high.articles} article(s) changes applied throughput "
+                      f"{high_rate / low_rate:.2f}x and write p99 {low.writes.percentile(99) * 1000:.1f} → "
+                      f"{high.writes.percentile(99) * 1000:.1f} ms")
+
+        violations = [violation for result in self.results for violation in result.violations]
+        if violations:
+            print(f"\n❌ {len(violations)} correctness violation(s):")
+            for violation in violations[:MAX_LISTED_VIOLATIONS]:
+                print(f"   - {violation}")
+            if len(violations) > MAX_LISTED_VIOLATIONS:
+                print(f"   ... and {len(violations) - MAX_LISTED_VIOLATIONS} more")
+        else:
+            print("\n✅ Every article history is a legal transition chain matching the applied responses")
+
+    @property
+    def violations(self) -> int:
+        return sum(len(result.violations) for result in self.results)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'submit=1,approve=0.5' -> {'submit': 1.0, 'approve': 0.5}"""
+    known = {name for rules in ARTICLE_TRANSITIONS.values() for name in rules}
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in known:
+            raise ValueError(f"unknown transition '{name}' (expected one of {', '.join(sorted(known))})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent article transitions under lock contention")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--articles', default='1,8,64', help="comma-separated article counts, one run each")
+    parser.add_argument('--editors', type=int, default=16, help="concurrent editors")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per article count")
+    parser.add_argument('--mix', default=None,
+                        help="transition weights, e.g. submit=1,approve=0.25,reject=1,resubmit=1")
+    parser.add_argument('--blind', action='store_true',
+                        help="pick transitions from the mix without reading the article first")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        counts = [int(value) for value in args.articles.split(',') if value.strip()]
+        mix = parse_mix(args.mix) if args.mix else None
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not counts or min(counts) < 1:
+        parser.error("--articles needs positive counts")
+
+    benchmark = ContentionBenchmark(args.base_url, counts, args.editors, args.duration, mix, args.blind,
+                                    seed=args.seed)
+    benchmark.run()
+    benchmark.print_report()
+    return 1 if benchmark.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+"""
+Persistent benchmark history and performance-regression detection.
+
+Every recorded run is appended as one JSON line to an NDJSON file, keyed by git
+revision and timestamp. `compare` checks a run against a baseline and exits
+non-zero when an endpoint got significantly slower.
+
+Usage:
+    python3 -m harness.history list
+    python3 -m harness.history compare                      # latest vs. the run before it
+    python3 -m harness.history compare --baseline a1b2c3d --threshold 0.1
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .stats import LatencyHistogram
+
+DEFAULT_HISTORY_PATH = os.path.join('.benchmarks', 'history.ndjson')
+
+
+def git_revision() -> Dict[str, object]:
+    """Return the current short revision and whether the working tree is dirty."""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {'revision': 'unknown', 'dirty': False}
+    return {'revision': revision, 'dirty': dirty}
+
+
+def new_record(kind: str, label: str = '', settings: Dict = None) -> Dict:
+    """Create an empty history record for the current revision."""
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    revision = git_revision()
+    return {
+        # The random suffix keeps runs recorded within the same second apart
+        'run_id': f"{timestamp.replace('-', '').replace(':', '')}-{revision['revision']}-{uuid.uuid4().hex[:6]}",
+        'timestamp': timestamp,
+        'revision': revision['revision'],
+        'dirty': revision['dirty'],
+        'kind': kind,
+        'label': label,
+        'settings': settings or {},
+        'elapsed': 0.0,
+        'endpoints': {},
+        'streams': {}
+    }
+
+
+def add_stream_timings(record: Dict, timings) -> Dict:
+    """
+    Add per-stage stream timings (StreamTiming objects) to a record.
+
+    Every stream of an endpoint adds one sample per stage, so stages can be
+    tested for significance like endpoint latencies; the totals are those of
+    the endpoint's last stream.
+    """
+    for timing in timings:
+        if not timing.events:
+            continue
+        stream = record['streams'].setdefault(timing.endpoint, {'stages_ms': {}})
+        stream['total_ms'] = round(timing.total * 1000, 3)
+        stream['ttfb_ms'] = round((timing.time_to_first_byte or 0.0) * 1000, 3)
+        stream['ttfe_ms'] = round((timing.time_to_first_event or 0.0) * 1000, 3)
+        for status, duration in timing.stage_durations():
+            stream['stages_ms'].setdefault(status, []).append(round(duration * 1000, 3))
+    return record
+
+
+def record_from_load(tester, label: str = '') -> Dict:
+    """Build a history record from a finished LoadTester run."""
+    record = new_record('load', label, {
+        'users': tester.users, 'duration': tester.duration, 'total_requests': tester.total_requests
+    })
+    record['elapsed'] = round(tester.elapsed, 3)
+    for name, endpoint_stats in tester.stats.items():
+        summary = endpoint_stats.summary(tester.elapsed)
+        summary['histogram'] = endpoint_stats.histogram.to_dict()
+        record['endpoints'][name] = summary
+    return record
+
+
+def record_from_open_loop(tester, label: str = '') -> Dict:
+    """Build a history record from a finished OpenLoopTester run (latency from intended send)."""
+    record = new_record('open_loop', label, {
+        'rate': tester.rate, 'arrival': tester.arrival, 'duration': tester.duration,
+        'max_in_flight': tester.max_in_flight
+    })
+    record['elapsed'] = round(tester.elapsed, 3)
+    for name, endpoint_stats in tester.stats.items():
+        summary = endpoint_stats.summary(tester.elapsed)
+        summary['histogram'] = endpoint_stats.histogram.to_dict()
+        record['endpoints'][name] = summary
+    return record
+
+
+def record_from_runner(runner, label: str = '') -> Dict:
+    """Build a history record from a finished ScenarioRunner pass."""
+    record = new_record('validation', label, {'max_workers': runner.max_workers})
+    record['elapsed'] = round(runner.wall_time, 3)
+    for name, duration in runner.durations.items():
+        success = runner.results.get(name, (False, None))[0]
+        record['endpoints'][name] = {
+            'requests': 1,
+            'errors': 0 if success else 1,
+            'samples_ms': [round(duration * 1000, 3)]
+        }
+    return add_stream_timings(record, runner.stream_timings)
+
+
+class HistoryStore:
+    """Append-only NDJSON store of benchmark records."""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+
+    def append(self, record: Dict):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+    def records(self, kind: str = None, label: str = None) -> List[Dict]:
+        return [record for record in self
+                if (kind is None or record.get('kind') == kind)
+                and (label is None or record.get('label', '') == label)]
+
+    def find(self, key: str, records: List[Dict]) -> Optional[Dict]:
+        """Find the most recent record whose run_id or revision matches key."""
+        for record in reversed(records):
+            if record['run_id'] == key or record['revision'].startswith(key):
+                return record
+        return None
+
+
+# ----------------------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------------------
+
+def latency_distribution(stats: Dict) -> List[Tuple[float, int]]:
+    """Return an endpoint's latencies as sorted (value in ms, count) pairs."""
+    if stats.get('histogram'):
+        histogram = LatencyHistogram.from_dict(stats['histogram'])
+        return [(value * 1000, count) for value, count in histogram.buckets()]
+    return [(value, 1) for value in sorted(stats.get('samples_ms') or [])]
+
+
+def stage_distribution(samples) -> List[Tuple[float, int]]:
+    """Return a stream stage's samples as sorted (value in ms, count) pairs (older records hold one number)."""
+    if isinstance(samples, (int, float)):
+        samples = [samples]
+    return [(value, 1) for value in sorted(samples)]
+
+
+def mann_whitney_greater(baseline: Sequence[Tuple[float, int]], current: Sequence[Tuple[float, int]]) -> float:
+    """
+    One-sided Mann-Whitney U test on (value, count) distributions, using the
+    normal approximation with tie correction.
+
+    Returns the p-value for the hypothesis that `current` tends to be larger
+    than `baseline`.
+    """
+    n_a = sum(count for _, count in baseline)
+    n_b = sum(count for _, count in current)
+    n = n_a + n_b
+    if n_a == 0 or n_b == 0 or n < 2:
+        return 1.0
+
+    # Group equal values across both distributions: each group shares an average rank
+    groups: Dict[float, List[int]] = {}
+    for value, count in baseline:
+        groups.setdefault(value, [0, 0])[0] += count
+    for value, count in current:
+        groups.setdefault(value, [0, 0])[1] += count
+
+    rank_sum_b = 0.0
+    tie_term = 0.0
+    seen = 0
+    for value in sorted(groups):
+        count_a, count_b = groups[value]
+        ties = count_a + count_b
+        average_rank = seen + (ties + 1) / 2.0
+        rank_sum_b += average_rank * count_b
+        tie_term += ties ** 3 - ties
+        seen += ties
+
+    u_b = rank_sum_b - n_b * (n_b + 1) / 2.0
+    mean = n_a * n_b / 2.0
+    variance = n_a * n_b / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_b - mean) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _median(distribution: Sequence[Tuple[float, int]]) -> float:
+    total = sum(count for _, count in distribution)
+    seen = 0
+    for value, count in distribution:
+        seen += count
+        if seen * 2 >= total:
+            return value
+    return 0.0
+
+
+def _latency_finding(metric: str, before: Sequence[Tuple[float, int]], after: Sequence[Tuple[float, int]],
+                     threshold: float, alpha: float, min_samples: int, min_delta_ms: float) -> Dict:
+    """Compare two latency distributions by median, testing significance when both sides are large enough."""
+    median_before, median_after = _median(before), _median(after)
+    change = (median_after - median_before) / median_before if median_before > 0 else 0.0
+    finding = {'metric': metric, 'baseline': median_before, 'current': median_after, 'change': change,
+               'p_value': None, 'regression': False}
+
+    if (sum(count for _, count in before) >= min_samples
+            and sum(count for _, count in after) >= min_samples):
+        finding['p_value'] = mann_whitney_greater(before, after)
+        finding['regression'] = (change > threshold and finding['p_value'] < alpha
+                                 and median_after - median_before >= min_delta_ms)
+    return finding
+
+
+def compare_records(baseline: Dict, current: Dict, threshold: float = 0.1, alpha: float = 0.01,
+                    min_samples: int = 20, min_delta_ms: float = 5.0) -> List[Dict]:
+    """
+    Compare two records and return one finding per metric.
+
+    An endpoint or stream stage regresses when its median latency grew by more
+    than `threshold` and the Mann-Whitney test is significant at `alpha`. With
+    fewer than `min_samples` per side the test is skipped and the finding is
+    informational. Total throughput is compared by relative change only.
+    """
+    findings = []
+
+    for name, current_stats in current.get('endpoints', {}).items():
+        baseline_stats = baseline.get('endpoints', {}).get(name)
+        if not baseline_stats:
+            continue
+        before = latency_distribution(baseline_stats)
+        after = latency_distribution(current_stats)
+        if not before or not after:
+            continue
+        findings.append(_latency_finding(f'{name} median latency', before, after, threshold, alpha,
+                                         min_samples, min_delta_ms))
+
+    # In a closed-loop run one slow endpoint lowers every endpoint's rate, so only the total is compared
+    throughput_before = sum(stats.get('throughput', 0.0) for stats in baseline.get('endpoints', {}).values())
+    throughput_after = sum(stats.get('throughput', 0.0) for stats in current.get('endpoints', {}).values())
+    if throughput_before > 0 and throughput_after > 0:
+        drop = (throughput_before - throughput_after) / throughput_before
+        findings.append({'metric': 'total throughput (req/s)', 'baseline': throughput_before,
+                         'current': throughput_after, 'change': -drop, 'p_value': None,
+                         'regression': drop > threshold})
+
+    for name, current_stream in current.get('streams', {}).items():
+        baseline_stream = baseline.get('streams', {}).get(name)
+        if not baseline_stream:
+            continue
+        for stage, samples in current_stream.get('stages_ms', {}).items():
+            before = stage_distribution(baseline_stream.get('stages_ms', {}).get(stage) or [])
+            after = stage_distribution(samples)
+            if not before or not after:
+                continue
+            findings.append(_latency_finding(f'{name} stage {stage}', before, after, threshold, alpha,
+                                             min_samples, min_delta_ms))
+
+    return findings
+
+
+def print_findings(baseline: Dict, current: Dict, findings: List[Dict]):
+    print(f"Baseline: {baseline['run_id']} ({baseline['revision']}{'+dirty' if baseline.get('dirty') else ''})")
+    print(f"Current:  {current['run_id']} ({current['revision']}{'+dirty' if current.get('dirty') else ''})")
+    print("=" * 100)
+    print(f"{'metric':<52}{'baseline':>12}{'current':>12}{'change':>10}{'p-value':>10}")
+    print("-" * 100)
+    for finding in findings:
+        p_value = f"{finding['p_value']:.4f}" if finding['p_value'] is not None else '-'
+        marker = '  ❌ REGRESSION' if finding['regression'] else ''
+        print(f"{finding['metric']:<52}{finding['baseline']:>12.2f}{finding['current']:>12.2f}"
+              f"{finding['change']:>+10.1%}{p_value:>10}{marker}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark history and regression detection")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, help="NDJSON history file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help="list recorded runs")
+    list_parser.add_argument('--kind', default=None)
+
+    compare_parser = subparsers.add_parser('compare', help="compare a run against a baseline")
+    compare_parser.add_argument('--baseline', default=None,
+                                help="run id or revision (default: the run before --current)")
+    compare_parser.add_argument('--current', default=None, help="run id or revision (default: latest)")
+    compare_parser.add_argument('--kind', default='load', help="record kind to compare (load, validation, ...)")
+    compare_parser.add_argument('--label', default=None, help="only consider runs with this label")
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="relative slowdown that counts as a regression")
+    compare_parser.add_argument('--alpha', type=float, default=0.01, help="significance level")
+    compare_parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                                help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.history)
+
+    if args.command == 'list':
+        for record in store.records(kind=args.kind):
+            print(f"{record['run_id']:<36}{record['kind']:<12}{record.get('label', ''):<16}"
+                  f"{len(record['endpoints']):>4} endpoints{'  (dirty)' if record.get('dirty') else ''}")
+        return 0
+
+    records = store.records(kind=args.kind, label=args.label)
+    current = store.find(args.current, records) if args.current else (records[-1] if records else None)
+    if current is None:
+        print("❌ No matching current run in the history")
+        return 2
+
+    if args.baseline:
+        baseline = store.find(args.baseline, records)
+    else:
+        earlier = records[:records.index(current)]
+        baseline = earlier[-1] if earlier else None
+    if baseline is None:
+        print("❌ No matching baseline run in the history")
+        return 2
+
+    findings = compare_records(baseline, current, args.threshold, args.alpha, min_delta_ms=args.min_delta_ms)
+    print_findings(baseline, current, findings)
+
+    regressions = [finding for finding in findings if finding['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} performance regression(s) detected")
+        return 1
+    print("\n✅ No performance regressions detected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Per-phase HTTP timing and connection-reuse accounting.
+
+Timed urllib3 connection classes record DNS lookup, TCP connect and TLS
+handshake whenever a new connection is opened. timed_request() adds time to
+first byte, body transfer and client-side JSON decode, and whether the
+request went out on a fresh or a reused connection. PhaseProfiler runs the
+endpoint set through a session with a configurable pool size and keep-alive,
+and reports how much of each request is connection setup versus waiting on
+the server.
+
+Usage:
+    python3 test_apis.py --phases --repeat 20 --workers 4
+    python3 test_apis.py --phases --no-keep-alive
+"""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from . import BASE_URL
+from .runner import create_session
+from .scenarios import API_SCENARIOS, Scenario
+from .stats import LatencyHistogram
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'transfer', 'decode')
+
+# Connection phases of the request currently being sent on this thread
+_current = threading.local()
+
+
+def _connection_phases() -> Dict[str, float]:
+    phases = getattr(_current, 'phases', None)
+    if phases is None:
+        phases = _current.phases = {}
+    return phases
+
+
+class _TimedConnectionMixin:
+    """Records DNS and TCP connect time of every new connection."""
+
+    def _new_conn(self):
+        phases = _connection_phases()
+        start = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            # Let urllib3 raise its usual NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+
+        # Connect to the address resolved above so the lookup is not repeated (and not counted twice)
+        host = self._dns_host
+        self._dns_host = address
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+
+        phases['dns'] = resolved - start
+        phases['connect'] = time.perf_counter() - resolved
+        phases['new_connection'] = True
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        phases = _connection_phases()
+        # Whatever connect() spent beyond DNS and TCP was the TLS handshake
+        phases['tls'] = max(0.0, time.perf_counter() - start - phases.get('dns', 0.0) - phases.get('connect', 0.0))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use the timed connection classes."""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+def create_timed_session(pool_size: int = 10, keep_alive: bool = True) -> requests.Session:
+    """A JSON session (see create_session) with timed connections and the given pool size."""
+    session = create_session()
+    adapter = TimedAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+class RequestTiming:
+    """Phase durations (seconds) of one request."""
+
+    __slots__ = PHASES + ('new_connection', 'total', 'status')
+
+    def __init__(self):
+        for phase in PHASES:
+            setattr(self, phase, 0.0)
+        self.new_connection = False
+        self.total = 0.0
+        self.status = 0
+
+    @property
+    def setup(self) -> float:
+        return self.dns + self.connect + self.tls
+
+
+def timed_request(session: requests.Session, method: str, url: str, decode: bool = True,
+                  **kwargs) -> Tuple[requests.Response, Any, RequestTiming]:
+    """Send a request and return (response, decoded JSON or None, RequestTiming)."""
+    timing = RequestTiming()
+    _current.phases = {}
+    start = time.perf_counter()
+    response = session.request(method, url, stream=True, **kwargs)
+    headers_received = time.perf_counter()
+    response.content  # Body transfer (the whole stream for SSE endpoints)
+    transferred = time.perf_counter()
+
+    body = None
+    if decode and not response.headers.get('Content-Type', '').startswith('text/event-stream'):
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+    decoded = time.perf_counter()
+
+    phases = _current.phases
+    timing.dns = phases.get('dns', 0.0)
+    timing.connect = phases.get('connect', 0.0)
+    timing.tls = phases.get('tls', 0.0)
+    timing.new_connection = phases.get('new_connection', False)
+    # Time to first byte after the connection is ready: sending plus server processing
+    timing.ttfb = max(0.0, headers_received - start - timing.setup)
+    timing.transfer = transferred - headers_received
+    timing.decode = decoded - transferred
+    timing.total = decoded - start
+    timing.status = response.status_code
+    return response, body, timing
+
+
+class PhaseStats:
+    """Histogram per phase plus connection counts for one endpoint."""
+
+    __slots__ = ('name', 'phases', 'total', 'new_connections', 'requests', 'errors')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.phases = {phase: LatencyHistogram() for phase in PHASES}
+        self.total = LatencyHistogram()
+        self.new_connections = 0
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, timing: RequestTiming, ok: bool):
+        for phase in PHASES:
+            self.phases[phase].record(getattr(timing, phase))
+        self.total.record(timing.total)
+        self.requests += 1
+        if timing.new_connection:
+            self.new_connections += 1
+        if not ok:
+            self.errors += 1
+
+
+class PhaseProfiler:
+    """Send each endpoint several times through one pooled session and break down where time goes."""
+
+    def __init__(self, base_url: str = BASE_URL, scenarios: List[Scenario] = None, repeat: int = 10,
+                 workers: int = 1, pool_size: int = 10, keep_alive: bool = True, timeout: float = 60.0):
+        self.base_url = base_url
+        self.scenarios = scenarios or API_SCENARIOS
+        self.repeat = repeat
+        self.workers = workers
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.stats: Dict[str, PhaseStats] = {scenario.name: PhaseStats(scenario.name) for scenario in self.scenarios}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+
+    def _send(self, scenario: Scenario):
+        payload = scenario.payload if scenario.method != 'GET' else None
+        try:
+            response, _, timing = timed_request(self._session, scenario.method, f"{self.base_url}{scenario.path}",
+                                                json=payload, timeout=self.timeout)
+            ok = response.status_code in scenario.expected_statuses
+        except requests.RequestException:
+            timing, ok = RequestTiming(), False
+        with self._lock:
+            self.stats[scenario.name].record(timing, ok)
+
+    def run(self) -> Dict[str, PhaseStats]:
+        # One shared session, so pool size and keep-alive decide how often connections are reused
+        self._session = create_timed_session(self.pool_size, self.keep_alive)
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for _ in range(self.repeat):
+                    list(pool.map(self._send, self.scenarios))
+        finally:
+            self._session.close()
+        self.elapsed = time.perf_counter() - start
+        return self.stats
+
+    def print_report(self):
+        print(f"\n⏱️  HTTP Phase Breakdown (mean ms; {self.repeat} rounds, {self.workers} worker(s), "
+              f"pool {self.pool_size}, keep-alive {'on' if self.keep_alive else 'off'})")
+        print("=" * 100)
+        print(f"{'endpoint':<22}{'dns':>7}{'connect':>9}{'tls':>7}{'ttfb':>9}{'transfer':>10}"
+              f"{'decode':>8}{'total':>9}{'new/reused':>13}{'setup':>8}")
+        print("-" * 100)
+
+        total_requests = 0
+        total_new = 0
+        setup_time = 0.0
+        total_time = 0.0
+        for name, stats in self.stats.items():
+            if not stats.requests:
+                continue
+            means = {phase: stats.phases[phase].mean * 1000 for phase in PHASES}
+            setup = means['dns'] + means['connect'] + means['tls']
+            total = stats.total.mean * 1000
+            share = setup / total if total else 0.0
+            print(f"{name:<22}{means['dns']:>7.2f}{means['connect']:>9.2f}{means['tls']:>7.2f}"
+                  f"{means['ttfb']:>9.1f}{means['transfer']:>10.1f}{means['decode']:>8.2f}{total:>9.1f}"
+                  f"{f'{stats.new_connections}/{stats.requests - stats.new_connections}':>13}{share:>8.1%}")
+            total_requests += stats.requests
+            total_new += stats.new_connections
+            setup_time += setup * stats.requests
+            total_time += total * stats.requests
+
+        print("-" * 100)
+        reused = total_requests - total_new
+        print(f"Connections: {total_new} new, {reused} reused "
+              f"({reused / total_requests if total_requests else 0.0:.0%} reuse) over {total_requests} requests")
+        print(f"Connection setup: {setup_time / total_requests if total_requests else 0.0:.2f} ms per request, "
+              f"{setup_time / total_time if total_time else 0.0:.1%} of total request time")
+        if self.keep_alive and total_requests and total_new > max(self.workers, self.pool_size) * 2:
+            print("⚠️  Connections are being re-opened although keep-alive is on; the server (or a full pool) "
+                  "is closing them")
@@ -0,0 +1,228 @@
+"""
+Concurrent load generation against the web application API.
+
+Each virtual user owns its own requests.Session and walks the endpoint set
+round-robin until the run duration or the total request budget is used up.
+Virtual users are spread over a pool of worker processes (one per core by
+default) so the client is not limited by a single GIL; every worker records
+into LatencyHistograms that the parent merges losslessly.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from . import BASE_URL
+from .runner import create_session, event_object
+from .scenarios import API_SCENARIOS, Scenario
+from .sse import iter_events
+from .results import ResultRecord, error_digest, open_sink, shard_path
+from .stats import EndpointStats, merge_stats
+
+# The same endpoint set that APITester validates
+DEFAULT_ENDPOINTS = API_SCENARIOS
+
+
+def send_request(session: requests.Session, base_url: str, endpoint: Scenario,
+                 timeout: float = 30.0) -> bool:
+    """Send one request and consume the full response. Returns True on an expected status."""
+    return send_request_detailed(session, base_url, endpoint, timeout)[0]
+
+
+def send_request_detailed(session: requests.Session, base_url: str, endpoint: Scenario,
+                          timeout: float = 30.0) -> Tuple[bool, int, int]:
+    """send_request() that also returns the status code and the response size in bytes."""
+    url = f"{base_url}{endpoint.path}"
+    payload = endpoint.payload if endpoint.method != 'GET' else None
+
+    if not endpoint.stream:
+        response = session.request(endpoint.method, url, json=payload, timeout=timeout)
+        size = len(response.content)  # Make sure the body has been transferred
+        return response.status_code in endpoint.expected_statuses, response.status_code, size
+
+    with session.request(endpoint.method, url, json=payload, stream=True, timeout=timeout) as response:
+        if response.status_code not in endpoint.expected_statuses:
+            return False, response.status_code, len(response.content)
+        # Expected error responses are plain JSON rather than a stream
+        if response.status_code != 200:
+            return True, response.status_code, len(response.content)
+        size = 0
+
+        def counted():
+            nonlocal size
+            for chunk in response.iter_content(chunk_size=None):
+                size += len(chunk)
+                yield chunk
+
+        for event in iter_events(counted()):
+            # Only decode the event that can end the stream
+            if '"finished"' in event.data and event_object(event).get('status') == 'finished':
+                return True, response.status_code, size
+        # The stream closed without its finished event: a dropped stream, as sse_subscribers counts it
+        return False, response.status_code, size
+
+
+class LoadTester:
+    """Drive the endpoint set with N concurrent virtual users."""
+
+    def __init__(self, base_url: str = BASE_URL, users: int = 10,
+                 duration: Optional[float] = 30.0, total_requests: Optional[int] = None,
+                 endpoints: List[Scenario] = None, timeout: float = 30.0, processes: int = 1,
+                 results_path: Optional[str] = None):
+        if duration is None and total_requests is None:
+            raise ValueError("Either duration or total_requests must be set")
+
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.total_requests = total_requests
+        self.endpoints = endpoints or DEFAULT_ENDPOINTS
+        self.timeout = timeout
+        # 0 means one worker process per CPU core
+        self.processes = min(processes or os.cpu_count() or 1, users)
+        # Per-request records are streamed here (one shard per worker process) instead of kept in memory
+        self.results_path = results_path
+        self.elapsed = 0.0
+        self.cpu_time = 0.0
+        self.stats: Dict[str, EndpointStats] = {}
+
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._deadline = 0.0
+
+    def _next_slot(self) -> bool:
+        """Claim the right to send one more request."""
+        if self.duration is not None and time.perf_counter() >= self._deadline:
+            return False
+        if self.total_requests is None:
+            return True
+        with self._lock:
+            if self._issued >= self.total_requests:
+                return False
+            self._issued += 1
+            return True
+
+    def _virtual_user(self, user_id: int, sink=None) -> Dict[str, EndpointStats]:
+        """Send requests until the run is over; stats are kept per user to avoid locking."""
+        session = create_session()
+        stats = {endpoint.name: EndpointStats(endpoint.name) for endpoint in self.endpoints}
+        request_sizes = {endpoint.name: len(json.dumps(endpoint.payload))
+                         if endpoint.payload is not None and endpoint.method != 'GET' else 0
+                         for endpoint in self.endpoints}
+        index = user_id
+
+        try:
+            while self._next_slot():
+                endpoint = self.endpoints[index % len(self.endpoints)]
+                index += 1
+
+                start = time.perf_counter()
+                error = ''
+                try:
+                    ok, status, size = send_request_detailed(session, self.base_url, endpoint, self.timeout)
+                except requests.RequestException as e:
+                    ok, status, size, error = False, 0, 0, error_digest(str(e))
+                latency = time.perf_counter() - start
+                stats[endpoint.name].record(latency, ok)
+                if sink is not None:
+                    if not ok and not error:
+                        error = f"Unexpected status {status}"
+                    sink.write(ResultRecord(endpoint.name, ok, status, latency, request_sizes[endpoint.name],
+                                            size, 0, error))
+        finally:
+            session.close()
+
+        return stats
+
+    def run(self) -> Dict[str, EndpointStats]:
+        """Run the load test and return the merged per-endpoint statistics."""
+        self.stats = {endpoint.name: EndpointStats(endpoint.name) for endpoint in self.endpoints}
+        if self.processes > 1:
+            self._run_processes()
+        else:
+            self._run_threads()
+        return self.stats
+
+    def _run_threads(self):
+        self._issued = 0
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        if self.duration is not None:
+            self._deadline = start + self.duration
+
+        sink = open_sink(self.results_path, 'load')
+        try:
+            with ThreadPoolExecutor(max_workers=self.users) as pool:
+                for user_stats in pool.map(lambda user_id: self._virtual_user(user_id, sink), range(self.users)):
+                    merge_stats(self.stats, user_stats)
+        finally:
+            if sink is not None:
+                sink.close()
+
+        self.elapsed = time.perf_counter() - start
+        self.cpu_time = time.process_time() - cpu_start
+
+    def _run_processes(self):
+        users = _split(self.users, self.processes)
+        requests_per_process = (_split(self.total_requests, self.processes)
+                                if self.total_requests is not None else [None] * self.processes)
+
+        self.elapsed = 0.0
+        self.cpu_time = 0.0
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            futures = [
+                pool.submit(_process_worker, self.base_url, users[i], self.duration,
+                            requests_per_process[i], self.endpoints, self.timeout,
+                            shard_path(self.results_path, i) if self.results_path else None)
+                for i in range(self.processes)
+            ]
+            for future in futures:
+                worker_stats, elapsed, cpu_time = future.result()
+                merge_stats(self.stats, worker_stats)
+                # Process start-up is excluded: the run lasts as long as the slowest worker
+                self.elapsed = max(self.elapsed, elapsed)
+                self.cpu_time += cpu_time
+
+    def print_report(self):
+        """Print throughput, error rate and latency percentiles per endpoint."""
+        print(f"\nLoad test: {self.users} virtual users in {self.processes} process(es), "
+              f"{self.elapsed:.1f}s elapsed, {self.cpu_time:.1f}s client CPU")
+        print("=" * 100)
+        print(f"{'endpoint':<22}{'requests':>9}{'req/s':>9}{'errors':>9}"
+              f"{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'max ms':>11}")
+        print("-" * 100)
+
+        total_requests = 0
+        total_errors = 0
+        for name, endpoint_stats in self.stats.items():
+            summary = endpoint_stats.summary(self.elapsed)
+            total_requests += endpoint_stats.count
+            total_errors += endpoint_stats.errors
+            print(f"{name:<22}{summary['requests']:>9}{summary['throughput']:>9.1f}"
+                  f"{summary['error_rate']:>9.1%}{summary['p50']:>11.1f}{summary['p90']:>11.1f}"
+                  f"{summary['p99']:>11.1f}{summary['max']:>11.1f}")
+
+        print("-" * 100)
+        throughput = total_requests / self.elapsed if self.elapsed > 0 else 0.0
+        error_rate = total_errors / total_requests if total_requests else 0.0
+        print(f"Total: {total_requests} requests, {throughput:.1f} req/s, {error_rate:.1%} errors")
+
+
+def _split(total: int, parts: int) -> List[int]:
+    """Split total into `parts` near-equal shares."""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def _process_worker(base_url: str, users: int, duration: Optional[float], total_requests: Optional[int],
+                    endpoints: List[Scenario], timeout: float,
+                    results_path: Optional[str] = None) -> Tuple[Dict[str, EndpointStats], float, float]:
+    """Entry point of one worker process: run a threaded LoadTester and return its histograms."""
+    tester = LoadTester(base_url, users=users, duration=duration, total_requests=total_requests,
+                        endpoints=endpoints, timeout=timeout, processes=1, results_path=results_path)
+    tester.run()
+    return tester.stats, tester.elapsed, tester.cpu_time
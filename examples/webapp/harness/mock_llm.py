@@ -0,0 +1,449 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions API.
+
+Answers POST .../chat/completions the way DeepSeek and Qwen do, streaming
+(`data:` chunks ending in `[DONE]`) or as one JSON body, with a configurable
+time to first token, generation speed and response length. Errors (e.g. 429
+or 503) and upstream timeouts (the request is accepted but never answered
+within the stall time) can be injected at given rates, so the model clients,
+their timeouts and RetryMechanism can be benchmarked without network access.
+
+Point the backend at it through ModelConfig / the environment:
+    DEEPSEEK_BASE_URL=http://127.0.0.1:9000/v1 DEEPSEEK_API_KEY=mock php artisan serve
+
+GET /stats returns the server's counters (requests, peak concurrency,
+injected failures, tokens sent). With MODEL_RETRIES set the clients retry
+failed non-streaming requests through RetryMechanism, and the requests seen
+here beyond the model calls the backend made are those retries:
+    MODEL_RETRIES=2 MODEL_RETRY_DELAY=200 DEEPSEEK_BASE_URL=http://127.0.0.1:9000/v1 php artisan serve
+
+Usage:
+    python3 -m harness.mock_llm --port 9000 --ttft 0.4 --tokens-per-sec 50 --tokens 200
+    python3 -m harness.mock_llm --port 9000 --error-rate 0.1 --error-status 429 --timeout-rate 0.05
+    python3 -m harness.mock_llm --probe --requests 100 --concurrency 10 --stream
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from .stats import LatencyHistogram
+from .stub_server import _REASONS, read_request
+
+# Words the generated answers are made of
+_VOCABULARY = ('the', 'graph', 'node', 'state', 'agent', 'workflow', 'runs', 'each', 'step', 'and', 'returns',
+               'a', 'result', 'to', 'next', 'edge', 'with', 'context', 'model', 'response')
+
+# Don't write chunks more often than this; faster generation puts several tokens in one chunk
+_MIN_CHUNK_INTERVAL = 0.005
+
+
+class ModelBehaviour:
+    """Simulated latency, speed and failure profile of the upstream model."""
+
+    def __init__(self, ttft: float = 0.3, ttft_jitter: float = 0.0, tokens_per_sec: float = 50.0,
+                 tokens: int = 100, error_rate: float = 0.0, error_status: int = 503,
+                 timeout_rate: float = 0.0, stall: float = 120.0, stream: Optional[bool] = None):
+        self.ttft = ttft
+        self.ttft_jitter = ttft_jitter
+        self.tokens_per_sec = tokens_per_sec
+        self.tokens = tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self.stall = stall
+        # None follows the request's "stream" flag; True/False forces one mode
+        self.stream = stream
+
+    def first_token_delay(self, rng: random.Random) -> float:
+        if self.ttft_jitter <= 0:
+            return self.ttft
+        return max(0.0, self.ttft + rng.uniform(-self.ttft_jitter, self.ttft_jitter))
+
+
+class MockLLMServer:
+    """asyncio HTTP server speaking the OpenAI chat completions protocol."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9000, behaviour: ModelBehaviour = None,
+                 seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.behaviour = behaviour or ModelBehaviour()
+        self.counters = {'requests': 0, 'completed': 0, 'streamed': 0, 'errors_injected': 0,
+                         'timeouts_injected': 0, 'disconnects': 0, 'tokens_sent': 0,
+                         'in_flight': 0, 'peak_in_flight': 0}
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    # ------------------------------------------------------------------
+    # Lifecycle (same shape as StubServer)
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  reuse_address=True)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "MockLLMServer":
+        """Run the server on a background event loop; returns once it is listening."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._server.close()
+            # Stalled (timeout-injected) requests would otherwise outlive the loop
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name='mock-llm', daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    # ------------------------------------------------------------------
+    # HTTP handling
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                keep_alive = await self._dispatch(method, target, body, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutdown; finishing normally keeps asyncio from logging every open connection
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter,
+                        keep_alive: bool) -> bool:
+        """Answer one request; returns whether the connection can be reused."""
+        path = target.split('?', 1)[0].rstrip('/')
+        if method == 'GET' and path == '/stats':
+            await self._write_json(writer, 200, dict(self.counters), keep_alive)
+            return keep_alive
+        if method != 'POST' or not path.endswith('/chat/completions'):
+            await self._write_json(writer, 404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}},
+                                   keep_alive)
+            return keep_alive
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict) or not isinstance(payload.get('messages'), list):
+            await self._write_json(writer, 400, {'error': {'message': "'messages' is required",
+                                                           'type': 'invalid_request_error'}}, keep_alive)
+            return keep_alive
+
+        counters = self.counters
+        counters['requests'] += 1
+        counters['in_flight'] += 1
+        counters['peak_in_flight'] = max(counters['peak_in_flight'], counters['in_flight'])
+        try:
+            return await self._complete(payload, writer, keep_alive)
+        except ConnectionError:
+            counters['disconnects'] += 1
+            return False
+        finally:
+            counters['in_flight'] -= 1
+
+    async def _complete(self, payload: Dict, writer: asyncio.StreamWriter, keep_alive: bool) -> bool:
+        behaviour = self.behaviour
+        roll = self._rng.random()
+        if roll < behaviour.timeout_rate:
+            # Accept the request and go quiet, like an overloaded upstream; the client's timeout must fire
+            self.counters['timeouts_injected'] += 1
+            await asyncio.sleep(behaviour.stall)
+            return False
+        if roll < behaviour.timeout_rate + behaviour.error_rate:
+            self.counters['errors_injected'] += 1
+            await asyncio.sleep(behaviour.first_token_delay(self._rng))
+            await self._write_json(writer, behaviour.error_status, {'error': {
+                'message': 'Injected upstream error', 'type': 'server_error', 'code': behaviour.error_status
+            }}, keep_alive)
+            return keep_alive
+
+        model = payload.get('model') or 'mock-model'
+        max_tokens = payload.get('max_tokens')
+        count = min(behaviour.tokens, int(max_tokens)) if isinstance(max_tokens, int) and max_tokens > 0 \
+            else behaviour.tokens
+        words = [self._rng.choice(_VOCABULARY) for _ in range(count)]
+        prompt_tokens = sum(len(str(message.get('content', ''))) for message in payload['messages']
+                            if isinstance(message, dict)) // 4
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': count,
+                 'total_tokens': prompt_tokens + count}
+        completion_id = f"chatcmpl-{self._rng.getrandbits(48):012x}"
+        created = int(time.time())
+        stream = behaviour.stream if behaviour.stream is not None else bool(payload.get('stream'))
+
+        await asyncio.sleep(behaviour.first_token_delay(self._rng))
+        if not stream:
+            if behaviour.tokens_per_sec > 0 and count > 1:
+                await asyncio.sleep((count - 1) / behaviour.tokens_per_sec)
+            await self._write_json(writer, 200, {
+                'id': completion_id, 'object': 'chat.completion', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ' '.join(words)},
+                             'finish_reason': 'stop'}],
+                'usage': usage
+            }, keep_alive)
+            self.counters['completed'] += 1
+            self.counters['tokens_sent'] += count
+            return keep_alive
+
+        # The body is delimited by closing the connection: HTTP/1.0 clients such as PHP's stream
+        # wrapper cannot read a chunked response
+        writer.write(self._head(200, [('Content-Type', 'text/event-stream'), ('Cache-Control', 'no-cache')],
+                                keep_alive=False))
+
+        def chunk(delta: Dict, finish: Optional[str] = None) -> bytes:
+            return b'data: ' + json.dumps({
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish}]
+            }).encode('utf-8') + b'\n\n'
+
+        writer.write(chunk({'role': 'assistant', 'content': ''}))
+        interval = 1.0 / behaviour.tokens_per_sec if behaviour.tokens_per_sec > 0 else 0.0
+        start = time.perf_counter()
+        sent = 0
+        while sent < count:
+            # Send every token that is due by now, then sleep until the next one
+            if interval == 0:
+                due = count
+            else:
+                due = min(count, max(sent + 1, int((time.perf_counter() - start) / interval) + 1))
+            text = ' '.join(words[sent:due])
+            writer.write(chunk({'content': text if sent == 0 else ' ' + text}))
+            await writer.drain()
+            self.counters['tokens_sent'] += due - sent
+            sent = due
+            if sent < count:
+                await asyncio.sleep(max(_MIN_CHUNK_INTERVAL, start + sent * interval - time.perf_counter()))
+
+        writer.write(chunk({}, 'stop'))
+        writer.write(b'data: ' + json.dumps({'id': completion_id, 'object': 'chat.completion.chunk',
+                                             'created': created, 'model': model, 'choices': [],
+                                             'usage': usage}).encode('utf-8') + b'\n\n')
+        writer.write(b'data: [DONE]\n\n')
+        await writer.drain()
+        self.counters['completed'] += 1
+        self.counters['streamed'] += 1
+        return False
+
+    @staticmethod
+    def _head(status: int, headers: List, keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(self._head(status, [('Content-Type', 'application/json'),
+                                         ('Content-Length', str(len(body)))], keep_alive) + body)
+        await writer.drain()
+
+
+class ProbeResult:
+    """Client-side view of one completion request."""
+
+    __slots__ = ('ok', 'status', 'ttft', 'total', 'tokens')
+
+    def __init__(self, ok: bool, status: int, ttft: float, total: float, tokens: int):
+        self.ok = ok
+        self.status = status
+        self.ttft = ttft
+        self.total = total
+        self.tokens = tokens
+
+
+def probe_once(session: requests.Session, base_url: str, stream: bool, timeout: float,
+               api_key: str = 'mock', model: str = 'mock-model') -> ProbeResult:
+    """Send one chat completion and measure time to first token and token count."""
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{base_url.rstrip('/')}/chat/completions", json={
+            'model': model, 'stream': stream,
+            'messages': [{'role': 'user', 'content': 'Describe how a graph workflow runs.'}]
+        }, headers={'Authorization': f'Bearer {api_key}'}, timeout=timeout, stream=stream)
+    except requests.RequestException:
+        return ProbeResult(False, 0, 0.0, time.perf_counter() - start, 0)
+
+    if response.status_code != 200:
+        response.close()
+        return ProbeResult(False, response.status_code, 0.0, time.perf_counter() - start, 0)
+
+    if not stream:
+        try:
+            data = response.json()
+            tokens = data.get('usage', {}).get('completion_tokens', 0)
+        except ValueError:
+            return ProbeResult(False, response.status_code, 0.0, time.perf_counter() - start, 0)
+        total = time.perf_counter() - start
+        return ProbeResult(True, 200, total, total, tokens)
+
+    ttft = 0.0
+    tokens = 0
+    try:
+        for line in response.iter_lines():
+            if not line.startswith(b'data: ') or line == b'data: [DONE]':
+                continue
+            chunk = json.loads(line[6:])
+            choices = chunk.get('choices') or [{}]
+            if choices[0].get('delta', {}).get('content') and not ttft:
+                ttft = time.perf_counter() - start
+            if chunk.get('usage'):
+                tokens = chunk['usage'].get('completion_tokens', tokens)
+    except (requests.RequestException, ValueError):
+        return ProbeResult(False, response.status_code, ttft, time.perf_counter() - start, tokens)
+    return ProbeResult(True, 200, ttft, time.perf_counter() - start, tokens)
+
+
+def run_probe(base_url: str, requests_count: int, concurrency: int, stream: bool, timeout: float,
+              api_key: str = 'mock', model: str = 'mock-model') -> List[ProbeResult]:
+    """Send requests_count completions with the given concurrency and print TTFT and throughput."""
+    local = threading.local()
+
+    def send(_):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        return probe_once(session, base_url, stream, timeout, api_key, model)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, range(requests_count)))
+    elapsed = time.perf_counter() - start
+
+    ttft, total = LatencyHistogram(), LatencyHistogram()
+    tokens = 0
+    generation = 0.0
+    failures: Dict[int, int] = {}
+    for result in results:
+        if not result.ok:
+            failures[result.status] = failures.get(result.status, 0) + 1
+            continue
+        ttft.record(result.ttft)
+        total.record(result.total)
+        tokens += result.tokens
+        generation += max(result.total - result.ttft, 0.0)
+
+    print(f"\n🤖 Model probe: {requests_count} {'streaming' if stream else 'non-streaming'} completions, "
+          f"concurrency {concurrency}, {base_url}")
+    print("=" * 100)
+    print(f"{'':<12}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print("-" * 100)
+    for label, histogram in (('TTFT', ttft), ('total', total)):
+        print(f"{label:<12}{histogram.percentile(50) * 1000:>10.1f}{histogram.percentile(90) * 1000:>10.1f}"
+              f"{histogram.percentile(99) * 1000:>10.1f}{histogram.max * 1000:>10.1f}")
+    print("-" * 100)
+    print(f"Completed {ttft.count}/{requests_count} in {elapsed:.2f}s ({ttft.count / elapsed if elapsed else 0:.1f} req/s), "
+          f"{tokens} tokens ({tokens / elapsed if elapsed else 0:.0f} tokens/s aggregate"
+          + (f", {tokens / generation:.0f} tokens/s per stream" if stream and generation else '') + ")")
+    if failures:
+        print("Failures: " + ', '.join(f"{'timeout/connection' if status == 0 else f'HTTP {status}'} × {count}"
+                                       for status, count in sorted(failures.items())))
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock model for offline benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--ttft', type=float, default=0.3, help="time to first token in seconds")
+    parser.add_argument('--ttft-jitter', type=float, default=0.0, help="uniform +/- jitter on the TTFT")
+    parser.add_argument('--tokens-per-sec', type=float, default=50.0, help="generation speed (0: instant)")
+    parser.add_argument('--tokens', type=int, default=100, help="completion length (capped by max_tokens)")
+    parser.add_argument('--mode', choices=['auto', 'stream', 'json'], default='auto',
+                        help="auto follows the request's stream flag")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction answered with --error-status")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--timeout-rate', type=float, default=0.0,
+                        help="fraction accepted but left unanswered for --stall seconds")
+    parser.add_argument('--stall', type=float, default=120.0)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--probe', action='store_true',
+                        help="measure TTFT and throughput against --url (or an in-process mock)")
+    parser.add_argument('--url', default=None, help="probe mode: base URL of an OpenAI-compatible API")
+    parser.add_argument('--api-key', default='mock')
+    parser.add_argument('--model', default='mock-model')
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--stream', action='store_true', help="probe mode: request streaming completions")
+    parser.add_argument('--timeout', type=float, default=60.0, help="probe mode: client timeout in seconds")
+    args = parser.parse_args(argv)
+
+    behaviour = ModelBehaviour(args.ttft, args.ttft_jitter, args.tokens_per_sec, args.tokens, args.error_rate,
+                               args.error_status, args.timeout_rate, args.stall,
+                               {'auto': None, 'stream': True, 'json': False}[args.mode])
+
+    if args.probe:
+        server = None
+        base_url = args.url
+        if base_url is None:
+            server = MockLLMServer(args.host, 0, behaviour, args.seed).start_in_thread()
+            base_url = server.base_url
+        try:
+            results = run_probe(base_url, args.requests, args.concurrency, args.stream, args.timeout,
+                                args.api_key, args.model)
+        finally:
+            if server is not None:
+                print(f"Mock counters: {json.dumps({k: v for k, v in server.counters.items() if k != 'in_flight'})}")
+                server.stop()
+        return 0 if any(result.ok for result in results) else 1
+
+    server = MockLLMServer(args.host, args.port, behaviour, args.seed)
+    print(f"Mock model listening on http://{args.host}:{args.port}/v1 "
+          f"(TTFT {args.ttft * 1000:.0f} ms, {args.tokens_per_sec:g} tokens/s, {args.tokens} tokens)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    print(f"Mock counters: {json.dumps(server.counters)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Open-loop (constant arrival rate) load generation.
+
+The closed-loop LoadTester only sends the next request after the previous one
+returns, so when the server stalls the client quietly sends less and the
+recorded latencies hide the stall (coordinated omission). Here requests are
+scheduled on a fixed or Poisson arrival timeline that does not depend on
+completions, and latency is measured from each request's intended send time.
+Service time (measured from the actual send) is reported alongside, so any
+gap between the two shows queueing.
+
+Usage:
+    python3 test_apis.py --rate 50 --duration 60 --arrival poisson
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List
+
+import requests
+
+from . import BASE_URL
+from .load import DEFAULT_ENDPOINTS, _split, send_request
+from .runner import create_session
+from .scenarios import Scenario
+from .stats import EndpointStats, LatencyHistogram, merge_stats
+
+ARRIVALS = ('constant', 'poisson')
+
+# A request that starts this long after its intended time means the client, not the server, fell behind
+LATE_START_THRESHOLD = 0.010
+
+
+def arrival_offsets(rate: float, duration: float, arrival: str = 'constant',
+                    rng: random.Random = None, phase: float = 0.0) -> Iterator[float]:
+    """Yield intended send offsets (seconds from the start) for the given arrival process."""
+    if rate <= 0:
+        return
+    if arrival == 'constant':
+        interval = 1.0 / rate
+        offset = phase
+        while offset < duration:
+            yield offset
+            offset += interval
+    elif arrival == 'poisson':
+        rng = rng or random.Random()
+        offset = phase + rng.expovariate(rate)
+        while offset < duration:
+            yield offset
+            offset += rng.expovariate(rate)
+    else:
+        raise ValueError(f"Unknown arrival process: {arrival}")
+
+
+class OpenLoopTester:
+    """Send requests at a fixed offered rate regardless of how fast responses come back."""
+
+    def __init__(self, base_url: str = BASE_URL, rate: float = 10.0, duration: float = 30.0,
+                 endpoints: List[Scenario] = None, arrival: str = 'constant', max_in_flight: int = 256,
+                 timeout: float = 30.0, processes: int = 1, seed: int = None):
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process: {arrival}")
+
+        self.base_url = base_url
+        self.rate = rate
+        self.duration = duration
+        self.endpoints = endpoints or DEFAULT_ENDPOINTS
+        self.arrival = arrival
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        # 0 means one worker process per CPU core
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.seed = seed
+        self.elapsed = 0.0
+        self.cpu_time = 0.0
+        self.scheduled = 0
+        self.late_starts = 0
+        self.max_start_lag = 0.0
+        # Response time, measured from the intended send time
+        self.stats: Dict[str, EndpointStats] = {}
+        # Service time, measured from the actual send
+        self.service: Dict[str, LatencyHistogram] = {}
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = create_session()
+        return session
+
+    def _send(self, endpoint: Scenario, intended: float):
+        started = time.perf_counter()
+        try:
+            ok = send_request(self._session(), self.base_url, endpoint, self.timeout)
+        except requests.RequestException:
+            ok = False
+        finished = time.perf_counter()
+
+        lag = started - intended
+        with self._lock:
+            self.stats[endpoint.name].record(finished - intended, ok)
+            self.service[endpoint.name].record(finished - started)
+            if lag > LATE_START_THRESHOLD:
+                self.late_starts += 1
+            if lag > self.max_start_lag:
+                self.max_start_lag = lag
+
+    def run(self) -> Dict[str, EndpointStats]:
+        """Run the schedule and return per-endpoint response-time statistics."""
+        self.stats = {endpoint.name: EndpointStats(endpoint.name) for endpoint in self.endpoints}
+        self.service = {endpoint.name: LatencyHistogram() for endpoint in self.endpoints}
+        if self.processes > 1:
+            self._run_processes()
+        else:
+            self._run_schedule(self.rate, 0.0, 0)
+        return self.stats
+
+    def _run_schedule(self, rate: float, phase: float, first_index: int):
+        self.scheduled = 0
+        self.late_starts = 0
+        self.max_start_lag = 0.0
+        rng = random.Random(self.seed)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            for offset in arrival_offsets(rate, self.duration, self.arrival, rng, phase):
+                intended = start + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                endpoint = self.endpoints[(first_index + self.scheduled) % len(self.endpoints)]
+                self.scheduled += 1
+                # Submission never waits for completions; if every worker is busy the request
+                # queues and that wait is part of its measured latency
+                pool.submit(self._send, endpoint, intended)
+
+        self.elapsed = time.perf_counter() - start
+        self.cpu_time = time.process_time() - cpu_start
+
+    def _run_processes(self):
+        rates = [self.rate / self.processes] * self.processes
+        in_flight = _split(self.max_in_flight, self.processes)
+
+        self.elapsed = 0.0
+        self.cpu_time = 0.0
+        self.scheduled = 0
+        self.late_starts = 0
+        self.max_start_lag = 0.0
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            futures = [
+                # Stagger constant schedules so the processes interleave instead of firing together
+                pool.submit(_process_worker, self.base_url, rates[i], self.duration, self.endpoints,
+                            self.arrival, max(1, in_flight[i]), self.timeout,
+                            None if self.seed is None else self.seed + i, i / self.rate, i)
+                for i in range(self.processes)
+            ]
+            for future in futures:
+                worker = future.result()
+                merge_stats(self.stats, worker['stats'])
+                for name, histogram in worker['service'].items():
+                    self.service[name].merge(histogram)
+                self.elapsed = max(self.elapsed, worker['elapsed'])
+                self.cpu_time += worker['cpu_time']
+                self.scheduled += worker['scheduled']
+                self.late_starts += worker['late_starts']
+                self.max_start_lag = max(self.max_start_lag, worker['max_start_lag'])
+
+    def print_report(self):
+        """Print response time (from intended send) next to service time per endpoint."""
+        total = sum(endpoint_stats.count for endpoint_stats in self.stats.values())
+        achieved = total / self.elapsed if self.elapsed > 0 else 0.0
+        print(f"\nOpen-loop test: {self.arrival} arrivals at {self.rate:.1f} req/s offered, "
+              f"{achieved:.1f} req/s completed, {self.elapsed:.1f}s elapsed, "
+              f"{self.processes} process(es)")
+        print("=" * 100)
+        print(f"{'endpoint':<22}{'requests':>9}{'errors':>9}{'p50 ms':>10}{'p90 ms':>10}"
+              f"{'p99 ms':>10}{'max ms':>10}{'svc p50':>10}{'svc p99':>10}")
+        print("-" * 100)
+
+        total_errors = 0
+        for name, endpoint_stats in self.stats.items():
+            summary = endpoint_stats.summary(self.elapsed)
+            service = self.service[name]
+            total_errors += endpoint_stats.errors
+            print(f"{name:<22}{summary['requests']:>9}{summary['error_rate']:>9.1%}"
+                  f"{summary['p50']:>10.1f}{summary['p90']:>10.1f}{summary['p99']:>10.1f}"
+                  f"{summary['max']:>10.1f}{service.percentile(50) * 1000:>10.1f}"
+                  f"{service.percentile(99) * 1000:>10.1f}")
+
+        print("-" * 100)
+        print(f"Total: {total} of {self.scheduled} scheduled requests completed, "
+              f"{total_errors / total if total else 0.0:.1%} errors")
+        print("Latency is measured from the intended send time; 'svc' columns from the actual send.")
+        if self.late_starts:
+            print(f"⚠️  {self.late_starts} requests started more than {LATE_START_THRESHOLD * 1000:.0f} ms "
+                  f"late (max {self.max_start_lag * 1000:.1f} ms); the client fell behind its schedule, "
+                  f"consider raising --in-flight or --processes")
+
+
+def _process_worker(base_url: str, rate: float, duration: float, endpoints: List[Scenario], arrival: str,
+                    max_in_flight: int, timeout: float, seed: int, phase: float, first_index: int) -> Dict:
+    """Entry point of one worker process: run its share of the schedule and return the histograms."""
+    tester = OpenLoopTester(base_url, rate=rate, duration=duration, endpoints=endpoints, arrival=arrival,
+                            max_in_flight=max_in_flight, timeout=timeout, processes=1, seed=seed)
+    tester.stats = {endpoint.name: EndpointStats(endpoint.name) for endpoint in endpoints}
+    tester.service = {endpoint.name: LatencyHistogram() for endpoint in endpoints}
+    tester._run_schedule(rate, phase if arrival == 'constant' else 0.0, first_index)
+    return {
+        'stats': tester.stats,
+        'service': tester.service,
+        'elapsed': tester.elapsed,
+        'cpu_time': tester.cpu_time,
+        'scheduled': tester.scheduled,
+        'late_starts': tester.late_starts,
+        'max_start_lag': tester.max_start_lag
+    }
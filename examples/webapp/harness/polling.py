@@ -0,0 +1,326 @@
+"""
+Conditional-GET polling: what ETag/Last-Modified revalidation saves.
+
+The article, chat history and validation report reads answer with ETag (and,
+where the controller knows it, Last-Modified) validators and return an empty
+304 Not Modified when the client's copy is still current. ValidatorCache is a
+small client-side cache that remembers the validators and body per URL, sends
+If-None-Match / If-Modified-Since, and serves the cached body on a 304.
+
+PollingBenchmark polls the read endpoints the way a dashboard does: first
+without validators (every poll is a full 200), then through a ValidatorCache.
+The report compares body bytes per poll and the bytes saved, and the p50/p99
+latency of 304 responses against 200 responses. With --change-every a writer
+transitions the polled article on a schedule; every poll that starts after a
+change must see at least that version. A stale read (a 304 for a changed
+article) counts as a failure.
+
+Usage:
+    python3 -m harness.polling --pollers 8 --interval 0.1 --duration 20
+    python3 -m harness.polling --pollers 16 --duration 30 --change-every 1
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from . import BASE_URL
+from .runner import create_session
+from .stats import LatencyHistogram
+
+# Transitions that keep a stored article changing forever: draft → review ⇄ rejected
+_CHANGE_CYCLE = {'draft': 'submit', 'review': 'reject', 'rejected': 'resubmit'}
+
+
+def poll_targets(article_id: int) -> List[Tuple[str, str]]:
+    """(name, path) of each polled read; the article is a stored one so it can change."""
+    return [
+        ('article', f'/article/{article_id}'),
+        ('chat_history', '/chat/history/polling_conversation'),
+        ('validation_report', '/workflow-validation/report/polling_validation'),
+    ]
+
+
+class CachedResponse:
+    """Validators and body of the last full response for one URL."""
+
+    __slots__ = ('etag', 'last_modified', 'body')
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+
+
+class ValidatorCache:
+    """
+    Client-side cache of response validators, bounded to `max_entries` URLs (LRU).
+
+    get() sends the stored validators as If-None-Match / If-Modified-Since and
+    returns the cached body when the server answers 304 Not Modified. Responses
+    without ETag or Last-Modified are not cached. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def headers_for(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> Tuple[requests.Response, bytes]:
+        """GET url with revalidation; returns the response and the (possibly cached) body."""
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(self.headers_for(url))
+        response = session.get(url, headers=headers, **kwargs)
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if response.status_code == 304 and entry is not None:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                self.bytes_saved += len(entry.body)
+                return response, entry.body
+
+            self.misses += 1
+            body = response.content
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if response.status_code == 200 and (etag or last_modified):
+                self._entries[url] = CachedResponse(etag, last_modified, body)
+                self._entries.move_to_end(url)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            elif entry is not None and response.status_code == 200:
+                # The resource stopped sending validators: the old copy must not be revalidated any more
+                del self._entries[url]
+            return response, body
+
+
+class PollStats:
+    """Poll outcomes of one endpoint in one phase."""
+
+    __slots__ = ('polls', 'full', 'not_modified', 'errors', 'stale', 'bytes', 'bytes_saved', 'latency_200',
+                 'latency_304')
+
+    def __init__(self):
+        self.polls = 0
+        self.full = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.stale = 0
+        self.bytes = 0
+        self.bytes_saved = 0
+        self.latency_200 = LatencyHistogram()
+        self.latency_304 = LatencyHistogram()
+
+
+class PollingBenchmark:
+    """Poll the read endpoints without and then with validators, optionally while the article changes."""
+
+    PHASES = ('full', 'conditional')
+
+    def __init__(self, base_url: str = BASE_URL, pollers: int = 4, interval: float = 0.1, duration: float = 10.0,
+                 change_every: float = 0.0, article_id: Optional[int] = None, timeout: float = 30.0):
+        self.base_url = base_url
+        self.pollers = pollers
+        self.interval = interval
+        self.duration = duration
+        self.change_every = change_every
+        self.article_id = article_id or random.randint(100000, 999999)
+        self.timeout = timeout
+        self.targets = poll_targets(self.article_id)
+        self.stats: Dict[str, Dict[str, PollStats]] = {
+            phase: {name: PollStats() for name, _ in self.targets} for phase in self.PHASES
+        }
+        self.changes = 0
+        self.change_errors = 0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _article_version(body: bytes) -> Optional[int]:
+        try:
+            return int(json.loads(body)['data']['article']['version'])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _poll(self, phase: str, session: requests.Session, cache: Optional[ValidatorCache], name: str, path: str):
+        url = f"{self.base_url}{path}"
+        with self._lock:
+            # A change acknowledged before this poll started must be visible in its answer
+            known_version = self._version
+        start = time.perf_counter()
+        try:
+            if cache is not None:
+                response, body = cache.get(session, url, timeout=self.timeout)
+                saved = len(body) if response.status_code == 304 else 0
+            else:
+                response = session.get(url, timeout=self.timeout)
+                body, saved = response.content, 0
+        except requests.RequestException:
+            with self._lock:
+                self.stats[phase][name].polls += 1
+                self.stats[phase][name].errors += 1
+            return
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            stats = self.stats[phase][name]
+            stats.polls += 1
+            stats.bytes += len(response.content)
+            stats.bytes_saved += saved
+            if response.status_code == 304:
+                stats.not_modified += 1
+                stats.latency_304.record(elapsed)
+            elif response.status_code == 200:
+                stats.full += 1
+                stats.latency_200.record(elapsed)
+            else:
+                stats.errors += 1
+                return
+            if name == 'article':
+                version = self._article_version(body)
+                if version is None or version < known_version:
+                    stats.stale += 1
+
+    def _poller(self, phase: str, deadline: float, cache: Optional[ValidatorCache]):
+        session = create_session()
+        try:
+            while time.perf_counter() < deadline:
+                for name, path in self.targets:
+                    self._poll(phase, session, cache, name, path)
+                if self.interval > 0:
+                    time.sleep(self.interval)
+        finally:
+            session.close()
+
+    def _writer(self, deadline: float):
+        session = create_session()
+        try:
+            while time.perf_counter() + self.change_every < deadline:
+                time.sleep(self.change_every)
+                try:
+                    current = session.get(f"{self.base_url}/article/{self.article_id}", timeout=self.timeout)
+                    status = current.json()['data']['article']['status']
+                    response = session.post(f"{self.base_url}/article/{self.article_id}/transition/"
+                                            f"{_CHANGE_CYCLE[status]}", json={}, timeout=self.timeout)
+                    version = response.json()['data']['version'] if response.status_code == 200 else None
+                except (requests.RequestException, ValueError, KeyError, TypeError):
+                    version = None
+                with self._lock:
+                    if version is None:
+                        self.change_errors += 1
+                    else:
+                        self.changes += 1
+                        self._version = max(self._version, int(version))
+        finally:
+            session.close()
+
+    def run_phase(self, phase: str):
+        cache = ValidatorCache() if phase == 'conditional' else None
+        deadline = time.perf_counter() + self.duration
+        with ThreadPoolExecutor(max_workers=self.pollers + 1) as pool:
+            futures = [pool.submit(self._poller, phase, deadline, cache) for _ in range(self.pollers)]
+            if self.change_every > 0:
+                futures.append(pool.submit(self._writer, deadline))
+            for future in futures:
+                future.result()
+
+    def run(self) -> Dict[str, Dict[str, PollStats]]:
+        for phase in self.PHASES:
+            print(f"  {phase} polling: {self.pollers} poller(s) every {self.interval:g}s for {self.duration:g}s")
+            self.run_phase(phase)
+        return self.stats
+
+    def print_report(self):
+        print(f"\n🔁 Conditional GET Polling ({self.pollers} pollers, {self.interval:g}s interval, "
+              f"{self.duration:g}s per phase)")
+        print("=" * 100)
+        print(f"{'endpoint':<20}{'polls':>8}{'304 rate':>10}{'full B/poll':>13}{'cond B/poll':>13}"
+              f"{'saved':>8}{'200 p50':>9}{'p99':>8}{'304 p50':>9}{'p99':>8}")
+        print("-" * 100)
+
+        def ms(histogram: LatencyHistogram, pct: float) -> str:
+            return f"{histogram.percentile(pct) * 1000:.1f}" if histogram.count else '-'
+
+        total_full = total_cond = total_saved = 0
+        stale = errors = 0
+        for name, _ in self.targets:
+            full = self.stats['full'][name]
+            cond = self.stats['conditional'][name]
+            stale += cond.stale + full.stale
+            errors += cond.errors + full.errors
+            total_full += full.bytes
+            total_cond += cond.bytes
+            total_saved += cond.bytes_saved
+            # 200 latency from both phases: the conditional phase alone has few full responses
+            latency_200 = LatencyHistogram()
+            latency_200.merge(full.latency_200)
+            latency_200.merge(cond.latency_200)
+            per_full = full.bytes / full.polls if full.polls else 0.0
+            per_cond = cond.bytes / cond.polls if cond.polls else 0.0
+            saved = cond.bytes_saved / (cond.bytes + cond.bytes_saved) if cond.bytes + cond.bytes_saved else 0.0
+            print(f"{name:<20}{cond.polls:>8}{cond.not_modified / max(cond.polls, 1):>10.1%}{per_full:>13.0f}"
+                  f"{per_cond:>13.0f}{saved:>8.1%}{ms(latency_200, 50):>9}{ms(latency_200, 99):>8}"
+                  f"{ms(cond.latency_304, 50):>9}{ms(cond.latency_304, 99):>8}")
+        print("-" * 100)
+        print(f"body bytes: full phase {total_full}, conditional phase {total_cond}, "
+              f"served from the client cache {total_saved}")
+
+        if self.change_every > 0:
+            print(f"article changes applied: {self.changes} (failed {self.change_errors})")
+        if errors:
+            print(f"⚠️  {errors} polls failed")
+        if stale:
+            print(f"❌ {stale} stale article reads: a poll returned an older version than an acknowledged change")
+        elif all(stats.not_modified == 0 for stats in self.stats['conditional'].values()):
+            print("⚠️  No 304 responses at all; does the backend send ETag/Last-Modified validators?")
+        else:
+            print("✅ No stale reads")
+
+    @property
+    def stale_reads(self) -> int:
+        return sum(stats.stale for phase in self.stats.values() for stats in phase.values())
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure what ETag/Last-Modified revalidation saves when polling")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--pollers', type=int, default=4)
+    parser.add_argument('--interval', type=float, default=0.1, help="pause between polling rounds, seconds")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per phase")
+    parser.add_argument('--change-every', type=float, default=0.0,
+                        help="transition the polled article every N seconds (0: never)")
+    parser.add_argument('--article-id', type=int, default=None, help="stored article to poll (default: random)")
+    args = parser.parse_args(argv)
+
+    benchmark = PollingBenchmark(args.base_url, args.pollers, args.interval, args.duration, args.change_every,
+                                 args.article_id)
+    benchmark.run()
+    benchmark.print_report()
+    return 1 if benchmark.stale_reads else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
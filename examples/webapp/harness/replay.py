@@ -0,0 +1,490 @@
+"""
+Traffic record and replay.
+
+Request streams (arrival offset, method, path, body) are kept in a compact
+binary corpus: a short header followed by fixed-size record headers and the
+raw path and body bytes, with large bodies zlib-compressed. Corpora are read
+through mmap and iterated lazily, so replaying millions of requests never
+holds more than the in-flight bodies in memory.
+
+A corpus can be imported from a web-server access log (combined log format,
+or NDJSON lines that include bodies) or recorded by a proxy placed between the
+frontend and the backend. Replay runs at the recorded pace scaled by --speed,
+or as fast as possible, and keeps requests for the same conversation
+(/chat/*) or the same article (/article/*) in their recorded order.
+
+Usage:
+    python3 -m harness.replay import access.log -o traffic.corpus
+    python3 -m harness.replay record --listen 8000 --upstream http://127.0.0.1:8001 -o traffic.corpus
+    python3 -m harness.replay info traffic.corpus
+    python3 -m harness.replay replay traffic.corpus --speed 10
+"""
+
+import argparse
+import asyncio
+import json
+import mmap
+import re
+import signal
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from . import BASE_URL
+from .runner import create_session
+from .scenarios import API_SCENARIOS
+from .stats import EndpointStats, LatencyHistogram
+from .stub_server import match_route, read_request
+
+CORPUS_MAGIC = b'AGCORP\x00\x01'
+API_PREFIX = '/api'
+
+# offset (s), method code, flags, path length, body length
+_RECORD = struct.Struct('<dBBHI')
+_FLAG_COMPRESSED = 1
+_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+_METHOD_CODES = {method: code for code, method in enumerate(_METHODS)}
+
+# Access logs carry no bodies; POST requests are replayed with the scenario payload of their route
+_DEFAULT_BODIES = {scenario.name: json.dumps(scenario.payload).encode()
+                   for scenario in API_SCENARIOS if scenario.payload is not None}
+
+_COMBINED_LOG = re.compile(r'\[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+)[^"]*"')
+
+
+class CorpusEntry(NamedTuple):
+    """One recorded request; path is relative to the API base URL (e.g. /article/1)."""
+    offset: float
+    method: str
+    path: str
+    body: bytes
+
+
+class CorpusWriter:
+    """Append requests to a corpus file. Safe to call from several threads."""
+
+    def __init__(self, path: str, compress_threshold: int = 256):
+        self.path = path
+        self.compress_threshold = compress_threshold
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(CORPUS_MAGIC)
+        self._lock = threading.Lock()
+
+    def write(self, offset: float, method: str, path: str, body: bytes = b''):
+        flags = 0
+        if len(body) >= self.compress_threshold:
+            compressed = zlib.compress(body, 6)
+            if len(compressed) < len(body):
+                body, flags = compressed, _FLAG_COMPRESSED
+        encoded_path = path.encode('utf-8')
+        header = _RECORD.pack(offset, _METHOD_CODES[method], flags, len(encoded_path), len(body))
+        with self._lock:
+            self._file.write(header)
+            self._file.write(encoded_path)
+            self._file.write(body)
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Corpus:
+    """Memory-mapped, lazily iterated corpus."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        if self._file.read(len(CORPUS_MAGIC)) != CORPUS_MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a traffic corpus")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __iter__(self) -> Iterator[CorpusEntry]:
+        data = self._map
+        position = len(CORPUS_MAGIC)
+        size = len(data)
+        while position + _RECORD.size <= size:
+            offset, method, flags, path_length, body_length = _RECORD.unpack_from(data, position)
+            position += _RECORD.size
+            path = data[position:position + path_length].decode('utf-8')
+            position += path_length
+            body = data[position:position + body_length]
+            position += body_length
+            if flags & _FLAG_COMPRESSED:
+                body = zlib.decompress(body)
+            yield CorpusEntry(offset, _METHODS[method], path, body)
+
+    def headers(self) -> Iterator[Tuple[float, str, str, int]]:
+        """Yield (offset, method, path, stored body size) without touching the bodies."""
+        data = self._map
+        position = len(CORPUS_MAGIC)
+        while position + _RECORD.size <= len(data):
+            offset, method, _, path_length, body_length = _RECORD.unpack_from(data, position)
+            position += _RECORD.size
+            path = data[position:position + path_length].decode('utf-8')
+            position += path_length + body_length
+            yield offset, _METHODS[method], path, body_length
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _api_path(target: str) -> Optional[str]:
+    """Strip scheme, host and the /api prefix; None for paths outside the API."""
+    path = urlsplit(target).path if '://' in target else target
+    if not path.startswith(API_PREFIX + '/'):
+        return None
+    return path[len(API_PREFIX):]
+
+
+def _parse_time(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.strptime(value, '%d/%b/%Y:%H:%M:%S %z').timestamp()
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def import_access_log(lines: Iterable[str], writer: CorpusWriter, log_format: str = 'combined') -> int:
+    """Convert access-log lines into corpus entries; returns the number imported."""
+    first = None
+    imported = 0
+    for line in lines:
+        if log_format == 'ndjson':
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            timestamp = _parse_time(item['time'])
+            method = item['method'].upper()
+            target = item.get('path') or item['url']
+            body = item.get('body')
+            if isinstance(body, (dict, list)):
+                body = json.dumps(body)
+            body = body.encode('utf-8') if isinstance(body, str) else None
+        else:
+            match = _COMBINED_LOG.search(line)
+            if match is None:
+                continue
+            timestamp = _parse_time(match.group('time'))
+            method = match.group('method')
+            target = match.group('target')
+            body = None
+
+        path = _api_path(target)
+        route = match_route(method, API_PREFIX + path) if path else None
+        if route is None:
+            continue
+        if body is None:
+            body = _DEFAULT_BODIES.get(route[0], b'') if method != 'GET' else b''
+
+        first = timestamp if first is None else first
+        writer.write(max(0.0, timestamp - first), method, path, body)
+        imported += 1
+    return imported
+
+
+def ordering_key(method: str, path: str, body: bytes) -> Optional[str]:
+    """Requests sharing a key must be replayed in their recorded order."""
+    route = match_route(method, API_PREFIX + path)
+    if route is None:
+        return None
+    name, params = route
+    if name == 'chat_history':
+        return f"chat:{params['conversation_id']}"
+    if name == 'chat_process':
+        try:
+            conversation_id = json.loads(body).get('conversation_id') if body else None
+        except (ValueError, AttributeError):
+            conversation_id = None
+        return f"chat:{conversation_id}" if conversation_id else None
+    if name in ('article_get', 'article_transition'):
+        return f"article:{params.get('id') or ''}"
+    return None
+
+
+class RecordingProxy:
+    """Forward requests to the backend and append every /api request to a corpus."""
+
+    def __init__(self, writer: CorpusWriter, upstream: str, host: str = '127.0.0.1', port: int = 8000):
+        parts = urlsplit(upstream)
+        self.writer = writer
+        self.upstream_host = parts.hostname
+        self.upstream_port = parts.port or 80
+        self.host = host
+        self.port = port
+        self._start = time.perf_counter()
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port, reuse_address=True)
+        print(f"🎙️  Recording {self.host}:{self.port} → {self.upstream_host}:{self.upstream_port} "
+              f"into {self.writer.path}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # One request per connection: the response is piped through until the backend closes
+        try:
+            request = await read_request(reader)
+            if request is None:
+                return
+            method, target, _, headers, body = request
+            path = _api_path(target)
+            if path and match_route(method, target):
+                self.writer.write(time.perf_counter() - self._start, method, path, body)
+
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host,
+                                                                             self.upstream_port)
+            forwarded = {name: value for name, value in headers.items()
+                         if name not in ('connection', 'content-length', 'transfer-encoding', 'host')}
+            forwarded.update({'host': f"{self.upstream_host}:{self.upstream_port}",
+                              'content-length': str(len(body)), 'connection': 'close'})
+            head = f"{method} {target} HTTP/1.1\r\n" + ''.join(f"{name}: {value}\r\n"
+                                                              for name, value in forwarded.items())
+            upstream_writer.write(head.encode('latin-1') + b'\r\n' + body)
+            await upstream_writer.drain()
+
+            try:
+                while True:
+                    chunk = await upstream_reader.read(65536)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    await writer.drain()
+            finally:
+                upstream_writer.close()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+class Replayer:
+    """Replay a corpus at a scaled pace while preserving per-conversation and per-article order."""
+
+    def __init__(self, base_url: str = BASE_URL, corpus: Corpus = None, speed: float = 1.0,
+                 max_in_flight: int = 64, timeout: float = 60.0, limit: Optional[int] = None):
+        self.base_url = base_url
+        self.corpus = corpus
+        # 0 replays as fast as max_in_flight allows
+        self.speed = speed
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.limit = limit
+        self.stats: Dict[str, EndpointStats] = {}
+        # How late each request started against its scaled schedule (includes waits on ordering)
+        self.lag = LatencyHistogram()
+        self.statuses: Dict[int, int] = {}
+        self.replayed = 0
+        self.recorded_span = 0.0
+        self.elapsed = 0.0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pending: Dict[str, Deque[Tuple[CorpusEntry, float]]] = {}
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = create_session()
+        return session
+
+    def _send(self, entry: CorpusEntry, intended: float):
+        route = match_route(entry.method, API_PREFIX + entry.path)
+        name = route[0] if route else 'other'
+        started = time.perf_counter()
+        status = 0
+        try:
+            response = self._session().request(entry.method, f"{self.base_url}{entry.path}",
+                                               data=entry.body or None, timeout=self.timeout)
+            response.content  # Consume the whole body, including SSE streams
+            status = response.status_code
+        except requests.RequestException:
+            pass
+        finished = time.perf_counter()
+
+        with self._lock:
+            if name not in self.stats:
+                self.stats[name] = EndpointStats(name)
+            # Client errors are part of real traffic; only server errors and failures count
+            self.stats[name].record(finished - started, 0 < status < 500)
+            self.lag.record(max(0.0, started - intended))
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.replayed += 1
+
+    def _send_in_order(self, key: Optional[str], entry: CorpusEntry, intended: float):
+        while True:
+            try:
+                self._send(entry, intended)
+            finally:
+                self._slots.release()
+            if key is None:
+                return
+            with self._lock:
+                queue = self._pending[key]
+                if not queue:
+                    del self._pending[key]
+                    return
+                entry, intended = queue.popleft()
+
+    def run(self):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            for index, entry in enumerate(self.corpus):
+                if self.limit is not None and index >= self.limit:
+                    break
+                self.recorded_span = entry.offset
+                if self.speed > 0:
+                    intended = start + entry.offset / self.speed
+                    delay = intended - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    intended = time.perf_counter()
+
+                # Bounds the bodies held in memory, including those waiting on ordering
+                self._slots.acquire()
+                key = ordering_key(entry.method, entry.path, entry.body)
+                if key is not None:
+                    with self._lock:
+                        if key in self._pending:
+                            self._pending[key].append((entry, intended))
+                            continue
+                        self._pending[key] = deque()
+                pool.submit(self._send_in_order, key, entry, intended)
+        self.elapsed = time.perf_counter() - start
+
+    def print_report(self):
+        pace = f"{self.speed:g}x" if self.speed > 0 else 'max speed'
+        print(f"\nReplay: {self.replayed} requests at {pace} in {self.elapsed:.1f}s "
+              f"(recorded span {self.recorded_span:.1f}s), "
+              f"{self.replayed / self.elapsed if self.elapsed > 0 else 0.0:.1f} req/s")
+        print("=" * 100)
+        print(f"{'endpoint':<22}{'requests':>9}{'req/s':>9}{'errors':>9}"
+              f"{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'max ms':>11}")
+        print("-" * 100)
+        for name, endpoint_stats in sorted(self.stats.items()):
+            summary = endpoint_stats.summary(self.elapsed)
+            print(f"{name:<22}{summary['requests']:>9}{summary['throughput']:>9.1f}"
+                  f"{summary['error_rate']:>9.1%}{summary['p50']:>11.1f}{summary['p90']:>11.1f}"
+                  f"{summary['p99']:>11.1f}{summary['max']:>11.1f}")
+        print("-" * 100)
+        statuses = ', '.join(f"{status or 'failed'}: {count}" for status, count in sorted(self.statuses.items()))
+        print(f"Statuses: {statuses}")
+        print(f"Start lag behind schedule: p50 {self.lag.percentile(50) * 1000:.1f} ms, "
+              f"p99 {self.lag.percentile(99) * 1000:.1f} ms, max {self.lag.max * 1000:.1f} ms")
+
+
+def print_info(corpus: Corpus):
+    routes: Dict[str, int] = {}
+    count = 0
+    stored = 0
+    span = 0.0
+    for offset, method, path, body_size in corpus.headers():
+        route = match_route(method, API_PREFIX + path)
+        name = route[0] if route else 'other'
+        routes[name] = routes.get(name, 0) + 1
+        count += 1
+        stored += body_size
+        span = max(span, offset)
+    print(f"📦 {corpus.path}: {count} requests over {span:.1f}s, "
+          f"{len(corpus._map) / 1024:.1f} KiB on disk ({stored / 1024:.1f} KiB of bodies)")
+    for name, route_count in sorted(routes.items(), key=lambda item: -item[1]):
+        print(f"  {name:<22}{route_count:>9}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record and replay API traffic")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="build a corpus from an access log")
+    import_parser.add_argument('log', help="access log file ('-' for stdin)")
+    import_parser.add_argument('-o', '--output', required=True)
+    import_parser.add_argument('--format', choices=['combined', 'ndjson'], default='combined',
+                               help="combined log format, or NDJSON lines with time/method/path/body")
+
+    record_parser = subparsers.add_parser('record', help="record traffic through a forwarding proxy")
+    record_parser.add_argument('-o', '--output', required=True)
+    record_parser.add_argument('--listen', type=int, default=8000, help="port the frontend talks to")
+    record_parser.add_argument('--host', default='127.0.0.1')
+    record_parser.add_argument('--upstream', default='http://127.0.0.1:8001', help="where the backend runs")
+
+    info_parser = subparsers.add_parser('info', help="summarise a corpus")
+    info_parser.add_argument('corpus')
+
+    replay_parser = subparsers.add_parser('replay', help="replay a corpus against the API")
+    replay_parser.add_argument('corpus')
+    replay_parser.add_argument('--base-url', default=BASE_URL)
+    replay_parser.add_argument('--speed', default='1', help="pace multiplier (1, 10, ...) or 'max'")
+    replay_parser.add_argument('--in-flight', type=int, default=64, help="maximum concurrent requests")
+    replay_parser.add_argument('--limit', type=int, default=None, help="replay only the first N requests")
+    replay_parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        with CorpusWriter(args.output) as writer:
+            if args.log == '-':
+                count = import_access_log(sys.stdin, writer, args.format)
+            else:
+                with open(args.log, encoding='utf-8', errors='replace') as handle:
+                    count = import_access_log(handle, writer, args.format)
+        print(f"✅ Imported {count} requests into {args.output}")
+        return 0
+
+    if args.command == 'record':
+        writer = CorpusWriter(args.output)
+        # Stop cleanly on SIGTERM too, so buffered records are flushed
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            asyncio.run(RecordingProxy(writer, args.upstream, args.host, args.listen).serve_forever())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            writer.close()
+            print(f"\n✅ Recorded {writer.count} requests into {args.output}")
+        return 0
+
+    try:
+        corpus = Corpus(args.corpus)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 2
+
+    with corpus:
+        if args.command == 'info':
+            print_info(corpus)
+            return 0
+
+        speed = 0.0 if args.speed == 'max' else float(args.speed)
+        replayer = Replayer(args.base_url, corpus, speed, args.in_flight, args.timeout, args.limit)
+        replayer.run()
+        replayer.print_report()
+        return 1 if any(status == 0 or status >= 500 for status in replayer.statuses) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Streaming result sinks.
+
+Every finished request becomes a compact ResultRecord (scenario, status,
+timing, byte sizes and a truncated digest of any error) that is written to
+disk as soon as it arrives, as NDJSON or JUnit XML. Nothing per-request is
+kept in memory, so a million-request run costs no more RAM than a short one.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+DIGEST_LIMIT = 200
+
+
+def error_digest(data: Any, limit: int = DIGEST_LIMIT) -> str:
+    """Render a response body or error compactly, truncated to `limit` characters."""
+    if data is None:
+        return ''
+    text = data if isinstance(data, str) else json.dumps(data, default=str, ensure_ascii=False)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… ({len(text)} chars)"
+
+
+class ResultRecord:
+    """Outcome of one request."""
+
+    __slots__ = ('scenario', 'success', 'status', 'duration', 'request_bytes', 'response_bytes',
+                 'events', 'digest', 'timestamp')
+
+    def __init__(self, scenario: str, success: bool, status: int, duration: float, request_bytes: int = 0,
+                 response_bytes: int = 0, events: int = 0, digest: str = '', timestamp: float = None):
+        self.scenario = scenario
+        self.success = success
+        self.status = status
+        self.duration = duration
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.events = events
+        self.digest = digest
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+
+class NDJSONSink:
+    """One JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, record: ResultRecord):
+        line = json.dumps({
+            'scenario': record.scenario,
+            'success': record.success,
+            'status': record.status,
+            'duration_ms': round(record.duration * 1000, 3),
+            'request_bytes': record.request_bytes,
+            'response_bytes': record.response_bytes,
+            'events': record.events,
+            'error': record.digest or None,
+            'timestamp': round(record.timestamp, 3)
+        }, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class JUnitSink:
+    """
+    JUnit XML with one <testcase> per request. Test cases are streamed to a
+    side file; the enclosing <testsuite>, which needs the totals, is written on close.
+    """
+
+    def __init__(self, path: str, suite: str = 'harness'):
+        self.path = path
+        self.suite = suite
+        self.count = 0
+        self.failures = 0
+        self.total_time = 0.0
+        self._started = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._part_path = f"{path}.part"
+        self._file = open(self._part_path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, record: ResultRecord):
+        case = (f'    <testcase classname={quoteattr(self.suite)} name={quoteattr(record.scenario)} '
+                f'time="{record.duration:.6f}"')
+        if record.success:
+            case += '/>\n'
+        else:
+            message = record.digest or f"HTTP {record.status}"
+            case += (f'>\n      <failure message={quoteattr(message)} type="HTTP {record.status}">'
+                     f'{escape(message)}</failure>\n    </testcase>\n')
+        with self._lock:
+            self._file.write(case)
+            self.count += 1
+            self.total_time += record.duration
+            if not record.success:
+                self.failures += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            with open(self.path, 'w', encoding='utf-8') as output:
+                output.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+                output.write(f'  <testsuite name={quoteattr(self.suite)} tests="{self.count}" '
+                             f'failures="{self.failures}" errors="0" time="{self.total_time:.3f}" '
+                             f'timestamp="{self._started}">\n')
+                with open(self._part_path, encoding='utf-8') as part:
+                    shutil.copyfileobj(part, output)
+                output.write('  </testsuite>\n</testsuites>\n')
+            os.remove(self._part_path)
+
+
+def open_sink(path: Optional[str], suite: str = 'harness'):
+    """Pick a sink from the file extension (.xml for JUnit, anything else NDJSON); None passes through."""
+    if not path:
+        return None
+    if path.endswith('.xml'):
+        return JUnitSink(path, suite)
+    return NDJSONSink(path)
+
+
+def shard_path(path: str, index: int) -> str:
+    """results.ndjson -> results.3.ndjson, for one file per worker process."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{index}{extension}"
@@ -0,0 +1,281 @@
+"""
+Dependency-aware parallel executor for declarative scenarios.
+
+Scenarios without unmet dependencies are submitted to a thread pool as soon
+as they become ready, so a full pass takes roughly as long as its slowest
+dependency chain instead of the sum of every call.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Set, Tuple
+
+import requests
+
+from . import BASE_URL
+from .results import ResultRecord, error_digest
+from .scenarios import Scenario
+from .sse import SSEEvent, iter_events
+from .timing import StreamTiming
+
+
+def create_session() -> requests.Session:
+    """Create a session with the JSON headers the API expects."""
+    session = requests.Session()
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    })
+    return session
+
+
+class MalformedEventError(requests.RequestException):
+    """A stream event that should carry a JSON object did not; the request counts as failed."""
+
+
+def event_object(event: SSEEvent) -> Dict:
+    """Decode an event's data as a JSON object, raising MalformedEventError otherwise."""
+    try:
+        data = event.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        raise MalformedEventError(f"Malformed SSE event: {error_digest(event.data)}")
+    return data
+
+
+def _response_body(response: requests.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return {"error": response.text[:500]}
+
+
+def check_response(scenario: Scenario, status: int, body: Any) -> Tuple[bool, Any]:
+    """Apply a scenario's status, error and key expectations to a JSON response."""
+    if status not in scenario.expected_statuses:
+        return False, {"error": body, "status_code": status}
+
+    if status >= 400:
+        if scenario.expected_error and scenario.expected_error not in str(body):
+            return False, {"error": f"Expected error containing '{scenario.expected_error}'",
+                           "response": body, "status_code": status}
+        return True, body
+
+    if scenario.expected_keys:
+        data = body.get('data') if isinstance(body, dict) else None
+        actual_keys = set(data.keys()) if isinstance(data, dict) else set()
+        if not scenario.expected_keys.issubset(actual_keys):
+            return False, {"error": f"Missing keys. Expected: {scenario.expected_keys}, Got: {actual_keys}"}
+
+    return True, body
+
+
+def check_events(scenario: Scenario, events: List[Dict]) -> Tuple[bool, Any]:
+    """Apply a scenario's stream expectations to the received events."""
+    if not events:
+        return False, [{"error": "No events received"}]
+
+    if scenario.expected_events:
+        statuses = {event.get('status') for event in events if isinstance(event, dict)}
+        missing = scenario.expected_events - statuses
+        if missing:
+            return False, [{"error": f"Missing event statuses: {sorted(missing)}"}] + events
+
+    return True, events
+
+
+class ScenarioRunner:
+    """Runs a list of scenarios in parallel while respecting depends_on."""
+
+    def __init__(self, base_url: str = BASE_URL, scenarios: List[Scenario] = None,
+                 max_workers: int = 8, timeout: float = 60.0, sink=None):
+        self.base_url = base_url
+        self.scenarios = list(scenarios or [])
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Optional results sink (see harness/results.py) that receives a record per scenario
+        self.sink = sink
+        # (success, truncated error digest) per scenario; full bodies are not kept
+        self.results: Dict[str, Tuple[bool, Any]] = {}
+        self.durations: Dict[str, float] = {}
+        self.stream_timings: List[StreamTiming] = []
+        self.wall_time = 0.0
+
+        self._by_name = {scenario.name: scenario for scenario in self.scenarios}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._check_dependencies()
+
+    def _check_dependencies(self):
+        """Reject unknown dependencies and dependency cycles up front."""
+        if len(self._by_name) != len(self.scenarios):
+            raise ValueError("Scenario names must be unique")
+
+        pending: Dict[str, Set[str]] = {}
+        for scenario in self.scenarios:
+            unknown = [name for name in scenario.depends_on if name not in self._by_name]
+            if unknown:
+                raise ValueError(f"Scenario '{scenario.name}' depends on unknown scenarios: {unknown}")
+            pending[scenario.name] = set(scenario.depends_on)
+
+        while pending:
+            ready = [name for name, deps in pending.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between scenarios: {sorted(pending)}")
+            for name in ready:
+                del pending[name]
+                for deps in pending.values():
+                    deps.discard(name)
+
+    def _session(self) -> requests.Session:
+        """Sessions are not shared between worker threads."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = create_session()
+        return session
+
+    def execute(self, scenario: Scenario) -> Tuple[bool, Any]:
+        """Send one scenario's request and check the response."""
+        return self._execute(scenario, {})
+
+    def _execute(self, scenario: Scenario, meta: Dict[str, int]) -> Tuple[bool, Any]:
+        """execute(), also filling meta with the status, response size and event count."""
+        url = f"{self.base_url}{scenario.path}"
+        payload = scenario.payload if scenario.method != 'GET' else None
+        session = self._session()
+
+        try:
+            if not scenario.stream:
+                response = session.request(scenario.method, url, json=payload, timeout=self.timeout)
+                meta['status'] = response.status_code
+                meta['response_bytes'] = len(response.content)
+                return check_response(scenario, response.status_code, _response_body(response))
+
+            timing = StreamTiming(scenario.name)
+            self.stream_timings.append(timing)
+            with session.request(scenario.method, url, json=payload, stream=True,
+                                 timeout=self.timeout) as response:
+                timing.mark_first_byte()
+                meta['status'] = response.status_code
+
+                # Error responses are plain JSON rather than a stream
+                if response.status_code != 200:
+                    success, data = check_response(scenario, response.status_code, _response_body(response))
+                    return success, [data]
+
+                def counted():
+                    for chunk in response.iter_content(chunk_size=None):
+                        meta['response_bytes'] = meta.get('response_bytes', 0) + len(chunk)
+                        yield chunk
+
+                events = []
+                for event in iter_events(counted()):
+                    # A malformed event fails the scenario, as it fails the request in the load tester
+                    event_data = event_object(event)
+                    timing.record_event(event_data)
+                    events.append(event_data)
+                    if event_data.get('status') == 'finished':
+                        break
+                timing.finish()
+
+            meta['events'] = len(events)
+            return check_events(scenario, events)
+        except requests.RequestException as e:
+            return False, {"error": str(e)}
+
+    def _timed_execute(self, scenario: Scenario) -> Tuple[bool, Any, float, Dict[str, int]]:
+        meta: Dict[str, int] = {}
+        start = time.perf_counter()
+        success, data = self._execute(scenario, meta)
+        return success, data, time.perf_counter() - start, meta
+
+    def _record(self, scenario: Scenario, success: bool, data: Any, duration: float,
+                meta: Dict[str, int] = None):
+        meta = meta or {}
+        digest = None if success else error_digest(data)
+        if self.sink is not None:
+            payload = scenario.payload if scenario.method != 'GET' else None
+            self.sink.write(ResultRecord(scenario.name, success, meta.get('status', 0), duration,
+                                         len(json.dumps(payload)) if payload is not None else 0,
+                                         meta.get('response_bytes', 0), meta.get('events', 0), digest or ''))
+        with self._lock:
+            self.results[scenario.name] = (success, digest)
+            self.durations[scenario.name] = duration
+            print(f"  {scenario.title}: {'✅ PASS' if success else '❌ FAIL'} ({duration * 1000:.0f} ms)")
+
+    def run(self) -> Dict[str, Tuple[bool, Any]]:
+        """Run every scenario, starting each one as soon as its dependencies have finished."""
+        self.results = {}
+        self.durations = {}
+        self.stream_timings = []
+        pending = {scenario.name: set(scenario.depends_on) for scenario in self.scenarios}
+
+        def resolve(name: str):
+            for deps in pending.values():
+                deps.discard(name)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            while pending or futures:
+                for name in [name for name, deps in pending.items() if not deps]:
+                    del pending[name]
+                    scenario = self._by_name[name]
+                    failed = [dep for dep in scenario.depends_on if not self.results[dep][0]]
+                    if failed:
+                        self._record(scenario, False, {"error": f"Skipped: dependency failed ({', '.join(failed)})"}, 0.0)
+                        resolve(name)
+                    else:
+                        futures[pool.submit(self._timed_execute, scenario)] = scenario
+
+                if not futures:
+                    continue
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scenario = futures.pop(future)
+                    success, data, duration, meta = future.result()
+                    self._record(scenario, success, data, duration, meta)
+                    resolve(scenario.name)
+
+        self.wall_time = time.perf_counter() - start
+        # Report in registry order rather than completion order
+        self.results = {scenario.name: self.results[scenario.name] for scenario in self.scenarios}
+        return self.results
+
+    def print_summary(self):
+        """Print a summary of scenario results."""
+        passed = sum(1 for success, _ in self.results.values() if success)
+        total = len(self.results)
+        sequential = sum(self.durations.values())
+
+        print(f"\n📊 Test Summary: {passed}/{total} scenarios passed")
+        print(f"⏱️  Wall time {self.wall_time:.2f}s (sequential sum {sequential:.2f}s)")
+
+        if passed == total:
+            print("🎉 All scenarios are functioning properly!")
+        else:
+            print(f"⚠️  {total - passed} scenarios need attention")
+
+        print("\n📋 Detailed Results:")
+        for name, (success, data) in self.results.items():
+            status = "✅ PASS" if success else "❌ FAIL"
+            print(f"  {name}: {status}")
+
+            if not success:
+                print(f"    Error: {data}")
+
+        self.print_stream_timings()
+
+    def print_stream_timings(self):
+        """Print time-to-first-event and per-stage durations for every stream."""
+        timings = [timing for timing in self.stream_timings if timing.events]
+        if not timings:
+            return
+
+        print("\n⏱️  Stream Timings:")
+        for timing in timings:
+            timing.print_report()
@@ -0,0 +1,146 @@
+"""
+Declarative scenario registry for the web application API.
+
+A scenario is one request plus the expectations its response must meet.
+Scenarios only list the other scenarios they depend on; the ScenarioRunner
+(harness.runner) works out which of them can run in parallel.
+"""
+
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class Scenario:
+    """A single API call and the checks applied to its response."""
+
+    def __init__(self, name: str, method: str, path: str, payload: Dict = None,
+                 title: str = None, stream: bool = False,
+                 expected_statuses: Tuple[int, ...] = (200, 201),
+                 expected_keys: Set[str] = None, expected_events: Set[str] = None,
+                 expected_error: str = None, depends_on: Sequence[str] = ()):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.title = title or name
+        self.stream = stream
+        self.expected_statuses = expected_statuses
+        # Keys that must be present in the response's "data" object
+        self.expected_keys = expected_keys
+        # Event statuses that must all appear in a stream
+        self.expected_events = expected_events
+        # Text an error response (status >= 400) must contain to count as expected
+        self.expected_error = expected_error
+        self.depends_on = tuple(depends_on)
+
+
+SAMPLE_WORKFLOW = {
+    "name": "Test Workflow",
+    "nodes": {
+        "start": {"type": "start"},
+        "process": {"type": "task"},
+        "end": {"type": "end"}
+    },
+    "edges": [
+        {"from": "start", "to": "process"},
+        {"from": "process", "to": "end"}
+    ]
+}
+
+MULTI_AGENT_EVENTS = {'started', 'processing', 'completed', 'finished'}
+VALIDATION_EVENTS = {'started', 'input_validation', 'structure_validation', 'rule_validation',
+                     'execution_simulation', 'report_generation', 'finished'}
+
+
+# One call per endpoint (test_apis.py and the load generator)
+API_SCENARIOS: List[Scenario] = [
+    Scenario('langgraph_simple', 'POST', '/langgraph/simple-workflow', {},
+             title='Simple workflow'),
+    Scenario('langgraph_advanced', 'POST', '/langgraph/advanced-workflow', {},
+             title='Advanced workflow'),
+    Scenario('article_get', 'GET', '/article/1', title='Get article (ID=1)'),
+    Scenario('article_transition', 'POST', '/article/1/transition/submit', {},
+             title='Article transition'),
+    # Without API keys the model endpoint answers 400, which is expected here
+    Scenario('model_test', 'POST', '/model/test', {
+        "model_type": "deepseek",
+        "prompt": "Say hello",
+        "model_name": "default"
+    }, title='Model test', expected_statuses=(200, 201, 400), expected_error='API key'),
+    Scenario('multi_agent', 'POST', '/multi-agent/stream', {
+        "workflow_type": "simple",
+        "task": "Test task for validation"
+    }, title='Multi-Agent stream', stream=True, expected_statuses=(200,)),
+    Scenario('chat_process', 'POST', '/chat/process', {
+        "message": "Hello, how are you?",
+        "model_type": "qwen",
+        "conversation_id": "test_conversation_123"
+    }, title='Chat process'),
+    Scenario('chat_history', 'GET', '/chat/history/test_conversation_123',
+             title='Chat history', depends_on=['chat_process']),
+    Scenario('workflow_validation', 'POST', '/workflow-validation/validate', {
+        "workflow": SAMPLE_WORKFLOW,
+        "rules": [],
+        "validation_id": "test_validation_123"
+    }, title='Workflow validation', stream=True, expected_statuses=(200,)),
+    Scenario('validation_report', 'GET', '/workflow-validation/report/test_validation_123',
+             title='Validation report', depends_on=['workflow_validation']),
+]
+
+
+# Multiple scenarios and edge cases per core feature (test_core_features.py)
+CORE_SCENARIOS: List[Scenario] = [
+    Scenario('langgraph_simple_basic', 'POST', '/langgraph/simple-workflow', {},
+             title='Simple workflow: basic execution', expected_keys={'step', 'message'}),
+    # Even with invalid data, the simple workflow should still work
+    Scenario('langgraph_simple_error_handling', 'POST', '/langgraph/simple-workflow', {"invalid": "data"},
+             title='Simple workflow: error handling'),
+    Scenario('langgraph_advanced_basic', 'POST', '/langgraph/advanced-workflow', {},
+             title='Advanced workflow: basic execution'),
+    Scenario('langgraph_advanced_custom_task', 'POST', '/langgraph/advanced-workflow', {
+        'task': 'Analyze market trends for Q4 2024'
+    }, title='Advanced workflow: custom task',
+        expected_keys={'task', 'messages', 'step', 'processing_result', 'final_result'}),
+    Scenario('langgraph_advanced_error_handling', 'POST', '/langgraph/advanced-workflow', {"invalid": "data"},
+             title='Advanced workflow: error handling'),
+    Scenario('multi_agent_simple', 'POST', '/multi-agent/stream', {
+        'workflow_type': 'simple',
+        'task': 'Research the benefits of renewable energy'
+    }, title='Multi-agent: simple workflow', stream=True, expected_statuses=(200,),
+        expected_events=MULTI_AGENT_EVENTS),
+    Scenario('multi_agent_advanced', 'POST', '/multi-agent/stream', {
+        'workflow_type': 'advanced',
+        'task': 'Analyze market trends for renewable energy sector in 2025'
+    }, title='Multi-agent: advanced workflow', stream=True, expected_statuses=(200,),
+        expected_events=MULTI_AGENT_EVENTS),
+    Scenario('multi_agent_invalid_type', 'POST', '/multi-agent/stream', {
+        'workflow_type': 'invalid_type',
+        'task': 'Test task'
+    }, title='Multi-agent: invalid workflow type', stream=True, expected_statuses=(400,),
+        expected_error='Invalid workflow type selected'),
+    # Missing task should still work with the default task
+    Scenario('multi_agent_missing_task', 'POST', '/multi-agent/stream', {
+        'workflow_type': 'simple'
+    }, title='Multi-agent: default task', stream=True, expected_statuses=(200,)),
+    Scenario('workflow_validation_valid', 'POST', '/workflow-validation/validate', {
+        "workflow": SAMPLE_WORKFLOW,
+        "rules": []
+    }, title='Workflow validation: valid workflow', stream=True, expected_statuses=(200,),
+        expected_events=VALIDATION_EVENTS),
+    Scenario('workflow_validation_invalid_nodes', 'POST', '/workflow-validation/validate', {
+        "workflow": {"name": "Test Workflow", "edges": SAMPLE_WORKFLOW['edges']},
+        "rules": []
+    }, title='Workflow validation: missing nodes', stream=True, expected_statuses=(200,)),
+    Scenario('workflow_validation_invalid_edges', 'POST', '/workflow-validation/validate', {
+        "workflow": {"name": "Test Workflow", "nodes": SAMPLE_WORKFLOW['nodes']},
+        "rules": []
+    }, title='Workflow validation: missing edges', stream=True, expected_statuses=(200,)),
+    Scenario('workflow_validation_with_rules', 'POST', '/workflow-validation/validate', {
+        "workflow": dict(SAMPLE_WORKFLOW, name="Rule Test Workflow"),
+        "rules": [
+            {
+                "type": "required_nodes",
+                "nodes": ["start", "process", "end"]
+            }
+        ]
+    }, title='Workflow validation: custom rules', stream=True, expected_statuses=(200,)),
+]
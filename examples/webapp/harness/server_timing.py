@@ -0,0 +1,265 @@
+"""
+Server-Timing correlation: where a request's time goes on the server.
+
+The backend reports `app` (whole Laravel request), `graph` (CompiledGraph
+execution) and one `node_<name>` metric per graph node in the Server-Timing
+header of JSON responses, and as `timing` fields on the workflow validation
+SSE events. Every request is tagged with its own X-Request-Id, which the
+backend echoes, so each server-side breakdown is matched to exactly one
+client measurement. Aggregated over many runs this separates network and
+server stack (client TTFB − app), framework (app − graph), graph scheduling
+(graph − sum of nodes) and the work done inside each node.
+
+Usage:
+    python3 test_apis.py --server-timing --repeat 50 --workers 4
+    python3 -m harness.server_timing --endpoints chat_process,langgraph_advanced --repeat 100
+"""
+
+import argparse
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from . import BASE_URL
+from .http_timing import create_timed_session, timed_request
+from .scenarios import API_SCENARIOS, Scenario
+from .sse import iter_events
+from .stats import LatencyHistogram
+
+NODE_PREFIX = 'node_'
+
+_METRIC = re.compile(r'^\s*([^;,\s]+)(.*)$')
+_DURATION = re.compile(r';\s*dur\s*=\s*"?([0-9.eE+-]+)"?')
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a Server-Timing header into {metric name: seconds}.
+
+    Metrics without a dur parameter are kept with 0.0; a metric repeated (for
+    example across several Server-Timing headers) is summed.
+    """
+    metrics: Dict[str, float] = {}
+    if not header:
+        return metrics
+    for entry in header.split(','):
+        match = _METRIC.match(entry)
+        if match is None:
+            continue
+        name, params = match.groups()
+        duration = _DURATION.search(params)
+        try:
+            seconds = float(duration.group(1)) / 1000 if duration else 0.0
+        except ValueError:
+            seconds = 0.0
+        metrics[name] = metrics.get(name, 0.0) + seconds
+    return metrics
+
+
+def parse_stream_timing(content: bytes) -> Dict:
+    """Collect the request id and node timings carried on SSE events."""
+    found = {'request_id': None, 'metrics': {}}
+    metrics = found['metrics']
+    for sse_event in iter_events([content]):
+        try:
+            event = sse_event.json()
+        except ValueError:
+            continue
+        if not isinstance(event, dict):
+            continue
+        if event.get('status') == 'started' and event.get('request_id'):
+            found['request_id'] = event['request_id']
+        timing = event.get('timing')
+        if not isinstance(timing, dict):
+            continue
+        if 'node' in timing:
+            name = f"{NODE_PREFIX}{timing['node']}"
+            metrics[name] = metrics.get(name, 0.0) + float(timing.get('duration_ms', 0.0)) / 1000
+        if 'graph_ms' in timing:
+            metrics['graph'] = float(timing['graph_ms']) / 1000
+    return found
+
+
+class EndpointTiming:
+    """Client and server-side histograms for one endpoint."""
+
+    __slots__ = ('name', 'requests', 'errors', 'missing', 'mismatched', 'ttfb', 'total', 'app', 'graph',
+                 'nodes_total', 'network', 'framework', 'graph_overhead', 'nodes')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        # Responses without any server timing, and responses whose request id did not match
+        self.missing = 0
+        self.mismatched = 0
+        self.ttfb = LatencyHistogram()
+        self.total = LatencyHistogram()
+        self.app = LatencyHistogram()
+        self.graph = LatencyHistogram()
+        self.nodes_total = LatencyHistogram()
+        self.network = LatencyHistogram()
+        self.framework = LatencyHistogram()
+        self.graph_overhead = LatencyHistogram()
+        self.nodes: Dict[str, LatencyHistogram] = {}
+
+    def record(self, ttfb: float, total: float, metrics: Dict[str, float], stream: bool):
+        self.ttfb.record(ttfb)
+        self.total.record(total)
+        if not metrics:
+            self.missing += 1
+            return
+
+        nodes = {name[len(NODE_PREFIX):]: value for name, value in metrics.items() if name.startswith(NODE_PREFIX)}
+        for node, value in nodes.items():
+            histogram = self.nodes.get(node)
+            if histogram is None:
+                histogram = self.nodes[node] = LatencyHistogram()
+            histogram.record(value)
+        node_sum = sum(nodes.values())
+
+        app = metrics.get('app')
+        graph = metrics.get('graph')
+        if app is not None:
+            self.app.record(app)
+            # The header of a stream is sent before the graph runs, so only JSON responses split this way
+            if not stream:
+                self.network.record(max(0.0, ttfb - app))
+        if graph is not None:
+            self.graph.record(graph)
+            if app is not None and not stream:
+                self.framework.record(max(0.0, app - graph))
+            if nodes:
+                self.graph_overhead.record(max(0.0, graph - node_sum))
+        if nodes:
+            self.nodes_total.record(node_sum)
+
+
+class ServerTimingProfiler:
+    """Send each endpoint repeatedly with a unique request id and aggregate its server-side breakdown."""
+
+    def __init__(self, base_url: str = BASE_URL, scenarios: List[Scenario] = None, repeat: int = 10,
+                 workers: int = 1, timeout: float = 60.0):
+        self.base_url = base_url
+        self.scenarios = scenarios or API_SCENARIOS
+        self.repeat = repeat
+        self.workers = workers
+        self.timeout = timeout
+        self.stats: Dict[str, EndpointTiming] = {scenario.name: EndpointTiming(scenario.name)
+                                                 for scenario in self.scenarios}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+
+    def _send(self, scenario: Scenario):
+        request_id = uuid.uuid4().hex
+        payload = scenario.payload if scenario.method != 'GET' else None
+        try:
+            response, _, timing = timed_request(self._session, scenario.method, f"{self.base_url}{scenario.path}",
+                                                decode=False, json=payload, timeout=self.timeout,
+                                                headers={'X-Request-Id': request_id})
+        except requests.RequestException:
+            with self._lock:
+                self.stats[scenario.name].requests += 1
+                self.stats[scenario.name].errors += 1
+            return
+
+        stream = response.headers.get('Content-Type', '').startswith('text/event-stream')
+        metrics = parse_server_timing(response.headers.get('Server-Timing'))
+        echoed = [response.headers.get('X-Request-Id')]
+        if stream:
+            found = parse_stream_timing(response.content)
+            metrics.update(found['metrics'])
+            echoed.append(found['request_id'])
+
+        with self._lock:
+            stats = self.stats[scenario.name]
+            stats.requests += 1
+            if response.status_code not in scenario.expected_statuses:
+                stats.errors += 1
+            if any(value is not None and value != request_id for value in echoed):
+                # Another request's timings: counting them would corrupt the breakdown
+                stats.mismatched += 1
+                return
+            stats.record(timing.ttfb, timing.total, metrics, stream)
+
+    def run(self) -> Dict[str, EndpointTiming]:
+        self._session = create_timed_session(max(self.workers, 1))
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for _ in range(self.repeat):
+                    list(pool.map(self._send, self.scenarios))
+        finally:
+            self._session.close()
+        self.elapsed = time.perf_counter() - start
+        return self.stats
+
+    def print_report(self):
+        print(f"\n🧭 Server-Timing Breakdown (mean ms; {self.repeat} rounds, {self.workers} worker(s))")
+        print("=" * 100)
+        print(f"{'endpoint':<22}{'requests':>9}{'client':>9}{'app':>8}{'network':>9}{'framework':>11}"
+              f"{'graph':>8}{'sched':>8}{'nodes':>8}{'no hdr':>8}")
+        print("-" * 100)
+
+        def mean(histogram: LatencyHistogram) -> str:
+            return f"{histogram.mean * 1000:.2f}" if histogram.count else '-'
+
+        missing = 0
+        mismatched = 0
+        for name, stats in self.stats.items():
+            if not stats.requests:
+                continue
+            missing += stats.missing
+            mismatched += stats.mismatched
+            print(f"{name:<22}{stats.requests:>9}{mean(stats.ttfb):>9}{mean(stats.app):>8}"
+                  f"{mean(stats.network):>9}{mean(stats.framework):>11}{mean(stats.graph):>8}"
+                  f"{mean(stats.graph_overhead):>8}{mean(stats.nodes_total):>8}{stats.missing:>8}")
+        print("-" * 100)
+        print("client = TTFB, network = client − app, framework = app − graph, sched = graph − Σ nodes")
+
+        print(f"\n{'endpoint / node':<44}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'of graph':>10}")
+        print("-" * 100)
+        for name, stats in self.stats.items():
+            for node, histogram in stats.nodes.items():
+                share = histogram.mean / stats.graph.mean if stats.graph.mean else 0.0
+                print(f"{f'{name} / {node}':<44}{histogram.count:>8}{histogram.percentile(50) * 1000:>10.2f}"
+                      f"{histogram.percentile(99) * 1000:>10.2f}{histogram.mean * 1000:>10.2f}{share:>10.1%}")
+
+        if mismatched:
+            print(f"⚠️  {mismatched} responses carried another request's id and were left out")
+        if missing and missing == sum(stats.ttfb.count for stats in self.stats.values()):
+            print("⚠️  No Server-Timing data at all; is the ServerTiming middleware registered in the backend?")
+
+
+def main(argv: List[str] = None) -> int:
+    names = [scenario.name for scenario in API_SCENARIOS]
+    parser = argparse.ArgumentParser(description="Aggregate per-node Server-Timing across repeated requests")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--endpoints', default=None, help=f"comma-separated, from {', '.join(names)}")
+    parser.add_argument('--repeat', type=int, default=10, help="rounds over the endpoint set")
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    scenarios = API_SCENARIOS
+    if args.endpoints:
+        wanted = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+        unknown = [name for name in wanted if name not in names]
+        if unknown:
+            parser.error(f"unknown endpoints: {', '.join(unknown)}")
+        scenarios = [scenario for scenario in API_SCENARIOS if scenario.name in wanted]
+
+    profiler = ServerTimingProfiler(args.base_url, scenarios, args.repeat, args.workers)
+    profiler.run()
+    profiler.print_report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
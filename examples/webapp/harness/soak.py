@@ -0,0 +1,316 @@
+"""
+Long-running soak mode with latency-drift tracking and server resource sampling.
+
+Virtual users run the API scenario mix for hours. Latencies are recorded per
+rolling time window into LatencyHistograms, so every request counts towards its
+window's percentiles while memory stays constant however long the run is; each
+closed window is reduced to a small summary. When a
+server PID is given, its RSS and CPU usage (including child processes, e.g. the
+`php -S` worker started by `php artisan serve`) are sampled from /proc.
+
+Usage:
+    python3 -m harness.soak --duration 4h --window 60 --users 10 --pid 12345
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from . import BASE_URL
+from .load import DEFAULT_ENDPOINTS, send_request
+from .runner import create_session
+from .scenarios import Scenario
+from .stats import LatencyHistogram, linear_fit
+
+
+def parse_duration(value: str) -> float:
+    """Parse '90', '90s', '15m' or '4h' into seconds."""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+class ProcessSampler:
+    """Samples RSS and CPU usage of a process tree from /proc (Linux only)."""
+
+    def __init__(self, pid: int, include_children: bool = True):
+        self.pid = pid
+        self.include_children = include_children
+        self._ticks = os.sysconf('SC_CLK_TCK')
+        self._page_size = os.sysconf('SC_PAGE_SIZE')
+        self._last: Optional[Tuple[float, float]] = None
+
+    def _pids(self) -> List[int]:
+        if not self.include_children:
+            return [self.pid]
+        parents: Dict[int, List[int]] = {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as handle:
+                    fields = handle.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            parents.setdefault(int(fields[1]), []).append(int(entry))
+
+        tree, queue = [], [self.pid]
+        while queue:
+            pid = queue.pop()
+            tree.append(pid)
+            queue.extend(parents.get(pid, []))
+        return tree
+
+    def _read(self, pid: int) -> Tuple[int, float]:
+        """Return (rss bytes, cpu seconds) of one process."""
+        with open(f'/proc/{pid}/stat') as handle:
+            fields = handle.read().rsplit(')', 1)[1].split()
+        # Fields after the command name start at field 3 (state); utime/stime are fields 14/15, rss is 24
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._ticks
+        rss_bytes = int(fields[21]) * self._page_size
+        return rss_bytes, cpu_seconds
+
+    def sample(self) -> Optional[Dict[str, float]]:
+        """Return RSS in MB and CPU % since the previous sample, or None if the process is gone."""
+        rss = 0
+        cpu = 0.0
+        found = False
+        for pid in self._pids():
+            try:
+                pid_rss, pid_cpu = self._read(pid)
+            except (OSError, IndexError, ValueError):
+                continue
+            found = True
+            rss += pid_rss
+            cpu += pid_cpu
+        if not found:
+            return None
+
+        now = time.monotonic()
+        cpu_percent = 0.0
+        if self._last is not None and now > self._last[0]:
+            cpu_percent = (cpu - self._last[1]) / (now - self._last[0]) * 100
+        self._last = (now, cpu)
+        return {'rss_mb': rss / (1024 * 1024), 'cpu_percent': cpu_percent}
+
+
+class SoakWindow:
+    """Latency histograms for one time window."""
+
+    def __init__(self, index: int, start: float, names: List[str]):
+        self.index = index
+        self.start = start
+        self.latencies = {name: LatencyHistogram() for name in names}
+        self.errors = {name: 0 for name in names}
+
+    def record(self, name: str, latency: float, ok: bool):
+        self.latencies[name].record(latency)
+        if not ok:
+            self.errors[name] += 1
+
+    def summarize(self, end: float, process: Optional[Dict[str, float]]) -> Dict:
+        """Reduce the window to percentiles; the histograms are dropped afterwards."""
+        elapsed = max(end - self.start, 1e-9)
+        combined = LatencyHistogram()
+        endpoints = {}
+        for name, histogram in self.latencies.items():
+            combined.merge(histogram)
+            if histogram.count:
+                endpoints[name] = {
+                    'requests': histogram.count,
+                    'errors': self.errors[name],
+                    'p50_ms': histogram.percentile(50) * 1000,
+                    'p99_ms': histogram.percentile(99) * 1000
+                }
+        requests_total = combined.count
+        errors_total = sum(self.errors.values())
+        return {
+            'window': self.index,
+            'offset_s': self.start,
+            'duration_s': elapsed,
+            'requests': requests_total,
+            'throughput': requests_total / elapsed,
+            'error_rate': errors_total / requests_total if requests_total else 0.0,
+            'p50_ms': combined.percentile(50) * 1000,
+            'p90_ms': combined.percentile(90) * 1000,
+            'p99_ms': combined.percentile(99) * 1000,
+            'max_ms': combined.max * 1000,
+            'rss_mb': process['rss_mb'] if process else None,
+            'cpu_percent': process['cpu_percent'] if process else None,
+            'endpoints': endpoints
+        }
+
+
+def _slope_per_hour(points: List[Tuple[float, float]]) -> Optional[float]:
+    """Least-squares slope of (seconds, value) points, expressed per hour."""
+    slope = linear_fit(points)
+    return slope * 3600 if slope is not None else None
+
+
+class SoakTester:
+    """Runs the scenario mix for a long time and reports per-window trends."""
+
+    def __init__(self, base_url: str = BASE_URL, users: int = 10, duration: float = 3600.0,
+                 window: float = 60.0, endpoints: List[Scenario] = None, pid: Optional[int] = None,
+                 include_children: bool = True,
+                 output: Optional[str] = None, timeout: float = 30.0):
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.window = window
+        self.endpoints = endpoints or DEFAULT_ENDPOINTS
+        self.sampler = ProcessSampler(pid, include_children) if pid else None
+        self.output = output
+        self.timeout = timeout
+        self.windows: List[Dict] = []
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start = 0.0
+        self._current: Optional[SoakWindow] = None
+
+    def _new_window(self, index: int) -> SoakWindow:
+        return SoakWindow(index, time.perf_counter() - self._start,
+                          [endpoint.name for endpoint in self.endpoints])
+
+    def _virtual_user(self, user_id: int):
+        session = create_session()
+        index = user_id
+        try:
+            while not self._stop.is_set():
+                endpoint = self.endpoints[index % len(self.endpoints)]
+                index += 1
+
+                start = time.perf_counter()
+                try:
+                    ok = send_request(session, self.base_url, endpoint, self.timeout)
+                except requests.RequestException:
+                    ok = False
+                latency = time.perf_counter() - start
+
+                with self._lock:
+                    self._current.record(endpoint.name, latency, ok)
+        finally:
+            session.close()
+
+    def _close_window(self, next_index: Optional[int]) -> Dict:
+        """Swap in a fresh window and summarise the one that just ended."""
+        with self._lock:
+            finished = self._current
+            if next_index is not None:
+                self._current = self._new_window(next_index)
+        process = self.sampler.sample() if self.sampler else None
+        summary = finished.summarize(time.perf_counter() - self._start, process)
+        self.windows.append(summary)
+
+        if self.output:
+            with open(self.output, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(summary) + '\n')
+        self._print_window(summary)
+        return summary
+
+    def run(self) -> List[Dict]:
+        """Run the soak test until the duration has elapsed (or Ctrl+C)."""
+        self.windows = []
+        self._stop.clear()
+        self._start = time.perf_counter()
+        self._current = self._new_window(0)
+        if self.sampler:
+            self.sampler.sample()  # Prime the CPU counter
+
+        self._print_header()
+        threads = [threading.Thread(target=self._virtual_user, args=(i,), daemon=True)
+                   for i in range(self.users)]
+        for thread in threads:
+            thread.start()
+
+        index = 0
+        try:
+            while True:
+                index += 1
+                window_end = min(index * self.window, self.duration)
+                remaining = window_end - (time.perf_counter() - self._start)
+                if remaining > 0:
+                    time.sleep(remaining)
+                if window_end >= self.duration:
+                    break
+                self._close_window(index)
+        except KeyboardInterrupt:
+            print("\nInterrupted, finishing the current window...")
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(self.timeout)
+            self._close_window(None)
+
+        return self.windows
+
+    @staticmethod
+    def _print_header():
+        print(f"{'window':>6}{'offset':>9}{'req/s':>9}{'errors':>9}{'p50 ms':>10}{'p90 ms':>10}"
+              f"{'p99 ms':>10}{'max ms':>10}{'RSS MB':>10}{'CPU %':>8}")
+        print("-" * 91)
+
+    @staticmethod
+    def _print_window(summary: Dict):
+        rss = f"{summary['rss_mb']:.1f}" if summary['rss_mb'] is not None else '-'
+        cpu = f"{summary['cpu_percent']:.0f}" if summary['cpu_percent'] is not None else '-'
+        print(f"{summary['window']:>6}{summary['offset_s']:>8.0f}s{summary['throughput']:>9.1f}"
+              f"{summary['error_rate']:>9.1%}{summary['p50_ms']:>10.1f}{summary['p90_ms']:>10.1f}"
+              f"{summary['p99_ms']:>10.1f}{summary['max_ms']:>10.1f}{rss:>10}{cpu:>8}")
+
+    def print_report(self):
+        """Print the latency and memory trend over all windows."""
+        windows = [window for window in self.windows if window['requests']]
+        if not windows:
+            print("\nNo requests completed")
+            return
+
+        print("\n📈 Soak Trend")
+        print("=" * 60)
+        first, last = windows[0], windows[-1]
+        print(f"  Windows: {len(windows)}, requests: {sum(window['requests'] for window in windows)}")
+        for key, label in [('p50_ms', 'p50 latency'), ('p99_ms', 'p99 latency'),
+                           ('throughput', 'throughput'), ('rss_mb', 'server RSS')]:
+            points = [(window['offset_s'], window[key]) for window in windows if window[key] is not None]
+            slope = _slope_per_hour(points)
+            if not points:
+                continue
+            trend = f"{slope:+.2f}/hour" if slope is not None else 'n/a'
+            print(f"  {label:<14} first {points[0][1]:>10.2f}  last {points[-1][1]:>10.2f}  trend {trend}")
+
+        if last['p99_ms'] > first['p99_ms'] * 1.5:
+            print("  ⚠️  p99 latency grew by more than 50% over the run")
+        if first['rss_mb'] and last['rss_mb'] and last['rss_mb'] > first['rss_mb'] * 1.2:
+            print("  ⚠️  Server RSS grew by more than 20% over the run")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Long-running soak test of the web application API")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=parse_duration, default=3600.0,
+                        help="total run time, e.g. 3600, 90m or 4h")
+    parser.add_argument('--window', type=parse_duration, default=60.0, help="window length, e.g. 60 or 5m")
+    parser.add_argument('--pid', type=int, default=None, help="server PID to sample from /proc")
+    parser.add_argument('--no-children', action='store_true', help="do not include child processes of --pid")
+    parser.add_argument('--output', default=None, help="append window summaries to this NDJSON file")
+    args = parser.parse_args(argv)
+
+    tester = SoakTester(args.base_url, users=args.users, duration=args.duration, window=args.window,
+                        pid=args.pid, include_children=not args.no_children, output=args.output)
+    tester.run()
+    tester.print_report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
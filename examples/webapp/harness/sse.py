@@ -0,0 +1,176 @@
+"""
+Incremental Server-Sent Events parser.
+
+Raw byte chunks are appended to a single bytearray buffer; complete lines are
+located in place and sliced through a memoryview, and only the fields of a
+finished frame are copied and decoded. Events are produced one by one so
+callers can consume and discard them as the stream progresses.
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional
+
+_LINE_END = re.compile(rb'\r\n|\r|\n')
+_BOM = b'\xef\xbb\xbf'
+
+
+class SSEEvent(NamedTuple):
+    """A dispatched SSE frame."""
+
+    event: str
+    data: str
+    id: str
+    retry: Optional[int]
+
+    def json(self) -> Any:
+        """Decode the data field as JSON (raises ValueError on invalid JSON)."""
+        return json.loads(self.data)
+
+
+class SSEParser:
+    """
+    Turns raw byte chunks into SSEEvent objects, following the WHATWG framing rules.
+
+    One deliberate exception: with `lenient_eof` (the default) flush() also
+    dispatches a final frame that the stream ended without terminating, so a
+    server that closes right after writing its last event is not reported as
+    having dropped it. The spec discards such a frame; pass lenient_eof=False
+    for that behaviour.
+    """
+
+    def __init__(self, lenient_eof: bool = True):
+        self.lenient_eof = lenient_eof
+        self._buffer = bytearray()
+        self._data: List[bytes] = []
+        self._event_type = ''
+        self._last_event_id = ''
+        self._retry: Optional[int] = None
+        self._checked_bom = False
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes waiting for a line terminator."""
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consume a chunk and return the events completed by it."""
+        buffer = self._buffer
+        buffer += chunk
+
+        if not self._checked_bom:
+            if len(buffer) < len(_BOM) and _BOM.startswith(bytes(buffer)):
+                return []
+            if buffer.startswith(_BOM):
+                del buffer[:len(_BOM)]
+            self._checked_bom = True
+
+        events = []
+        pos = 0
+        view = memoryview(buffer)
+        try:
+            while True:
+                match = _LINE_END.search(buffer, pos)
+                if match is None:
+                    break
+                # A lone trailing CR may be the first half of a CRLF split across chunks
+                if match.end() == len(buffer) and match.group() == b'\r':
+                    break
+                event = self._process_line(buffer, view, pos, match.start())
+                pos = match.end()
+                if event is not None:
+                    events.append(event)
+        finally:
+            view.release()
+
+        if pos:
+            del buffer[:pos]
+        return events
+
+    def flush(self) -> List[SSEEvent]:
+        """
+        Finish the stream: return the events still pending at end of input.
+
+        A CR held back as a possible CRLF half ends its line. With lenient_eof
+        an unterminated last line is applied as if it were terminated and a
+        frame that has data is dispatched even without its closing blank line;
+        otherwise both are discarded, as the spec requires.
+        """
+        events = []
+        buffer = self._buffer
+        if buffer:
+            terminated = buffer.endswith(b'\r')
+            if terminated or self.lenient_eof:
+                end = len(buffer) - 1 if terminated else len(buffer)
+                view = memoryview(buffer)
+                try:
+                    event = self._process_line(buffer, view, 0, end)
+                finally:
+                    view.release()
+                if event is not None:
+                    events.append(event)
+            del buffer[:]
+        if self.lenient_eof:
+            event = self._dispatch()
+            if event is not None:
+                events.append(event)
+        else:
+            self._data = []
+            self._event_type = ''
+        return events
+
+    def _process_line(self, buffer: bytearray, view: memoryview, start: int, end: int) -> Optional[SSEEvent]:
+        """Apply one line to the pending frame; an empty line dispatches it."""
+        if start == end:
+            return self._dispatch()
+        if buffer[start] == 0x3A:  # Comment line
+            return None
+
+        colon = buffer.find(b':', start, end)
+        if colon == -1:
+            name_end = value_start = end
+        else:
+            name_end = colon
+            value_start = colon + 1
+            if value_start < end and buffer[value_start] == 0x20:
+                value_start += 1
+
+        name = view[start:name_end]
+        if name == b'data':
+            self._data.append(bytes(view[value_start:end]))
+        elif name == b'event':
+            self._event_type = bytes(view[value_start:end]).decode('utf-8', 'replace')
+        elif name == b'id':
+            value = bytes(view[value_start:end])
+            if b'\x00' not in value:
+                self._last_event_id = value.decode('utf-8', 'replace')
+        elif name == b'retry':
+            value = bytes(view[value_start:end])
+            if value.isdigit():
+                self._retry = int(value)
+        return None
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        """Build the event for the pending frame and reset it."""
+        if not self._data:
+            self._event_type = ''
+            return None
+
+        data = self._data[0] if len(self._data) == 1 else b'\n'.join(self._data)
+        event = SSEEvent(
+            self._event_type or 'message',
+            data.decode('utf-8', 'replace'),
+            self._last_event_id,
+            self._retry
+        )
+        self._data = []
+        self._event_type = ''
+        return event
+
+
+def iter_events(chunks: Iterable[bytes], lenient_eof: bool = True) -> Iterator[SSEEvent]:
+    """Yield events from an iterable of raw byte chunks (e.g. response.iter_content())."""
+    parser = SSEParser(lenient_eof)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.flush()
@@ -0,0 +1,435 @@
+"""
+Massive concurrent SSE subscribers for /multi-agent/stream.
+
+Long-lived streams, not request/response calls, are what limits the backend:
+every open /multi-agent/stream connection holds a PHP worker for the whole
+paced run. This mode opens thousands of simultaneous subscriptions from a
+single asyncio event loop, with starts staggered at a fixed ramp rate. Each
+subscriber re-subscribes as soon as its stream finishes, so the number of
+open streams climbs with the ramp and then holds.
+
+Every stream is attributed to the concurrency level it was accepted at (open
+streams at that moment, in buckets of --level-step) and measured for:
+
+- accept latency: connect until the response status line arrives;
+- delivery lag: client receive time − the `timestamp` the server put on each
+  event (client and server clocks must agree; run on the same host or NTP);
+- stalls: gaps between consecutive events longer than --stall;
+- drops: streams closed or reset before the `finished` event; refused
+  connections, HTTP errors and timeouts are counted separately.
+
+The report lists each level and the highest level that still met the accept
+and lag objectives within the error budget, i.e. how many concurrent streams
+the deployment holds before degrading.
+
+Usage:
+    python3 -m harness.sse_subscribers --subscribers 2000 --ramp 100 --hold 30
+    python3 -m harness.sse_subscribers --subscribers 500 --ramp 50 --lag-slo-ms 250 --level-step 50
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from . import BASE_URL
+from .scenarios import API_SCENARIOS, Scenario
+from .sse import SSEParser
+from .stats import LatencyHistogram
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+DEFAULT_SCENARIO = 'multi_agent'
+RETRY_DELAY = 0.5
+_READ_SIZE = 65536
+
+
+class StreamFailure(Exception):
+    """A stream that ended before its `finished` event."""
+
+    def __init__(self, kind: str, detail: str = ''):
+        super().__init__(detail or kind)
+        self.kind = kind
+
+
+class LevelStats:
+    """Streams accepted while a given number of streams were already open."""
+
+    __slots__ = ('level', 'streams', 'completed', 'dropped', 'refused', 'http_errors', 'timeouts',
+                 'stalls', 'events', 'max_open', 'accept', 'first_event', 'lag', 'missing_timestamps')
+
+    def __init__(self, level: int):
+        self.level = level
+        self.streams = 0
+        self.completed = 0
+        self.dropped = 0
+        self.refused = 0
+        self.http_errors = 0
+        self.timeouts = 0
+        self.stalls = 0
+        self.events = 0
+        self.max_open = 0
+        self.accept = LatencyHistogram()
+        self.first_event = LatencyHistogram()
+        self.lag = LatencyHistogram()
+        self.missing_timestamps = 0
+
+    @property
+    def failures(self) -> int:
+        return self.dropped + self.refused + self.http_errors + self.timeouts
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.streams if self.streams else 0.0
+
+
+class SubscriberSwarm:
+    """Open, hold and re-open many SSE subscriptions and attribute their quality to concurrency levels."""
+
+    def __init__(self, base_url: str = BASE_URL, scenario: Scenario = None, subscribers: int = 1000,
+                 ramp: float = 50.0, hold: float = 30.0, level_step: int = 0, stall: float = 3.0,
+                 accept_slo_ms: float = 1000.0, lag_slo_ms: float = 500.0, error_budget: float = 0.01,
+                 timeout: float = 30.0):
+        self.base_url = base_url
+        self.scenario = scenario or next(s for s in API_SCENARIOS if s.name == DEFAULT_SCENARIO)
+        self.subscribers = subscribers
+        self.ramp = ramp
+        self.hold = hold
+        self.level_step = level_step or max(1, subscribers // 10)
+        self.stall = stall
+        self.accept_slo_ms = accept_slo_ms
+        self.lag_slo_ms = lag_slo_ms
+        self.error_budget = error_budget
+        self.timeout = timeout
+        self.levels: Dict[int, LevelStats] = {}
+        self.open_streams = 0
+        self.peak_open = 0
+        self.started = 0
+        self.loop_delay = 0.0
+        self.elapsed = 0.0
+        self.fd_limit: Optional[int] = None
+        self._started_at = 0.0
+        self._deadline = 0.0
+
+        parts = urlsplit(f"{base_url}{self.scenario.path}")
+        self._host = parts.hostname or '127.0.0.1'
+        self._ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self._port = parts.port or (443 if self._ssl else 80)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        body = json.dumps(self.scenario.payload or {}).encode()
+        self._request = (f"{self.scenario.method} {path} HTTP/1.1\r\n"
+                         f"Host: {parts.netloc}\r\n"
+                         "Accept: text/event-stream\r\n"
+                         "Cache-Control: no-cache\r\n"
+                         "Content-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n"
+                         "Connection: close\r\n\r\n").encode() + body
+
+    def _level(self, open_streams: int) -> LevelStats:
+        bucket = (open_streams - 1) // self.level_step * self.level_step + self.level_step
+        stats = self.levels.get(bucket)
+        if stats is None:
+            stats = self.levels[bucket] = LevelStats(bucket)
+        return stats
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise StreamFailure('dropped', 'connection closed before the status line')
+        parts = status_line.split(None, 2)
+        try:
+            status = int(parts[1])
+        except (IndexError, ValueError):
+            raise StreamFailure('http_errors', f"malformed status line {status_line[:40]!r}")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    @staticmethod
+    async def _body(reader: asyncio.StreamReader, headers: Dict[str, str]):
+        """Yield body chunks for chunked, sized or close-delimited responses."""
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                size_line = await reader.readline()
+                if not size_line:
+                    raise StreamFailure('dropped', 'connection closed inside a chunked body')
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    return
+                chunk = await reader.readexactly(size)
+                await reader.readline()
+                yield chunk
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining > 0:
+                chunk = await reader.read(min(_READ_SIZE, remaining))
+                if not chunk:
+                    raise StreamFailure('dropped', 'connection closed before Content-Length was read')
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while True:
+                chunk = await reader.read(_READ_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def _stream_once(self) -> bool:
+        """Run one subscription, fold its outcome into the level it was accepted at; True if it finished."""
+        start = time.perf_counter()
+        writer = None
+        accepted = False
+        stats: Optional[LevelStats] = None
+        try:
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._host, self._port, ssl=self._ssl, limit=_READ_SIZE * 4),
+                    self.timeout)
+            except (OSError, asyncio.TimeoutError) as exc:
+                raise StreamFailure('refused' if isinstance(exc, OSError) else 'timeouts', str(exc))
+            writer.write(self._request)
+            try:
+                status, headers = await asyncio.wait_for(self._read_head(reader), self.timeout)
+            except asyncio.TimeoutError:
+                raise StreamFailure('timeouts', 'no response head')
+            accept = time.perf_counter() - start
+
+            self.open_streams += 1
+            accepted = True
+            self.peak_open = max(self.peak_open, self.open_streams)
+            stats = self._level(self.open_streams)
+            stats.streams += 1
+            stats.max_open = max(stats.max_open, self.open_streams)
+            stats.accept.record(accept)
+            if status != 200:
+                raise StreamFailure('http_errors', f"HTTP {status}")
+
+            parser = SSEParser()
+            body = self._body(reader, headers)
+            last_event = None
+            ended = False
+            while not ended:
+                try:
+                    chunk = await asyncio.wait_for(body.__anext__(), self.timeout)
+                    events = parser.feed(chunk)
+                except StopAsyncIteration:
+                    # The last frame may still be pending (e.g. a CR-only stream ending in CR)
+                    events = parser.flush()
+                    ended = True
+                except asyncio.TimeoutError:
+                    raise StreamFailure('timeouts', f"no data for {self.timeout:.0f}s")
+                received = time.time()
+                now = time.perf_counter()
+                for event in events:
+                    if last_event is None:
+                        stats.first_event.record(now - start)
+                    elif now - last_event > self.stall:
+                        stats.stalls += 1
+                    last_event = now
+                    stats.events += 1
+                    try:
+                        data = event.json()
+                    except ValueError:
+                        continue
+                    if not isinstance(data, dict):
+                        continue
+                    sent = data.get('timestamp')
+                    if isinstance(sent, (int, float)):
+                        stats.lag.record(max(0.0, received - sent))
+                    else:
+                        stats.missing_timestamps += 1
+                    if data.get('status') == 'finished':
+                        stats.completed += 1
+                        return True
+            raise StreamFailure('dropped', 'stream closed before the finished event')
+        except StreamFailure as failure:
+            if stats is None:
+                # Never accepted: attribute it to the level it was trying to join
+                stats = self._level(self.open_streams + 1)
+                stats.streams += 1
+            setattr(stats, failure.kind, getattr(stats, failure.kind) + 1)
+            return False
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            if stats is None:
+                stats = self._level(self.open_streams + 1)
+                stats.streams += 1
+            stats.dropped += 1
+            return False
+        finally:
+            if accepted:
+                self.open_streams -= 1
+            if writer is not None:
+                writer.close()
+
+    async def _subscriber(self, delay: float):
+        await asyncio.sleep(delay)
+        self.started += 1
+        while time.perf_counter() < self._deadline:
+            try:
+                if not await self._stream_once():
+                    # Back off so a refusing server is not hammered in a tight reconnect loop
+                    await asyncio.sleep(RETRY_DELAY)
+            except asyncio.CancelledError:
+                return
+
+    async def _watch_loop(self):
+        """Measure event-loop lateness so a saturated client is not mistaken for a slow server."""
+        interval = 0.1
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_delay = max(self.loop_delay, time.perf_counter() - before - interval)
+
+    async def _progress(self):
+        while True:
+            await asyncio.sleep(5)
+            print(f"  {time.perf_counter() - self._started_at:>6.0f}s  started {self.started:>6}  "
+                  f"open {self.open_streams:>6}  peak {self.peak_open:>6}")
+
+    async def _run(self):
+        ramp_time = self.subscribers / self.ramp if self.ramp > 0 else 0.0
+        self._started_at = time.perf_counter()
+        self._deadline = self._started_at + ramp_time + self.hold
+        watchers = [asyncio.ensure_future(self._watch_loop()), asyncio.ensure_future(self._progress())]
+        tasks = [asyncio.ensure_future(self._subscriber(i / self.ramp if self.ramp > 0 else 0.0))
+                 for i in range(self.subscribers)]
+        try:
+            # Streams still open at the deadline are allowed to finish (bounded by the timeout)
+            await asyncio.wait(tasks, timeout=ramp_time + self.hold + self.timeout)
+        finally:
+            for task in tasks + watchers:
+                task.cancel()
+            await asyncio.gather(*tasks, *watchers, return_exceptions=True)
+
+    def _raise_fd_limit(self):
+        if resource is None:
+            return
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = self.subscribers + 256
+        if soft != resource.RLIM_INFINITY and soft < wanted:
+            target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+            try:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+                soft = target
+            except (ValueError, OSError):
+                pass
+        self.fd_limit = None if soft == resource.RLIM_INFINITY else soft
+        if self.fd_limit is not None and self.fd_limit < wanted:
+            print(f"⚠️  Open-file limit is {self.fd_limit}; raise it (ulimit -n) to hold {self.subscribers} streams")
+
+    def run(self) -> Dict[int, LevelStats]:
+        self._raise_fd_limit()
+        print(f"\n📡 {self.subscribers} subscribers on {self.scenario.method} {self.scenario.path}, "
+              f"ramp {self.ramp:g}/s, hold {self.hold:g}s")
+        start = time.perf_counter()
+        asyncio.run(self._run())
+        self.elapsed = time.perf_counter() - start
+        return self.levels
+
+    def _verdict(self, stats: LevelStats) -> str:
+        """Empty when the level met its objectives, otherwise the first objective it broke."""
+        accept_p99 = stats.accept.percentile(99) * 1000
+        lag_p99 = stats.lag.percentile(99) * 1000
+        if stats.failure_rate > self.error_budget:
+            return f"failures {stats.failure_rate:.1%} > {self.error_budget:.1%}"
+        if stats.accept.count and accept_p99 > self.accept_slo_ms:
+            return f"accept p99 {accept_p99:.0f}ms > {self.accept_slo_ms:.0f}ms"
+        if stats.lag.count and lag_p99 > self.lag_slo_ms:
+            return f"lag p99 {lag_p99:.0f}ms > {self.lag_slo_ms:.0f}ms"
+        return ''
+
+    def capacity(self):
+        """Return (streams held before degrading, first degraded level, reason)."""
+        held = 0
+        for level in sorted(self.levels):
+            stats = self.levels[level]
+            reason = self._verdict(stats)
+            if reason:
+                return held, stats, reason
+            held = max(held, stats.max_open)
+        return held, None, ''
+
+    def print_report(self):
+        print(f"\n📡 SSE Subscribers ({self.elapsed:.1f}s, peak {self.peak_open} open streams)")
+        print("=" * 100)
+        print(f"{'open streams':<14}{'streams':>8}{'accept p50':>11}{'p99':>8}{'1st evt p99':>12}"
+              f"{'lag p50':>9}{'p99':>8}{'max':>8}{'stalls':>8}{'drops':>7}{'errors':>8}  ok")
+        print("-" * 100)
+
+        def ms(value: float) -> str:
+            return f"{value * 1000:.0f}"
+
+        missing = 0
+        for level in sorted(self.levels):
+            stats = self.levels[level]
+            missing += stats.missing_timestamps
+            errors = stats.refused + stats.http_errors + stats.timeouts
+            low = max(1, level - self.level_step + 1)
+            print(f"{f'{low}-{level}':<14}{stats.streams:>8}{ms(stats.accept.percentile(50)):>11}"
+                  f"{ms(stats.accept.percentile(99)):>8}{ms(stats.first_event.percentile(99)):>12}"
+                  f"{ms(stats.lag.percentile(50)):>9}{ms(stats.lag.percentile(99)):>8}{ms(stats.lag.max):>8}"
+                  f"{stats.stalls:>8}{stats.dropped:>7}{errors:>8}  {'❌' if self._verdict(stats) else '✅'}")
+        print("-" * 100)
+        print(f"errors = refused {sum(s.refused for s in self.levels.values())}, "
+              f"HTTP {sum(s.http_errors for s in self.levels.values())}, "
+              f"timeouts {sum(s.timeouts for s in self.levels.values())}; stall = gap > {self.stall:g}s")
+
+        held, degraded, reason = self.capacity()
+        if degraded is None:
+            print(f"✅ Held {held} concurrent streams without degrading "
+                  f"(accept p99 ≤ {self.accept_slo_ms:.0f}ms, lag p99 ≤ {self.lag_slo_ms:.0f}ms, "
+                  f"failures ≤ {self.error_budget:.1%}); raise --subscribers to find the limit")
+        else:
+            low = max(1, degraded.level - self.level_step + 1)
+            print(f"❌ Holds {held} concurrent streams before degrading; "
+                  f"{low}-{degraded.level} open: {reason}")
+
+        if self.loop_delay > 0.1:
+            print(f"⚠️  Client event loop ran up to {self.loop_delay * 1000:.0f}ms late; "
+                  f"lag figures include client-side delay")
+        if missing:
+            print(f"⚠️  {missing} events carried no server timestamp; lag covers the rest only")
+
+
+def main(argv: List[str] = None) -> int:
+    names = [scenario.name for scenario in API_SCENARIOS if scenario.stream]
+    parser = argparse.ArgumentParser(description="Hold thousands of concurrent SSE subscriptions")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--endpoint', default=DEFAULT_SCENARIO, choices=names)
+    parser.add_argument('--subscribers', type=int, default=1000, help="concurrent subscriptions to ramp up to")
+    parser.add_argument('--ramp', type=float, default=50.0, help="new subscribers per second")
+    parser.add_argument('--hold', type=float, default=30.0, help="seconds to hold after the ramp")
+    parser.add_argument('--level-step', type=int, default=0,
+                        help="width of the open-stream buckets (default: subscribers / 10)")
+    parser.add_argument('--stall', type=float, default=3.0, help="gap between events counted as a stall, seconds")
+    parser.add_argument('--accept-slo-ms', type=float, default=1000.0)
+    parser.add_argument('--lag-slo-ms', type=float, default=500.0)
+    parser.add_argument('--error-budget', type=float, default=0.01, help="maximum failed-stream rate")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    if args.subscribers < 1:
+        parser.error("--subscribers must be at least 1")
+    scenario = next(scenario for scenario in API_SCENARIOS if scenario.name == args.endpoint)
+    swarm = SubscriberSwarm(args.base_url, scenario, args.subscribers, args.ramp, args.hold, args.level_step,
+                            args.stall, args.accept_slo_ms, args.lag_slo_ms, args.error_budget, args.timeout)
+    swarm.run()
+    swarm.print_report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Latency statistics used by the load-testing modes.
+
+Latencies are recorded into LatencyHistogram, a compact log-linear histogram in
+the style of HdrHistogram: values are bucketed in microseconds with a bounded
+relative error, counts live in a single array, and two histograms merge
+losslessly by adding their counts. Memory therefore depends on the latency
+range, not on the number of requests.
+"""
+
+import math
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Each power-of-two range is split into 2**(SUB_BUCKET_BITS - 1) linear buckets,
+# which bounds the relative error of a recorded value to 1 / 2**(SUB_BUCKET_BITS - 1).
+SUB_BUCKET_BITS = 8
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_HALF_COUNT = _SUB_BUCKET_COUNT >> 1
+_MAX_MICROSECONDS = (1 << 40) - 1
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Return the nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values))
+    return sorted_values[max(0, min(rank, len(sorted_values)) - 1)]
+
+
+def linear_fit(points: List[Tuple[float, float]]) -> Optional[float]:
+    """Least-squares slope of (x, y) points, or None with fewer than two distinct x values."""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def fit_exponent(points: List[Tuple[float, float]]) -> Optional[float]:
+    """Least-squares slope of log(y) against log(x): y ~ x^k returns k."""
+    return linear_fit([(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0])
+
+
+def _bucket_index(microseconds: int) -> int:
+    if microseconds < _SUB_BUCKET_COUNT:
+        return microseconds
+    shift = microseconds.bit_length() - SUB_BUCKET_BITS
+    return _SUB_BUCKET_COUNT + (shift - 1) * _HALF_COUNT + ((microseconds >> shift) - _HALF_COUNT)
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """Return the inclusive [low, high] microsecond range of a bucket."""
+    if index < _SUB_BUCKET_COUNT:
+        return index, index
+    offset = index - _SUB_BUCKET_COUNT
+    shift = offset // _HALF_COUNT + 1
+    mantissa = offset % _HALF_COUNT + _HALF_COUNT
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Array-backed log-linear latency histogram (values recorded in seconds)."""
+
+    __slots__ = ('counts', 'count', 'total_microseconds', 'min_microseconds', 'max_microseconds')
+
+    def __init__(self):
+        self.counts = array('Q')
+        self.count = 0
+        self.total_microseconds = 0
+        self.min_microseconds = 0
+        self.max_microseconds = 0
+
+    def record(self, seconds: float, times: int = 1):
+        """Record a latency given in seconds."""
+        microseconds = min(max(int(seconds * 1_000_000), 0), _MAX_MICROSECONDS)
+        index = _bucket_index(microseconds)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += times
+
+        if self.count == 0 or microseconds < self.min_microseconds:
+            self.min_microseconds = microseconds
+        if microseconds > self.max_microseconds:
+            self.max_microseconds = microseconds
+        self.count += times
+        self.total_microseconds += microseconds * times
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's counts to this one."""
+        if other.count == 0:
+            return
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, value in enumerate(other.counts):
+            if value:
+                self.counts[index] += value
+
+        if self.count == 0 or other.min_microseconds < self.min_microseconds:
+            self.min_microseconds = other.min_microseconds
+        self.max_microseconds = max(self.max_microseconds, other.max_microseconds)
+        self.count += other.count
+        self.total_microseconds += other.total_microseconds
+
+    def percentile(self, pct: float) -> float:
+        """Return the nearest-rank percentile in seconds (upper bound of its bucket)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self.max_microseconds) / 1_000_000
+        return self.max_microseconds / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total_microseconds / self.count / 1_000_000 if self.count else 0.0
+
+    @property
+    def max(self) -> float:
+        return self.max_microseconds / 1_000_000
+
+    def buckets(self) -> Iterator[Tuple[float, int]]:
+        """Yield (bucket midpoint in seconds, count) for every non-empty bucket."""
+        for index, value in enumerate(self.counts):
+            if value:
+                low, high = _bucket_bounds(index)
+                yield (low + high) / 2 / 1_000_000, value
+
+    def to_dict(self) -> Dict:
+        """Sparse, JSON-friendly representation."""
+        return {
+            'sub_bucket_bits': SUB_BUCKET_BITS,
+            'count': self.count,
+            'total_us': self.total_microseconds,
+            'min_us': self.min_microseconds,
+            'max_us': self.max_microseconds,
+            'buckets': {str(index): value for index, value in enumerate(self.counts) if value}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        if data.get('sub_bucket_bits', SUB_BUCKET_BITS) != SUB_BUCKET_BITS:
+            raise ValueError("Histogram was recorded with a different bucket precision")
+        histogram = cls()
+        buckets = {int(index): value for index, value in data.get('buckets', {}).items()}
+        if buckets:
+            histogram.counts.extend([0] * (max(buckets) + 1))
+            for index, value in buckets.items():
+                histogram.counts[index] = value
+        histogram.count = data.get('count', sum(buckets.values()))
+        histogram.total_microseconds = data.get('total_us', 0)
+        histogram.min_microseconds = data.get('min_us', 0)
+        histogram.max_microseconds = data.get('max_us', 0)
+        return histogram
+
+
+class EndpointStats:
+    """Latency histogram and error count for a single endpoint."""
+
+    __slots__ = ('name', 'histogram', 'errors')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    def record(self, latency: float, ok: bool):
+        """Record one completed request."""
+        self.histogram.record(latency)
+        if not ok:
+            self.errors += 1
+
+    def merge(self, other: "EndpointStats"):
+        """Fold another EndpointStats (e.g. from another worker process) into this one."""
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+
+    def summary(self, elapsed: float) -> Dict[str, float]:
+        """Summarise throughput, error rate and latency percentiles (in ms)."""
+        count = self.histogram.count
+        return {
+            'requests': count,
+            'throughput': count / elapsed if elapsed > 0 else 0.0,
+            'error_rate': self.errors / count if count else 0.0,
+            'p50': self.histogram.percentile(50) * 1000,
+            'p90': self.histogram.percentile(90) * 1000,
+            'p99': self.histogram.percentile(99) * 1000,
+            'max': self.histogram.max * 1000,
+        }
+
+
+def merge_stats(target: Dict[str, EndpointStats], source: Dict[str, EndpointStats]):
+    """Merge per-endpoint stats from one worker into the running totals."""
+    for name, endpoint_stats in source.items():
+        if name not in target:
+            target[name] = EndpointStats(name)
+        target[name].merge(endpoint_stats)
@@ -0,0 +1,805 @@
+"""
+In-process asyncio stand-in for the Laravel /api routes.
+
+Implements every route from backend/routes/api.php, including the two SSE
+endpoints, with response shapes that mirror the controllers. Each route can be
+given its own latency, jitter, payload padding and error rate, so the harness
+can be exercised (and benchmarked) without a running `php artisan serve`.
+
+Usage:
+    python3 -m harness.stub_server --port 8000
+    python3 -m harness.stub_server --port 8000 --config routes.json
+    python3 -m harness.stub_server --benchmark --users 20 --duration 10
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+_REASONS = {
+    200: 'OK', 201: 'Created', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 429: 'Too Many Requests', 500: 'Internal Server Error', 502: 'Bad Gateway',
+    503: 'Service Unavailable', 504: 'Gateway Timeout'
+}
+
+# Mirrors the transition rules in ArticleController; ids 1-4 are fixed samples, other numeric ids are stored
+# Lifetime of a report's generation time, like the controller's cache entry
+REPORT_TTL = 86400.0
+
+ARTICLE_STATUSES = {1: 'draft', 2: 'review', 3: 'published', 4: 'rejected'}
+ARTICLE_TRANSITIONS = {
+    'draft': {'submit': 'review'},
+    'review': {'approve': 'published', 'reject': 'rejected'},
+    'published': {},
+    'rejected': {'resubmit': 'review'}
+}
+
+# (method, path pattern, route name) for every route in backend/routes/api.php
+ROUTES: List[Tuple[str, re.Pattern, str]] = [
+    ('POST', re.compile(r'/api/langgraph/simple-workflow'), 'langgraph_simple'),
+    ('POST', re.compile(r'/api/langgraph/advanced-workflow'), 'langgraph_advanced'),
+    ('GET', re.compile(r'/api/article(?:/(?P<id>[^/]+))?'), 'article_get'),
+    ('POST', re.compile(r'/api/article/(?P<id>[^/]+)/transition/(?P<transition>[^/]+)'), 'article_transition'),
+    ('POST', re.compile(r'/api/model/test'), 'model_test'),
+    ('POST', re.compile(r'/api/multi-agent/stream'), 'multi_agent'),
+    ('POST', re.compile(r'/api/chat/process'), 'chat_process'),
+    ('GET', re.compile(r'/api/chat/history/(?P<conversation_id>[^/]+)'), 'chat_history'),
+    ('POST', re.compile(r'/api/workflow-validation/validate'), 'workflow_validation'),
+    ('GET', re.compile(r'/api/workflow-validation/report/(?P<validation_id>[^/]+)'), 'validation_report'),
+]
+
+# Read routes answered through Controller::conditionalJson (ETag/Last-Modified, 304 Not Modified)
+CONDITIONAL_ROUTES = ('article_get', 'chat_history', 'validation_report')
+
+# Graph nodes each controller runs, in order; the stub reports them in Server-Timing like the backend does
+GRAPH_NODES: Dict[str, List[str]] = {
+    'langgraph_simple': ['start', 'process', 'end'],
+    'langgraph_advanced': ['start', 'process', 'end'],
+    'chat_process': ['input_processor', 'ai_responder', 'response_formatter', 'context_updater'],
+    'workflow_validation': ['input_validator', 'structure_validator', 'rule_validator',
+                            'execution_simulator', 'report_generator']
+}
+
+# Progress event status -> graph node, as in WorkflowValidationController
+VALIDATION_STEP_NODES = {
+    'input_validation': 'input_validator',
+    'structure_validation': 'structure_validator',
+    'rule_validation': 'rule_validator',
+    'execution_simulation': 'execution_simulator',
+    'report_generation': 'report_generator'
+}
+
+
+def match_route(method: str, path: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Return (route name, path parameters) for a request path such as /api/article/1."""
+    path = path.split('?', 1)[0].rstrip('/') or '/'
+    for route_method, pattern, name in ROUTES:
+        match = pattern.fullmatch(path)
+        if match is not None and route_method == method:
+            return name, match.groupdict()
+    return None
+
+
+async def read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    """Read a request body delimited by Content-Length or chunked transfer encoding."""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readline()
+    length = int(headers.get('content-length', 0) or 0)
+    return await reader.readexactly(length) if length else b''
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """Read one HTTP/1.1 request; returns (method, target, version, headers, body) or None at EOF."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, version = request_line.decode('latin-1').split()
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    return method, target, version, headers, await read_body(reader, headers)
+
+
+class RouteConfig:
+    """Simulated behaviour of one route."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, payload_size: int = 0,
+                 error_rate: float = 0.0, error_status: int = 500, stream_interval: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.payload_size = payload_size
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_interval = stream_interval
+
+    @classmethod
+    def from_dict(cls, data: Dict, base: "RouteConfig" = None) -> "RouteConfig":
+        """Build a config from a dict, taking unspecified values from base."""
+        config = RouteConfig(**vars(base)) if base else RouteConfig()
+        for key, value in data.items():
+            if not hasattr(config, key):
+                raise ValueError(f"Unknown route option: {key}")
+            setattr(config, key, value)
+        return config
+
+    def delay(self, rng: random.Random) -> float:
+        """Return the response delay for one request."""
+        if self.jitter <= 0:
+            return self.latency
+        return max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+
+
+class StubServer:
+    """HTTP/1.1 keep-alive server that answers the /api routes."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000, default: RouteConfig = None,
+                 routes: Dict[str, RouteConfig] = None, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.default = default or RouteConfig()
+        self.routes = routes or {}
+        self.request_counts: Dict[str, int] = {}
+        # Stored articles by id (handlers run on the event loop, so updates are naturally serialised)
+        self.articles: Dict[str, Dict] = {}
+        self.reports: Dict[str, float] = {}
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # Every route name has a handler method of the same name with a leading underscore
+        self._table: List[Tuple[str, re.Pattern, str, Callable]] = [
+            (method, pattern, name, getattr(self, f'_{name}')) for method, pattern, name in ROUTES
+        ]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api"
+
+    def config_for(self, route: str) -> RouteConfig:
+        return self.routes.get(route, self.default)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Bind the listening socket (port 0 picks a free port)."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  reuse_address=True)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "StubServer":
+        """Run the server on a background event loop; returns once it is listening."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name='stub-server', daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop a server started with start_in_thread()."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    # ------------------------------------------------------------------
+    # HTTP handling
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                try:
+                    await self._dispatch(method, target, headers, body, writer, keep_alive)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as exc:
+                    # Like the controllers' catch (\Exception $e): answer 500 instead of dropping the connection
+                    await self._write_json(writer, 500, {'success': False, 'error': str(exc)}, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes,
+                        writer: asyncio.StreamWriter, keep_alive: bool):
+        path = target.split('?', 1)[0].rstrip('/') or '/'
+        received = time.perf_counter()
+        # Echoed like the ServerTiming middleware does, so clients can correlate requests
+        request_id = headers.get('x-request-id') or f'req_{uuid.uuid4().hex[:16]}'
+        extra = [('X-Request-Id', request_id)]
+
+        for route_method, pattern, name, handler in self._table:
+            match = pattern.fullmatch(path)
+            if match is None or route_method != method:
+                continue
+
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+            config = self.config_for(name)
+
+            delay = config.delay(self._rng)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if config.error_rate > 0 and self._rng.random() < config.error_rate:
+                await self._write_json(writer, config.error_status,
+                                       {'success': False, 'error': 'Injected error'}, keep_alive, extra)
+                return
+
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                payload = {}
+            if not isinstance(payload, dict):
+                payload = {}
+
+            handler_start = time.perf_counter()
+            status, result = handler(payload, config, **match.groupdict())
+            # The simulated delay stands in for node work, spread evenly over the route's graph nodes
+            nodes = GRAPH_NODES.get(name, []) if status == 200 else []
+            node_times = {node: delay / len(nodes) for node in nodes}
+            graph_time = delay + time.perf_counter() - handler_start
+
+            if hasattr(result, '__aiter__'):
+                if name == 'workflow_validation':
+                    result = self._annotate_validation(result, request_id, node_times, graph_time)
+                extra.append(('Server-Timing', f'app;dur={(time.perf_counter() - received) * 1000:.3f}'))
+                await self._write_stream(writer, result, keep_alive, extra)
+            else:
+                if config.payload_size and isinstance(result, dict):
+                    result['padding'] = 'x' * config.payload_size
+                metrics = [f'app;dur={(time.perf_counter() - received) * 1000:.3f}']
+                if nodes:
+                    metrics.append(f'graph;dur={graph_time * 1000:.3f}')
+                    metrics.extend(f'node_{node};dur={duration * 1000:.3f}' for node, duration in node_times.items())
+                extra.append(('Server-Timing', ', '.join(metrics)))
+                if name in CONDITIONAL_ROUTES and status == 200:
+                    await self._write_conditional(writer, headers, result, keep_alive, extra,
+                                                  *self._validators(name, match.groupdict()))
+                else:
+                    await self._write_json(writer, status, result, keep_alive, extra)
+            return
+
+        await self._write_json(writer, 404, {'message': 'Not Found'}, keep_alive, extra)
+
+    @staticmethod
+    async def _annotate_validation(events: AsyncIterator[Dict], request_id: str, node_times: Dict[str, float],
+                                   graph_time: float) -> AsyncIterator[Dict]:
+        """Add the request id and node timings to validation events, as the controller does."""
+        async for event in events:
+            status = event.get('status')
+            if status == 'started':
+                event['request_id'] = request_id
+            elif status in VALIDATION_STEP_NODES:
+                node = VALIDATION_STEP_NODES[status]
+                event['timing'] = {'node': node, 'duration_ms': round(node_times.get(node, 0.0) * 1000, 3)}
+            elif status == 'finished':
+                event['timing'] = {'graph_ms': round(graph_time * 1000, 3),
+                                   'nodes_ms': round(sum(node_times.values()) * 1000, 3)}
+            yield event
+
+    @staticmethod
+    def _head(status: int, headers: List[Tuple[str, str]], keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool,
+                          extra: List[Tuple[str, str]] = ()):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(self._head(status, [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body))),
+            *extra
+        ], keep_alive) + body)
+        await writer.drain()
+
+    def _validators(self, name: str, params: Dict[str, str]) -> Tuple[Optional[str], Optional[float]]:
+        """The (ETag, Last-Modified) the controller passes for a read; None ETag means a body hash."""
+        if name == 'article_get' and self._is_stored_article(params.get('id')):
+            article = self._stored_article(params['id'])
+            last_change = article['history'][-1]['at'] if article['history'] else None
+            return f"article-{article['id']}-v{article['version']}", last_change
+        if name == 'validation_report':
+            return None, self.reports.get(params['validation_id'])
+        return None, None
+
+    async def _write_conditional(self, writer: asyncio.StreamWriter, headers: Dict[str, str], payload: Any,
+                                 keep_alive: bool, extra: List[Tuple[str, str]], etag: Optional[str],
+                                 last_modified: Optional[float]):
+        """Write a 200 with validators, or an empty 304 when the request's validators still match."""
+        body = json.dumps(payload).encode('utf-8')
+        etag = f'"{etag or hashlib.sha1(body).hexdigest()}"'
+        validators = [('ETag', etag), ('Cache-Control', 'private, no-cache')]
+        if last_modified is not None:
+            validators.append(('Last-Modified', formatdate(int(last_modified), usegmt=True)))
+
+        # As Symfony's Response::isNotModified(): If-None-Match wins over If-Modified-Since
+        if_none_match = headers.get('if-none-match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            not_modified = '*' in tags or etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+        else:
+            not_modified = False
+            if last_modified is not None and headers.get('if-modified-since'):
+                try:
+                    since = parsedate_to_datetime(headers['if-modified-since']).timestamp()
+                    not_modified = since >= int(last_modified)
+                except (TypeError, ValueError):
+                    pass
+
+        if not_modified:
+            writer.write(self._head(304, [*validators, *extra], keep_alive))
+        else:
+            writer.write(self._head(200, [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(body))),
+                *validators,
+                *extra
+            ], keep_alive) + body)
+        await writer.drain()
+
+    async def _write_stream(self, writer: asyncio.StreamWriter, events: AsyncIterator[Dict], keep_alive: bool,
+                            extra: List[Tuple[str, str]] = ()):
+        writer.write(self._head(200, [
+            ('Content-Type', 'text/event-stream'),
+            ('Cache-Control', 'no-cache'),
+            ('X-Accel-Buffering', 'no'),
+            ('Transfer-Encoding', 'chunked'),
+            *extra
+        ], keep_alive))
+        try:
+            async for event in events:
+                frame = b'data: ' + json.dumps(event).encode('utf-8') + b'\n\n'
+                writer.write(b'%x\r\n%s\r\n' % (len(frame), frame))
+                await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception as exc:
+            # The headers are already out, so report the failure in-stream as the controllers do
+            frame = b'data: ' + json.dumps({'status': 'error', 'error': str(exc)}).encode('utf-8') + b'\n\n'
+            writer.write(b'%x\r\n%s\r\n' % (len(frame), frame))
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    # ------------------------------------------------------------------
+    # Route handlers (response shapes follow the Laravel controllers)
+    # ------------------------------------------------------------------
+
+    def _langgraph_simple(self, payload: Dict, config: RouteConfig):
+        return 200, {'success': True, 'data': {
+            'workflow': 'web_example', 'step': 'end', 'message': 'Workflow completed'
+        }}
+
+    def _langgraph_advanced(self, payload: Dict, config: RouteConfig):
+        task = payload.get('task') or 'Default advanced workflow task'
+        result = 'Task processing completed successfully'
+        return 200, {'success': True, 'data': {
+            'workflow': 'advanced_web_example',
+            'task': task,
+            'messages': [
+                {'role': 'system', 'content': 'You are a helpful assistant.'},
+                {'role': 'assistant', 'content': 'Based on the analysis: No analysis available, I will process this task.'},
+                {'role': 'assistant', 'content': f'Task completed. Result: {result}'}
+            ],
+            'step': 'end',
+            'processing_result': result,
+            'final_result': result
+        }}
+
+    @staticmethod
+    def _article(article_id: Any) -> Dict:
+        try:
+            key = int(article_id)
+        except (TypeError, ValueError):
+            key = 1
+        key = key if key in ARTICLE_STATUSES else 1
+        return {
+            'id': key,
+            'title': 'Sample Article',
+            'content': 'This is a sample article content.',
+            'status': ARTICLE_STATUSES[key]
+        }
+
+    @staticmethod
+    def _is_stored_article(article_id: Any) -> bool:
+        return str(article_id).isdigit() and int(article_id) > 0 and int(article_id) not in ARTICLE_STATUSES
+
+    def _stored_article(self, article_id: str) -> Dict:
+        article = self.articles.get(article_id)
+        if article is None:
+            article = self.articles[article_id] = {
+                'id': int(article_id), 'title': f'Article {article_id}',
+                'content': 'This is a sample article content.', 'status': 'draft', 'version': 0, 'history': []
+            }
+        return article
+
+    def _article_get(self, payload: Dict, config: RouteConfig, id: str = None):
+        if self._is_stored_article(id):
+            article = self._stored_article(id)
+            return 200, {'success': True, 'data': {
+                'article': {key: value for key, value in article.items() if key != 'history'},
+                'availableTransitions': list(ARTICLE_TRANSITIONS[article['status']]),
+                'history': list(article['history'])
+            }}
+
+        article = self._article(id or 1)
+        return 200, {'success': True, 'data': {
+            'article': article,
+            'availableTransitions': list(ARTICLE_TRANSITIONS[article['status']])
+        }}
+
+    def _article_transition(self, payload: Dict, config: RouteConfig, id: str, transition: str):
+        if self._is_stored_article(id):
+            return self._stored_article_transition(id, transition)
+
+        article = self._article(id)
+        previous = article['status']
+        available = ARTICLE_TRANSITIONS[previous]
+        if transition not in available:
+            return 400, {
+                'success': False,
+                'error': 'Invalid transition',
+                'current_status': previous,
+                'available_transitions': list(available)
+            }
+
+        article['status'] = available[transition]
+        return 200, {'success': True, 'data': {
+            'article': article,
+            'previous_status': previous,
+            'transition_applied': transition,
+            'new_status': article['status'],
+            'available_transitions': list(ARTICLE_TRANSITIONS[article['status']]),
+            'message': f"Article successfully transitioned from {previous} to {article['status']} via {transition}"
+        }}
+
+    def _stored_article_transition(self, article_id: str, transition: str):
+        article = self._stored_article(article_id)
+        previous = article['status']
+        available = ARTICLE_TRANSITIONS[previous]
+        if transition not in available:
+            return 400, {
+                'success': False,
+                'error': 'Invalid transition',
+                'current_status': previous,
+                'available_transitions': list(available),
+                'version': article['version']
+            }
+
+        article['status'] = available[transition]
+        article['version'] += 1
+        article['history'].append({'version': article['version'], 'from': previous, 'transition': transition,
+                                   'to': article['status'], 'at': time.time()})
+        return 200, {'success': True, 'data': {
+            'article': {key: value for key, value in article.items() if key != 'history'},
+            'previous_status': previous,
+            'transition_applied': transition,
+            'new_status': article['status'],
+            'available_transitions': list(ARTICLE_TRANSITIONS[article['status']]),
+            'version': article['version'],
+            'message': f"Article successfully transitioned from {previous} to {article['status']} via {transition}"
+        }}
+
+    def _model_test(self, payload: Dict, config: RouteConfig):
+        model_type = payload.get('model_type', 'deepseek')
+        prompt = payload.get('prompt')
+        if not prompt:
+            return 400, {'success': False, 'error': 'Please provide a prompt'}
+        if model_type not in ('deepseek', 'qwen'):
+            return 400, {'success': False, 'error': 'Invalid model type selected'}
+        if not payload.get(f'{model_type}_key'):
+            return 400, {'success': False, 'error': f"API key for {model_type} not found. Please provide it in the request or set it in your .env file."}
+        return 200, {'success': True, 'data': {
+            'model_type': model_type, 'prompt': prompt, 'response': f'Stub response to: {prompt}'
+        }}
+
+    def _multi_agent(self, payload: Dict, config: RouteConfig):
+        workflow_type = payload.get('workflow_type', 'simple')
+        task = payload.get('task', 'Research ways to improve energy efficiency in data centers')
+        if not task:
+            return 400, {'success': False, 'error': 'Please provide a task description'}
+        if workflow_type not in ('simple', 'advanced'):
+            return 400, {'success': False, 'error': 'Invalid workflow type selected'}
+
+        async def events():
+            steps = [
+                'Initializing workflow...',
+                'Setting up agents...',
+                'Agents analyzing task...',
+                'Generating responses...',
+                'Compiling results...'
+            ]
+            yield {'status': 'started', 'message': 'Workflow started', 'timestamp': time.time()}
+            for i, step in enumerate(steps):
+                if config.stream_interval > 0:
+                    await asyncio.sleep(config.stream_interval)
+                yield {'status': 'processing', 'step': step, 'progress': f'{i + 1}/{len(steps)}',
+                       'timestamp': time.time()}
+
+            result = {'task': task, 'summary': f'Simulated {workflow_type} workflow result.'}
+            if config.payload_size:
+                result['padding'] = 'x' * config.payload_size
+            yield {'status': 'completed', 'message': 'Workflow completed successfully', 'result': result,
+                   'timestamp': time.time()}
+            yield {'status': 'finished', 'timestamp': time.time()}
+
+        return 200, events()
+
+    def _chat_process(self, payload: Dict, config: RouteConfig):
+        message = payload.get('message')
+        if not message:
+            return 400, {'success': False, 'error': 'Please provide a message'}
+
+        model_type = payload.get('model_type', 'qwen')
+        messages = list(payload.get('history') or [])
+        messages.append({'role': 'user', 'content': message})
+        return 200, {'success': True, 'data': {
+            'conversation_id': payload.get('conversation_id') or f'conv_{int(time.time() * 1e6):x}',
+            'model_type': model_type,
+            'messages': messages,
+            'status': 'waiting_for_input',
+            'response': None,
+            'error': f'AI service temporarily unavailable: API key for {model_type} not configured',
+            'final_response': ''
+        }}
+
+    def _chat_history(self, payload: Dict, config: RouteConfig, conversation_id: str):
+        return 200, {'success': True, 'data': {
+            'conversation_id': conversation_id,
+            'messages': [
+                {'role': 'system', 'content': 'You are a helpful assistant.'},
+                {'role': 'user', 'content': 'Hello!'},
+                {'role': 'assistant', 'content': 'Hi there! How can I help you today?'}
+            ]
+        }}
+
+    def _workflow_validation(self, payload: Dict, config: RouteConfig):
+        workflow = payload.get('workflow')
+        if not workflow:
+            return 400, {'success': False, 'error': 'Please provide a workflow definition'}
+
+        rules = payload.get('rules') or []
+        validation_id = payload.get('validation_id') or f'val_{int(time.time() * 1e6):x}'
+        state = validate_workflow(workflow, rules, validation_id)
+
+        async def events():
+            yield {'status': 'started', 'message': 'Starting workflow validation...'}
+            for progress, status, message in [
+                (10, 'input_validation', 'Validating input...'),
+                (30, 'structure_validation', 'Validating structure...'),
+                (60, 'rule_validation', 'Applying validation rules...'),
+                (90, 'execution_simulation', 'Simulating execution...'),
+                (100, 'report_generation', 'Generating report...')
+            ]:
+                yield {'progress': progress, 'status': status, 'message': message}
+                if config.stream_interval > 0:
+                    await asyncio.sleep(config.stream_interval)
+            yield state
+            yield {'status': 'finished'}
+
+        return 200, events()
+
+    def _validation_report(self, payload: Dict, config: RouteConfig, validation_id: str):
+        # Generated once per validation id, like the controller, so repeated polls can be answered with 304;
+        # entries expire oldest first so polling random ids cannot grow the map without bound
+        now = time.time()
+        while self.reports:
+            oldest_id, oldest = next(iter(self.reports.items()))
+            if now - oldest < REPORT_TTL:
+                break
+            del self.reports[oldest_id]
+        generated = self.reports.setdefault(validation_id, now)
+        return 200, {'success': True, 'data': {
+            'validation_id': validation_id,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(generated)),
+            'workflow_name': 'Sample Workflow',
+            'is_valid': True,
+            'errors': [],
+            'summary': {'total_nodes': 5, 'total_edges': 4, 'error_count': 0}
+        }}
+
+
+def validate_workflow(workflow: Dict, rules: List[Dict], validation_id: str) -> Dict:
+    """Apply the same checks as the WorkflowValidationController graph nodes."""
+    errors = []
+    nodes = workflow.get('nodes') if isinstance(workflow, dict) else None
+    edges = workflow.get('edges') if isinstance(workflow, dict) else None
+
+    if not isinstance(nodes, (dict, list)):
+        errors.append('Workflow must have a "nodes" array')
+        nodes = {}
+    if not isinstance(edges, (dict, list)):
+        errors.append('Workflow must have an "edges" array')
+        edges = []
+
+    node_names = set(nodes) if isinstance(nodes, dict) else set(range(len(nodes)))
+    for edge in (edges.values() if isinstance(edges, dict) else edges):
+        if not isinstance(edge, dict) or 'from' not in edge or 'to' not in edge:
+            errors.append('Edge must have "from" and "to" properties')
+            continue
+        for end in ('from', 'to'):
+            if edge[end] not in node_names:
+                errors.append(f'Edge references non-existent node: {edge[end]}')
+
+    for rule in rules:
+        if isinstance(rule, dict) and rule.get('type') == 'required_nodes':
+            missing = [name for name in rule.get('nodes', []) if name not in node_names]
+            if missing:
+                errors.append('Missing required nodes: ' + ', '.join(map(str, missing)))
+
+    return {
+        'validation_id': validation_id,
+        'workflow_definition': workflow,
+        'validation_rules': rules,
+        'status': 'report_generated',
+        'validation_errors': errors,
+        'progress': 100,
+        'validation_report': {
+            'validation_id': validation_id,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'workflow_name': workflow.get('name', 'Unnamed Workflow') if isinstance(workflow, dict) else 'Unnamed Workflow',
+            'is_valid': not errors,
+            'errors': errors,
+            'summary': {
+                'total_nodes': len(nodes),
+                'total_edges': len(edges),
+                'error_count': len(errors)
+            }
+        }
+    }
+
+
+def _serve(host: str, port: int, default: RouteConfig, routes: Dict[str, RouteConfig], seed: Optional[int]):
+    server = StubServer(host, port, default, routes, seed)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_benchmark(args, default: RouteConfig, routes: Dict[str, RouteConfig]) -> int:
+    """Measure the harness's own ceiling by loading a stub server in a separate process."""
+    import multiprocessing
+    import socket
+
+    from .load import LoadTester
+
+    with socket.socket() as probe:
+        probe.bind((args.host, 0))
+        port = probe.getsockname()[1]
+
+    process = multiprocessing.Process(target=_serve, args=(args.host, port, default, routes, args.seed),
+                                      daemon=True)
+    process.start()
+    try:
+        deadline = time.time() + 10
+        while True:
+            try:
+                socket.create_connection((args.host, port), timeout=0.5).close()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    print("❌ Stub server did not start")
+                    return 1
+                time.sleep(0.05)
+
+        tester = LoadTester(f"http://{args.host}:{port}/api", users=args.users,
+                            duration=args.duration, total_requests=args.requests,
+                            processes=args.processes)
+        stats = tester.run()
+        cpu_used = tester.cpu_time
+        tester.print_report()
+    finally:
+        process.terminate()
+        process.join()
+
+    total = sum(endpoint_stats.count for endpoint_stats in stats.values())
+    streams = sum(endpoint_stats.count for name, endpoint_stats in stats.items()
+                  if name in ('multi_agent', 'workflow_validation'))
+    requests_per_second = total / tester.elapsed if tester.elapsed > 0 else 0.0
+    per_core = total / cpu_used if cpu_used > 0 else 0.0
+
+    print(f"\nHarness ceiling: {requests_per_second:.1f} req/s, "
+          f"{streams / tester.elapsed if tester.elapsed > 0 else 0.0:.1f} streams/s")
+    print(f"Client CPU: {cpu_used:.2f}s in {tester.processes} process(es), "
+          f"{per_core:.1f} requests per CPU-second (per core)")
+
+    if args.min_rps and requests_per_second < args.min_rps:
+        print(f"❌ Throughput below the required {args.min_rps:.1f} req/s")
+        return 1
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stand-in server for the web application API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help="base response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="uniform +/- jitter in seconds")
+    parser.add_argument('--payload-size', type=int, default=0, help="bytes of padding added to responses")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--stream-interval', type=float, default=0.0, help="delay between SSE events in seconds")
+    parser.add_argument('--config', help="JSON file with per-route overrides, keyed by route name")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--benchmark', action='store_true',
+                        help="measure the harness ceiling against a stub server in a child process")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--requests', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=1,
+                        help="load generator processes for --benchmark (0: one per CPU core)")
+    parser.add_argument('--min-rps', type=float, default=None,
+                        help="fail the benchmark when throughput drops below this value")
+    args = parser.parse_args(argv)
+
+    default = RouteConfig(args.latency, args.jitter, args.payload_size, args.error_rate,
+                          args.error_status, args.stream_interval)
+    routes = {}
+    if args.config:
+        with open(args.config) as handle:
+            routes = {name: RouteConfig.from_dict(options, default)
+                      for name, options in json.load(handle).items()}
+
+    if args.benchmark:
+        return run_benchmark(args, default, routes)
+
+    print(f"Stub API server listening on http://{args.host}:{args.port}/api")
+    _serve(args.host, args.port, default, routes, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Arrival timestamps and per-stage latency breakdown for SSE streams.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class StreamTiming:
+    """Timestamps every event of one SSE stream relative to the request start."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.first_byte: Optional[float] = None
+        self.end: Optional[float] = None
+        self.events: List[Tuple[float, str]] = []
+
+    def mark_first_byte(self):
+        """Record that the response headers have arrived."""
+        if self.first_byte is None:
+            self.first_byte = time.perf_counter() - self.start
+
+    def record_event(self, event: Dict):
+        """Record the arrival of a decoded event."""
+        self.events.append((time.perf_counter() - self.start, str(event.get('status', 'unknown'))))
+
+    def finish(self):
+        """Record the end of the stream."""
+        if self.end is None:
+            self.end = time.perf_counter() - self.start
+
+    @property
+    def time_to_first_byte(self) -> Optional[float]:
+        return self.first_byte
+
+    @property
+    def time_to_first_event(self) -> Optional[float]:
+        return self.events[0][0] if self.events else None
+
+    @property
+    def total(self) -> float:
+        return self.end if self.end is not None else time.perf_counter() - self.start
+
+    def gaps(self) -> List[float]:
+        """Return the time between consecutive events."""
+        return [later[0] - earlier[0] for earlier, later in zip(self.events, self.events[1:])]
+
+    def stage_durations(self) -> List[Tuple[str, float]]:
+        """
+        Return the time spent in each status phase, in order of first appearance.
+
+        A phase lasts from the arrival of its status event until the next event
+        (or the end of the stream); repeated statuses are summed.
+        """
+        durations: Dict[str, float] = {}
+        boundaries = [arrival for arrival, _ in self.events[1:]] + [self.total]
+        for (arrival, status), until in zip(self.events, boundaries):
+            durations[status] = durations.get(status, 0.0) + (until - arrival)
+        return list(durations.items())
+
+    def print_report(self):
+        """Print the timing breakdown of this stream."""
+        def ms(value: Optional[float]) -> str:
+            return f"{value * 1000:.1f} ms" if value is not None else "n/a"
+
+        print(f"  {self.endpoint}: {len(self.events)} events in {ms(self.total)}")
+        print(f"    Time to first byte:  {ms(self.time_to_first_byte)}")
+        print(f"    Time to first event: {ms(self.time_to_first_event)}")
+
+        gaps = self.gaps()
+        if gaps:
+            print(f"    Event gaps: min {ms(min(gaps))}, max {ms(max(gaps))}, "
+                  f"mean {ms(sum(gaps) / len(gaps))}")
+
+        total = self.total
+        for status, duration in self.stage_durations():
+            share = duration / total if total > 0 else 0.0
+            print(f"    {status:<24}{ms(duration):>12}  {share:>6.1%}")
@@ -0,0 +1,356 @@
+"""
+Cold-start and warm-up benchmark for the backend.
+
+The first requests after a deploy pay for autoloading, config and route
+loading and opcache warm-up. This mode launches the backend itself, the same
+way start.sh does (`php artisan serve` in backend/), and measures:
+
+- time until the port accepts connections;
+- time to the first successful response (launch to the end of that response);
+- the latency of the first N requests to each endpoint, sent round-robin and
+  one at a time, so request i of every endpoint is the i-th it ever served.
+
+The server is then stopped and the cycle repeated for --restarts runs. Per
+request index the median across restarts forms the warm-up curve. Steady
+state is the median of the last quarter of the curve, and the warm-up length
+is the number of requests before the curve stays within --tolerance of it.
+A --prepare command runs before every launch, e.g. to clear or build the
+config and route caches. With --record the startup times and cold-request
+latencies are appended to the benchmark history (kind "warmup").
+
+Usage:
+    python3 -m harness.warmup --restarts 5 --requests 30
+    python3 -m harness.warmup --prepare "php artisan optimize" --record --label optimized
+    python3 -m harness.warmup --prepare "php artisan optimize:clear" --baseline optimized
+"""
+
+import argparse
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from . import BASE_URL
+from .history import DEFAULT_HISTORY_PATH, HistoryStore, new_record
+from .load import send_request_detailed
+from .runner import create_session
+from .scenarios import API_SCENARIOS, Scenario
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+DEFAULT_COMMAND = 'php artisan serve --host={host} --port={port}'
+# Streams are paced by sleep() on the server, so they are left out unless asked for
+DEFAULT_ENDPOINTS = [scenario for scenario in API_SCENARIOS if not scenario.stream]
+_POLL_INTERVAL = 0.02
+
+
+class LaunchError(Exception):
+    """The backend did not start or never answered successfully."""
+
+
+class RestartResult:
+    """Startup times and per-endpoint latencies (seconds, in request order) of one launch."""
+
+    __slots__ = ('port_open', 'first_response', 'latencies', 'errors')
+
+    def __init__(self):
+        self.port_open = 0.0
+        self.first_response = 0.0
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+
+class WarmupBenchmark:
+    """Launch, probe and stop the backend repeatedly and build its warm-up curve."""
+
+    def __init__(self, base_url: str = BASE_URL, endpoints: List[Scenario] = None, restarts: int = 5,
+                 requests_per_endpoint: int = 20, command: str = DEFAULT_COMMAND, cwd: str = BACKEND_DIR,
+                 prepare: Optional[str] = None, startup_timeout: float = 60.0, tolerance: float = 0.2,
+                 timeout: float = 30.0, server_log: Optional[str] = None):
+        self.base_url = base_url
+        self.endpoints = endpoints or DEFAULT_ENDPOINTS
+        self.restarts = restarts
+        self.requests_per_endpoint = requests_per_endpoint
+        self.command = command
+        self.cwd = cwd
+        self.prepare = prepare
+        self.startup_timeout = startup_timeout
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.server_log = server_log
+        self.results: List[RestartResult] = []
+        self.failed_launches: List[str] = []
+
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+
+    def _port_open(self) -> bool:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+
+    def _launch(self, log) -> subprocess.Popen:
+        if self.prepare:
+            subprocess.run(self.prepare, shell=True, cwd=self.cwd, stdout=log, stderr=log, check=True)
+        command = shlex.split(self.command.format(host=self.host, port=self.port))
+        # A new session lets the whole group go down together: artisan serve runs `php -S` as a child
+        return subprocess.Popen(command, cwd=self.cwd, stdout=log, stderr=log, start_new_session=True)
+
+    @staticmethod
+    def _stop(process: subprocess.Popen):
+        if process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=10)
+        except ProcessLookupError:
+            return
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+    def _wait_until_free(self):
+        deadline = time.perf_counter() + 10
+        while self._port_open():
+            if time.perf_counter() > deadline:
+                raise LaunchError(f"port {self.port} is still in use after stopping the backend")
+            time.sleep(0.1)
+
+    def _request(self, session: requests.Session, endpoint: Scenario):
+        """Return (success, seconds) for one request."""
+        start = time.perf_counter()
+        try:
+            ok = send_request_detailed(session, self.base_url, endpoint, self.timeout)[0]
+        except requests.RequestException:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    def _run_once(self, log) -> RestartResult:
+        result = RestartResult()
+        launched = time.perf_counter()
+        process = self._launch(log)
+        session = create_session()
+        try:
+            deadline = launched + self.startup_timeout
+            while not self._port_open():
+                if process.poll() is not None:
+                    raise LaunchError(f"backend exited with status {process.returncode} before listening")
+                if time.perf_counter() > deadline:
+                    raise LaunchError(f"port {self.port} not open after {self.startup_timeout:.0f}s")
+                time.sleep(_POLL_INTERVAL)
+            result.port_open = time.perf_counter() - launched
+
+            # The first successful response is also the first request of the first endpoint
+            first = self.endpoints[0]
+            while True:
+                ok, seconds = self._request(session, first)
+                if ok:
+                    break
+                if process.poll() is not None or time.perf_counter() > deadline:
+                    raise LaunchError(f"no successful {first.name} response within {self.startup_timeout:.0f}s")
+                time.sleep(_POLL_INTERVAL)
+            result.first_response = time.perf_counter() - launched
+
+            for endpoint in self.endpoints:
+                result.latencies[endpoint.name] = []
+                result.errors[endpoint.name] = 0
+            result.latencies[first.name].append(seconds)
+
+            for index in range(self.requests_per_endpoint):
+                for endpoint in self.endpoints:
+                    if index == 0 and endpoint is first:
+                        continue
+                    ok, seconds = self._request(session, endpoint)
+                    result.latencies[endpoint.name].append(seconds)
+                    if not ok:
+                        result.errors[endpoint.name] += 1
+        finally:
+            session.close()
+            self._stop(process)
+        return result
+
+    def run(self) -> List[RestartResult]:
+        if self._port_open():
+            raise LaunchError(f"{self.host}:{self.port} is already in use; stop the running backend first")
+        log = open(self.server_log, 'ab') if self.server_log else subprocess.DEVNULL
+        try:
+            for restart in range(1, self.restarts + 1):
+                try:
+                    result = self._run_once(log)
+                except (LaunchError, subprocess.CalledProcessError, OSError) as exc:
+                    self.failed_launches.append(str(exc))
+                    print(f"  restart {restart}: ❌ {exc}")
+                else:
+                    self.results.append(result)
+                    print(f"  restart {restart}: port open {result.port_open * 1000:.0f} ms, "
+                          f"first response {result.first_response * 1000:.0f} ms")
+                self._wait_until_free()
+        finally:
+            if log is not subprocess.DEVNULL:
+                log.close()
+        return self.results
+
+    def curve(self, name: str) -> List[float]:
+        """Median latency (seconds) of each request index across restarts."""
+        runs = [result.latencies[name] for result in self.results if result.latencies.get(name)]
+        length = min((len(run) for run in runs), default=0)
+        return [median(run[index] for run in runs) for index in range(length)]
+
+    def warmup(self, name: str):
+        """Return (cold, steady, requests until steady) in seconds / count for one endpoint."""
+        curve = self.curve(name)
+        if not curve:
+            return None, None, None
+        steady = median(curve[-max(1, len(curve) // 4):])
+        settled = len(curve)
+        while settled > 0 and curve[settled - 1] <= steady * (1 + self.tolerance):
+            settled -= 1
+        return curve[0], steady, settled
+
+    def print_report(self, baseline: Dict = None):
+        print(f"\n🧊 Cold Start ({len(self.results)}/{self.restarts} restarts, "
+              f"{self.requests_per_endpoint} requests per endpoint)")
+        print("=" * 100)
+        if not self.results:
+            print("❌ The backend never started; see the errors above (--server-log keeps its output)")
+            return
+
+        port_open = [result.port_open for result in self.results]
+        first = [result.first_response for result in self.results]
+        base_startup = (baseline or {}).get('endpoints', {}).get('startup', {}).get('samples_ms')
+        line = (f"time to port open       median {median(port_open) * 1000:>8.0f} ms   max {max(port_open) * 1000:>8.0f} ms\n"
+                f"time to first response  median {median(first) * 1000:>8.0f} ms   max {max(first) * 1000:>8.0f} ms")
+        if base_startup:
+            before = median(base_startup)
+            line += f"   ({(median(first) * 1000 - before) / before:+.0%} vs {before:.0f} ms)"
+        print(line)
+
+        print(f"\n{'endpoint':<22}{'cold ms':>10}{'2nd ms':>9}{'steady ms':>11}{'cold/steady':>13}"
+              f"{'warm-up reqs':>14}{'errors':>8}")
+        print("-" * 100)
+        for endpoint in self.endpoints:
+            name = endpoint.name
+            cold, steady, settled = self.warmup(name)
+            if cold is None:
+                continue
+            curve = self.curve(name)
+            second = f"{curve[1] * 1000:.1f}" if len(curve) > 1 else '-'
+            ratio = f"{cold / steady:.1f}x" if steady else '-'
+            errors = sum(result.errors.get(name, 0) for result in self.results)
+            line = (f"{name:<22}{cold * 1000:>10.1f}{second:>9}{steady * 1000:>11.1f}{ratio:>13}"
+                    f"{settled:>14}{errors:>8}")
+            base_cold = (baseline or {}).get('endpoints', {}).get(name, {}).get('samples_ms')
+            if base_cold:
+                before = median(base_cold)
+                line += f"  (cold {(cold * 1000 - before) / before:+.0%} vs {before:.1f})"
+            print(line)
+        print("-" * 100)
+        print(f"cold = 1st request after launch, steady = median of the last quarter, "
+              f"warm-up = requests before staying within {self.tolerance:.0%} of steady (medians across restarts)")
+
+        indices = [index for index in (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+                   if index <= self.requests_per_endpoint]
+        print(f"\n{'warm-up curve (ms)':<22}" + ''.join(f"{f'#{index}':>9}" for index in indices))
+        print("-" * 100)
+        for endpoint in self.endpoints:
+            curve = self.curve(endpoint.name)
+            if curve:
+                print(f"{endpoint.name:<22}" + ''.join(f"{curve[index - 1] * 1000:>9.1f}"
+                                                      for index in indices if index <= len(curve)))
+
+    def to_record(self, label: str = '') -> Dict:
+        record = new_record('warmup', label, {
+            'restarts': self.restarts, 'requests_per_endpoint': self.requests_per_endpoint,
+            'command': self.command, 'prepare': self.prepare, 'tolerance': self.tolerance
+        })
+        # samples_ms holds one value per restart, so `harness.history compare --kind warmup` works on it
+        record['endpoints']['startup'] = {
+            'requests': self.restarts,
+            'errors': len(self.failed_launches),
+            'samples_ms': [round(result.first_response * 1000, 3) for result in self.results],
+            'port_open_ms': [round(result.port_open * 1000, 3) for result in self.results]
+        }
+        for endpoint in self.endpoints:
+            cold, steady, settled = self.warmup(endpoint.name)
+            if cold is None:
+                continue
+            record['endpoints'][endpoint.name] = {
+                'requests': sum(len(result.latencies.get(endpoint.name, [])) for result in self.results),
+                'errors': sum(result.errors.get(endpoint.name, 0) for result in self.results),
+                'samples_ms': [round(result.latencies[endpoint.name][0] * 1000, 3) for result in self.results
+                               if result.latencies.get(endpoint.name)],
+                'steady_ms': round(steady * 1000, 3),
+                'warmup_requests': settled,
+                'curve_ms': [round(value * 1000, 3) for value in self.curve(endpoint.name)]
+            }
+        return record
+
+
+def main(argv: List[str] = None) -> int:
+    names = [scenario.name for scenario in API_SCENARIOS]
+    parser = argparse.ArgumentParser(description="Measure backend startup time and warm-up curve across restarts")
+    parser.add_argument('--base-url', default=BASE_URL, help="host and port the launched backend listens on")
+    parser.add_argument('--endpoints', default=None,
+                        help=f"comma-separated, from {', '.join(names)} (default: all non-streaming)")
+    parser.add_argument('--restarts', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=20, help="requests per endpoint after each launch")
+    parser.add_argument('--command', default=DEFAULT_COMMAND,
+                        help="backend command; {host} and {port} are filled in from --base-url")
+    parser.add_argument('--cwd', default=BACKEND_DIR, help="directory the command runs in")
+    parser.add_argument('--prepare', default=None, help="shell command run before every launch")
+    parser.add_argument('--startup-timeout', type=float, default=60.0)
+    parser.add_argument('--tolerance', type=float, default=0.2, help="steady-state band around the tail median")
+    parser.add_argument('--server-log', default=None, help="append the backend's output to this file")
+    parser.add_argument('--record', action='store_true', help="append the result to the benchmark history")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH)
+    parser.add_argument('--label', default='', help="configuration label stored with the record")
+    parser.add_argument('--baseline', default=None, help="label or run id of an earlier warmup record")
+    args = parser.parse_args(argv)
+
+    if args.restarts < 1 or args.requests < 1:
+        parser.error("--restarts and --requests must be at least 1")
+    endpoints = DEFAULT_ENDPOINTS
+    if args.endpoints:
+        wanted = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+        unknown = [name for name in wanted if name not in names]
+        if unknown:
+            parser.error(f"unknown endpoints: {', '.join(unknown)}")
+        endpoints = [scenario for scenario in API_SCENARIOS if scenario.name in wanted]
+
+    store = HistoryStore(args.history)
+    baseline = None
+    if args.baseline:
+        records = store.records(kind='warmup')
+        labelled = [record for record in records if record.get('label') == args.baseline]
+        baseline = labelled[-1] if labelled else store.find(args.baseline, records)
+        if baseline is None:
+            print(f"❌ No warmup record matching '{args.baseline}' in {args.history}")
+            return 2
+
+    benchmark = WarmupBenchmark(args.base_url, endpoints, args.restarts, args.requests, args.command, args.cwd,
+                                args.prepare, args.startup_timeout, args.tolerance, server_log=args.server_log)
+    print(f"\n🧊 Launching `{args.command}` in {args.cwd} {args.restarts} times")
+    try:
+        benchmark.run()
+    except LaunchError as exc:
+        print(f"❌ {exc}")
+        return 2
+    benchmark.print_report(baseline)
+
+    if args.record and benchmark.results:
+        store.append(benchmark.to_record(args.label))
+    return 0 if benchmark.results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
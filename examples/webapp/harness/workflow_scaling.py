@@ -0,0 +1,314 @@
+"""
+Synthetic large-workflow generator and scaling benchmark for /workflow-validation/validate.
+
+Workflow definitions from 10 to 100k nodes are generated in several shapes
+(chain, fan-out, DAG of diamonds, cyclic, disconnected) together with large
+`required_nodes` rule sets. The JSON payload is produced incrementally and
+streamed into the request body, so no giant dict is ever built. The benchmark
+sweeps the sizes and fits the empirical complexity (log-log slope) of request
+time and response size against the number of nodes and edges.
+
+Usage:
+    python3 -m harness.workflow_scaling --shapes chain,dag --sizes 10,100,1000,10000
+"""
+
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from . import BASE_URL
+from .runner import create_session, event_object
+from .sse import iter_events
+from .stats import fit_exponent
+
+SHAPES = ('chain', 'fanout', 'dag', 'cyclic', 'disconnected')
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+
+
+def _node_name(index: int) -> str:
+    return f"n{index}"
+
+
+def generate_edges(shape: str, nodes: int) -> Iterator[Tuple[int, int]]:
+    """Yield (from, to) node indexes for a workflow of the given shape."""
+    if shape == 'chain':
+        for i in range(nodes - 1):
+            yield i, i + 1
+    elif shape == 'fanout':
+        # One entry node feeding every other node, which all feed the last node
+        if nodes == 2:
+            yield 0, 1
+        for i in range(1, nodes - 1):
+            yield 0, i
+            yield i, nodes - 1
+    elif shape == 'dag':
+        # Repeated diamonds: a -> b, a -> c, b -> d, c -> d, where d starts the next diamond
+        end = 0
+        for a in range(0, nodes - 3, 3):
+            yield a, a + 1
+            yield a, a + 2
+            yield a + 1, a + 3
+            yield a + 2, a + 3
+            end = a + 3
+        # Nodes left over after the last whole diamond continue as a chain, so every node is connected
+        for i in range(end, nodes - 1):
+            yield i, i + 1
+    elif shape == 'cyclic':
+        # A chain with a back edge closing a loop every 10 nodes, plus one loop over the whole graph
+        for i in range(nodes - 1):
+            yield i, i + 1
+            if i % 10 == 9:
+                yield i, i - 9
+        yield nodes - 1, 0
+    elif shape == 'disconnected':
+        # Several independent chains of roughly sqrt(n) nodes each
+        component = max(2, int(math.sqrt(nodes)))
+        for i in range(nodes - 1):
+            if (i + 1) % component:
+                yield i, i + 1
+    else:
+        raise ValueError(f"Unknown workflow shape: {shape}")
+
+
+def count_edges(shape: str, nodes: int) -> int:
+    return sum(1 for _ in generate_edges(shape, nodes))
+
+
+def iter_payload(shape: str, nodes: int, required_ratio: float = 1.0,
+                 batch: int = 1000) -> Iterator[bytes]:
+    """Yield the JSON request body for a synthetic workflow in chunks."""
+    encode = json.dumps
+    yield b'{"workflow":{"name":' + encode(f"Synthetic {shape} {nodes}").encode() + b',"nodes":{'
+
+    parts = []
+    for i in range(nodes):
+        node_type = 'start' if i == 0 else 'end' if i == nodes - 1 else 'task'
+        parts.append(f'{"," if i else ""}"{_node_name(i)}":{{"type":"{node_type}"}}')
+        if len(parts) >= batch:
+            yield ''.join(parts).encode()
+            parts = []
+    if parts:
+        yield ''.join(parts).encode()
+
+    yield b'},"edges":['
+    parts = []
+    first = True
+    for source, target in generate_edges(shape, nodes):
+        parts.append(f'{"" if first else ","}{{"from":"{_node_name(source)}","to":"{_node_name(target)}"}}')
+        first = False
+        if len(parts) >= batch:
+            yield ''.join(parts).encode()
+            parts = []
+    if parts:
+        yield ''.join(parts).encode()
+
+    yield b']},"rules":[{"type":"required_nodes","nodes":['
+    required = int(nodes * required_ratio)
+    parts = []
+    for i in range(required):
+        parts.append(f'{"," if i else ""}"{_node_name(i)}"')
+        if len(parts) >= batch:
+            yield ''.join(parts).encode()
+            parts = []
+    if parts:
+        yield ''.join(parts).encode()
+    yield b']}]}'
+
+
+def spool_payload(chunks: Iterator[bytes]) -> Tuple[IO[bytes], int]:
+    """
+    Write the payload to a spooled temporary file so it can be sent with a
+    Content-Length (the PHP development server does not accept chunked bodies).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    size = 0
+    for chunk in chunks:
+        spool.write(chunk)
+        size += len(chunk)
+    spool.seek(0)
+    return spool, size
+
+
+def run_validation(session: requests.Session, base_url: str, shape: str, nodes: int,
+                   required_ratio: float = 1.0, chunked: bool = False, timeout: float = 600.0) -> Dict:
+    """
+    Send one synthetic workflow and measure the validation stream.
+
+    The payload is spooled before the clock starts, so client-side generation
+    is not counted as server time. With `chunked` the payload is generated while
+    it is uploaded, so that generation time is included in the measurement.
+    """
+    url = f"{base_url}/workflow-validation/validate"
+    chunks = iter_payload(shape, nodes, required_ratio)
+
+    if chunked:
+        body, request_bytes = chunks, None
+    else:
+        body, request_bytes = spool_payload(chunks)
+
+    try:
+        start = time.perf_counter()
+        with session.post(url, data=body, stream=True, timeout=timeout) as response:
+            first_byte = time.perf_counter() - start
+            response_bytes = 0
+            events = 0
+            is_valid = None
+            ok = response.status_code == 200
+
+            def counted():
+                nonlocal response_bytes
+                for chunk in response.iter_content(chunk_size=None):
+                    response_bytes += len(chunk)
+                    yield chunk
+
+            for event in iter_events(counted()):
+                events += 1
+                if '"validation_report"' in event.data:
+                    report = event_object(event).get('validation_report')
+                    is_valid = report.get('is_valid') if isinstance(report, dict) else None
+                if '"finished"' in event.data and event_object(event).get('status') == 'finished':
+                    break
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+
+    return {
+        'shape': shape,
+        'nodes': nodes,
+        'edges': count_edges(shape, nodes),
+        'ok': ok,
+        'is_valid': is_valid,
+        'events': events,
+        'request_bytes': request_bytes,
+        'response_bytes': response_bytes,
+        'ttfb_s': first_byte,
+        'total_s': time.perf_counter() - start
+    }
+
+
+class WorkflowScalingBenchmark:
+    """Sweeps workflow sizes per shape and reports the empirical complexity curve."""
+
+    def __init__(self, base_url: str = BASE_URL, shapes: List[str] = None, sizes: List[int] = None,
+                 repeat: int = 1, required_ratio: float = 1.0, chunked: bool = False,
+                 timeout: float = 600.0, max_seconds: float = 120.0):
+        self.base_url = base_url
+        self.shapes = shapes or list(SHAPES)
+        self.sizes = sorted(sizes or DEFAULT_SIZES)
+        self.repeat = repeat
+        self.required_ratio = required_ratio
+        self.chunked = chunked
+        self.timeout = timeout
+        # Larger sizes of a shape are skipped once one request takes longer than this
+        self.max_seconds = max_seconds
+        self.results: List[Dict] = []
+
+    def run(self) -> List[Dict]:
+        session = create_session()
+        self.results = []
+        try:
+            for shape in self.shapes:
+                print(f"\n🧪 Shape: {shape}")
+                for nodes in self.sizes:
+                    runs = []
+                    for _ in range(self.repeat):
+                        try:
+                            runs.append(run_validation(session, self.base_url, shape, nodes,
+                                                       self.required_ratio, self.chunked, self.timeout))
+                        except requests.RequestException as e:
+                            print(f"  {nodes:>7} nodes: ❌ {e}")
+                            break
+                    if not runs:
+                        break
+
+                    # Keep the fastest repetition to reduce noise
+                    result = min(runs, key=lambda run: run['total_s'])
+                    self.results.append(result)
+                    print(f"  {nodes:>7} nodes {result['edges']:>7} edges: "
+                          f"{'✅' if result['ok'] else '❌'} {result['total_s'] * 1000:>10.1f} ms, "
+                          f"response {result['response_bytes'] / 1024:>9.1f} KiB")
+
+                    if result['total_s'] > self.max_seconds:
+                        print(f"  Skipping larger sizes (over {self.max_seconds:.0f}s)")
+                        break
+        finally:
+            session.close()
+        return self.results
+
+    def print_report(self):
+        """Print the fitted complexity exponents per shape."""
+        print("\n📈 Empirical Complexity (y ~ x^k)")
+        print("=" * 92)
+        print(f"{'shape':<14}{'time/nodes':>12}{'time/edges':>12}{'resp/nodes':>12}{'resp/edges':>12}"
+              f"{'worst step':>14}")
+        print("-" * 92)
+        for shape in self.shapes:
+            rows = [result for result in self.results if result['shape'] == shape and result['ok']]
+            if len(rows) < 2:
+                continue
+            time_nodes = fit_exponent([(row['nodes'], row['total_s']) for row in rows])
+            time_edges = fit_exponent([(row['edges'], row['total_s']) for row in rows])
+            size_nodes = fit_exponent([(row['nodes'], row['response_bytes']) for row in rows])
+            size_edges = fit_exponent([(row['edges'], row['response_bytes']) for row in rows])
+
+            # Local slope between consecutive sizes exposes where superlinear growth kicks in
+            steps = [(later['nodes'], fit_exponent([(earlier['nodes'], earlier['total_s']),
+                                                    (later['nodes'], later['total_s'])]))
+                     for earlier, later in zip(rows, rows[1:])]
+            worst = max(steps, key=lambda step: step[1] or 0)
+
+            def fmt(value: Optional[float]) -> str:
+                return f"{value:.2f}" if value is not None else 'n/a'
+
+            print(f"{shape:<14}{fmt(time_nodes):>12}{fmt(time_edges):>12}{fmt(size_nodes):>12}"
+                  f"{fmt(size_edges):>12}{fmt(worst[1]):>8} @{worst[0]:<6}")
+            if time_nodes is not None and time_nodes > 1.2:
+                print(f"  ⚠️  {shape}: validation time grows superlinearly (~n^{time_nodes:.2f})")
+            if time_edges is not None and time_edges > 1.2:
+                print(f"  ⚠️  {shape}: validation time grows superlinearly in edges (~e^{time_edges:.2f})")
+        if self.chunked:
+            print("ℹ️  Chunked upload: client-side payload generation overlaps the upload and is included in the times")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmark for /workflow-validation/validate")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--shapes', default=','.join(SHAPES), help=f"comma-separated, from {', '.join(SHAPES)}")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="comma-separated node counts")
+    parser.add_argument('--repeat', type=int, default=1, help="repetitions per size (fastest is kept)")
+    parser.add_argument('--required-ratio', type=float, default=1.0,
+                        help="fraction of nodes listed in the required_nodes rule")
+    parser.add_argument('--chunked', action='store_true',
+                        help="send the body with chunked transfer encoding instead of spooling it "
+                             "(payload generation then overlaps the upload and is included in the timings)")
+    parser.add_argument('--timeout', type=float, default=600.0)
+    parser.add_argument('--max-seconds', type=float, default=120.0,
+                        help="stop growing a shape once one request takes longer than this")
+    parser.add_argument('--output', default=None, help="write the raw results as JSON")
+    args = parser.parse_args(argv)
+
+    shapes = [shape.strip() for shape in args.shapes.split(',') if shape.strip()]
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)}")
+
+    benchmark = WorkflowScalingBenchmark(args.base_url, shapes, [int(size) for size in args.sizes.split(',')],
+                                         args.repeat, args.required_ratio, args.chunked,
+                                         args.timeout, args.max_seconds)
+    benchmark.run()
+    benchmark.print_report()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(benchmark.results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
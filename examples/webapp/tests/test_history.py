@@ -0,0 +1,45 @@
+"""Tests for harness.history regression detection (run from examples/webapp: python3 -m pytest tests)."""
+
+import unittest
+
+from harness.history import compare_records, new_record
+
+
+def _record(stages, samples_ms):
+    record = new_record('validation')
+    record['endpoints']['workflow_validation'] = {'requests': len(samples_ms), 'errors': 0,
+                                                  'samples_ms': samples_ms}
+    record['streams']['workflow_validation'] = {'stages_ms': stages}
+    return record
+
+
+def _finding(findings, metric):
+    return next(finding for finding in findings if finding['metric'] == metric)
+
+
+class CompareRecordsTest(unittest.TestCase):
+
+    def test_single_stage_sample_is_informational(self):
+        findings = compare_records(_record({'analysis': [10.0]}, [10.0]),
+                                   _record({'analysis': [100.0]}, [100.0]))
+        stage = _finding(findings, 'workflow_validation stage analysis')
+        self.assertIsNone(stage['p_value'])
+        self.assertFalse(stage['regression'])
+
+    def test_significant_stage_slowdown_is_a_regression(self):
+        findings = compare_records(_record({'analysis': [10.0 + i % 3 for i in range(30)]}, [10.0]),
+                                   _record({'analysis': [50.0 + i % 3 for i in range(30)]}, [10.0]))
+        stage = _finding(findings, 'workflow_validation stage analysis')
+        self.assertLess(stage['p_value'], 0.01)
+        self.assertTrue(stage['regression'])
+
+    def test_stages_recorded_as_single_numbers_are_still_compared(self):
+        findings = compare_records(_record({'analysis': 10.0}, [10.0]), _record({'analysis': [12.0]}, [10.0]))
+        self.assertEqual(_finding(findings, 'workflow_validation stage analysis')['baseline'], 10.0)
+
+    def test_run_ids_recorded_in_the_same_second_differ(self):
+        self.assertNotEqual(new_record('load')['run_id'], new_record('load')['run_id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tests for harness.load stream handling (run from examples/webapp: python3 -m pytest tests)."""
+
+import unittest
+
+from harness.load import send_request_detailed
+from harness.runner import MalformedEventError
+from harness.scenarios import Scenario
+
+
+class _StreamResponse:
+
+    def __init__(self, status_code: int, chunks):
+        self.status_code = status_code
+        self._chunks = chunks
+
+    @property
+    def content(self) -> bytes:
+        return b''.join(self._chunks)
+
+    def iter_content(self, chunk_size=None):
+        return iter(self._chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Session:
+
+    def __init__(self, response: _StreamResponse):
+        self.response = response
+
+    def request(self, method, url, **kwargs):
+        return self.response
+
+
+STREAM = Scenario('stream', 'POST', '/stream', {}, stream=True, expected_statuses=(200, 400))
+
+
+def _send(status_code: int, *chunks):
+    return send_request_detailed(_Session(_StreamResponse(status_code, list(chunks))), 'http://test', STREAM)
+
+
+class SendRequestStreamTest(unittest.TestCase):
+
+    def test_finished_event_completes_the_request(self):
+        self.assertEqual(_send(200, b'data: {"status":"started"}\n\n', b'data: {"status":"finished"}\n\n'),
+                         (True, 200, 57))
+
+    def test_stream_closed_without_finished_event_fails(self):
+        self.assertFalse(_send(200, b'data: {"status":"started"}\n\n')[0])
+        self.assertFalse(_send(200, b'data: {"status":"error","error":"boom"}\n\n')[0])
+
+    def test_malformed_finished_event_raises(self):
+        with self.assertRaises(MalformedEventError):
+            _send(200, b'data: {"status":"finished"\n\n')
+
+    def test_expected_error_status_is_plain_json(self):
+        self.assertEqual(_send(400, b'{"success":false}'), (True, 400, 17))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+"""Tests for harness.runner helpers (run from examples/webapp: python3 -m pytest tests)."""
+
+import unittest
+
+from harness.runner import MalformedEventError, event_object
+from harness.sse import iter_events
+
+
+class EventObjectTest(unittest.TestCase):
+
+    def test_json_object(self):
+        event = next(iter_events([b'data: {"status":"finished"}\n\n']))
+        self.assertEqual(event_object(event), {'status': 'finished'})
+
+    def test_invalid_json_and_non_objects_are_malformed(self):
+        for body in (b'data: {"status":\n\n', b'data: [1, 2]\n\n', b'data: null\n\n'):
+            event = next(iter_events([body]))
+            with self.assertRaises(MalformedEventError):
+                event_object(event)
+
+
+if __name__ == '__main__':
+    unittest.main()
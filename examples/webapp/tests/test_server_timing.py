@@ -0,0 +1,34 @@
+"""Tests for harness.server_timing parsing (run from examples/webapp: python3 -m pytest tests)."""
+
+import unittest
+
+from harness.server_timing import parse_server_timing, parse_stream_timing
+
+
+class ParseStreamTimingTest(unittest.TestCase):
+
+    def test_node_and_graph_timings(self):
+        content = (b'data: {"status":"started","request_id":"r1"}\n\n'
+                   b'data: {"timing":{"node":"plan","duration_ms":2}}\n\n'
+                   b'data: {"timing":{"node":"plan","duration_ms":3}}\n\n'
+                   b'data: {"status":"finished","timing":{"graph_ms":10}}\n\n')
+        found = parse_stream_timing(content)
+        self.assertEqual(found['request_id'], 'r1')
+        self.assertAlmostEqual(found['metrics']['node_plan'], 0.005)
+        self.assertAlmostEqual(found['metrics']['graph'], 0.010)
+
+    def test_crlf_framing_multiline_data_and_no_space(self):
+        content = (b'data:{"status":"started",\r\ndata: "request_id":"r2"}\r\n\r\n'
+                   b'data: {"timing":{"node":"a","duration_ms":1}}\r\r'
+                   b'data: not json\n\n')
+        found = parse_stream_timing(content)
+        self.assertEqual(found['request_id'], 'r2')
+        self.assertAlmostEqual(found['metrics']['node_a'], 0.001)
+
+    def test_server_timing_header(self):
+        metrics = parse_server_timing('app;dur=12.5, graph;dur=10, node_a;dur=4;desc="x2", cache')
+        self.assertEqual(metrics, {'app': 0.0125, 'graph': 0.010, 'node_a': 0.004, 'cache': 0.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
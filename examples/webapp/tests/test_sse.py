@@ -0,0 +1,74 @@
+"""Framing tests for harness.sse (run from examples/webapp: python3 -m pytest tests)."""
+
+import unittest
+
+from harness.sse import SSEParser, iter_events
+
+
+def _data(events):
+    return [event.data for event in events]
+
+
+class SSEParserTest(unittest.TestCase):
+
+    def test_lf_framing(self):
+        self.assertEqual(_data(SSEParser().feed(b'data: 1\n\ndata: 2\n\n')), ['1', '2'])
+
+    def test_crlf_framing_dispatches_without_waiting_for_more_input(self):
+        self.assertEqual(_data(SSEParser().feed(b'data: 1\r\n\r\n')), ['1'])
+
+    def test_cr_only_framing(self):
+        parser = SSEParser()
+        self.assertEqual(_data(parser.feed(b'data: 1\r\rdata: 2\r\r')), ['1'])
+        # The final CR could still be half of a CRLF until the stream ends
+        self.assertEqual(_data(parser.flush()), ['2'])
+
+    def test_crlf_split_across_chunks(self):
+        parser = SSEParser()
+        self.assertEqual(parser.feed(b'data: 1\r'), [])
+        self.assertEqual(parser.feed(b'\n\r'), [])
+        self.assertEqual(_data(parser.feed(b'\ndata: 2\r\n\r\n')), ['1', '2'])
+        self.assertEqual(parser.buffered, 0)
+
+    def test_multiline_data_and_fields(self):
+        events = SSEParser().feed(b'event: update\r\nid: 7\r\nretry: 50\r\n: comment\r\ndata: a\r\ndata: b\r\n\r\n')
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].event, 'update')
+        self.assertEqual(events[0].id, '7')
+        self.assertEqual(events[0].retry, 50)
+        self.assertEqual(events[0].data, 'a\nb')
+
+    def test_iter_events_flushes_the_last_event_at_end_of_stream(self):
+        events = list(iter_events([b'data: {"status":"finished"}\r\n\r\n']))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].json(), {'status': 'finished'})
+
+    def test_flush_dispatches_an_unterminated_frame(self):
+        self.assertEqual(_data(iter_events([b'data: 1\n\n', b'data: 2\r'])), ['1', '2'])
+        self.assertEqual(_data(iter_events([b'data: 3'])), ['3'])
+
+    def test_strict_eof_discards_an_unterminated_frame(self):
+        self.assertEqual(_data(iter_events([b'data: 1\n\n', b'data: 2\n'], lenient_eof=False)), ['1'])
+        self.assertEqual(_data(iter_events([b'data: 3'], lenient_eof=False)), [])
+
+    def test_strict_eof_keeps_a_frame_ended_by_a_held_back_cr(self):
+        parser = SSEParser(lenient_eof=False)
+        self.assertEqual(parser.feed(b'data: 1\r\r'), [])
+        self.assertEqual(_data(parser.flush()), ['1'])
+
+    def test_strict_eof_resets_the_pending_frame(self):
+        parser = SSEParser(lenient_eof=False)
+        parser.feed(b'event: update\ndata: 1\n')
+        self.assertEqual(parser.flush(), [])
+        events = parser.feed(b'data: 2\n\n')
+        self.assertEqual(_data(events), ['2'])
+        self.assertEqual(events[0].event, 'message')
+
+    def test_flush_without_pending_data_returns_nothing(self):
+        parser = SSEParser()
+        parser.feed(b'data: 1\n\n')
+        self.assertEqual(parser.flush(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Tests for the synthetic workflow shapes (run from examples/webapp: python3 -m pytest tests)."""
+
+import json
+import unittest
+
+from harness.workflow_scaling import SHAPES, generate_edges, iter_payload
+
+
+def _components(nodes: int, edges) -> int:
+    parent = list(range(nodes))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for source, target in edges:
+        parent[find(source)] = find(target)
+    return len({find(i) for i in range(nodes)})
+
+
+class GenerateEdgesTest(unittest.TestCase):
+
+    def test_connected_shapes_connect_every_node(self):
+        for shape in SHAPES:
+            if shape == 'disconnected':
+                continue
+            for nodes in list(range(2, 40)) + [100, 1000]:
+                with self.subTest(shape=shape, nodes=nodes):
+                    self.assertEqual(_components(nodes, generate_edges(shape, nodes)), 1)
+
+    def test_disconnected_shape_has_several_components(self):
+        self.assertGreater(_components(100, generate_edges('disconnected', 100)), 1)
+
+    def test_payload_is_valid_json(self):
+        payload = json.loads(b''.join(iter_payload('dag', 11, batch=4)))
+        self.assertEqual(len(payload['workflow']['nodes']), 11)
+        self.assertEqual(len(payload['workflow']['edges']), sum(1 for _ in generate_edges('dag', 11)))
+        self.assertEqual(len(payload['rules'][0]['nodes']), 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -71,4 +71,90 @@ class ExecutionTracker
             'stepCount' => count($this->executionLog)
         ];
     }
-}
\ No newline at end of file
+    
+    /**
+     * 记录一次耗时（例如图节点的执行时间）
+     * 
+     * @param string $agentName 智能体或节点名称
+     * @param float $duration 耗时（秒）
+     * @param array $details 详情
+     * @return void
+     */
+    public function recordTiming(string $agentName, float $duration, array $details = []): void
+    {
+        $this->executionLog[] = [
+            'agent' => $agentName,
+            'action' => 'timing',
+            'details' => $details,
+            'duration' => $duration,
+            'timestamp' => microtime(true),
+            'elapsed' => microtime(true) - $this->startTime
+        ];
+    }
+    
+    /**
+     * 按智能体汇总已记录的耗时
+     * 
+     * @return array 以名称为键的 ['count' => 次数, 'duration' => 总耗时秒数]，按首次出现的顺序排列
+     */
+    public function getTimings(): array
+    {
+        $timings = [];
+        
+        foreach ($this->executionLog as $log) {
+            if (!isset($log['duration'])) {
+                continue;
+            }
+            
+            $agent = $log['agent'];
+            if (!isset($timings[$agent])) {
+                $timings[$agent] = [
+                    'count' => 0,
+                    'duration' => 0.0
+                ];
+            }
+            
+            $timings[$agent]['count']++;
+            $timings[$agent]['duration'] += $log['duration'];
+        }
+        
+        return $timings;
+    }
+    
+    /**
+     * 生成 Server-Timing 响应头的值，例如 graph;dur=12.300, node_agent;dur=10.100
+     * 
+     * @param array $extra 额外的指标，名称 => 耗时（秒），排在节点指标之前
+     * @return string
+     */
+    public function toServerTiming(array $extra = []): string
+    {
+        $metrics = [];
+        
+        foreach ($extra as $name => $duration) {
+            $metrics[] = sprintf('%s;dur=%.3f', $this->timingToken($name), $duration * 1000);
+        }
+        
+        foreach ($this->getTimings() as $agent => $timing) {
+            $metric = sprintf('node_%s;dur=%.3f', $this->timingToken($agent), $timing['duration'] * 1000);
+            if ($timing['count'] > 1) {
+                $metric .= sprintf(';desc="x%d"', $timing['count']);
+            }
+            $metrics[] = $metric;
+        }
+        
+        return implode(', ', $metrics);
+    }
+    
+    /**
+     * 将名称转换为合法的 Server-Timing 指标名（HTTP token）
+     * 
+     * @param string $name
+     * @return string
+     */
+    private function timingToken(string $name): string
+    {
+        $token = preg_replace('/[^A-Za-z0-9_\-.]/', '_', $name);
+        return $token === '' ? 'unnamed' : $token;
+    }
+}
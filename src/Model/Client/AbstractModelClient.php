@@ -2,6 +2,8 @@
 
 namespace App\Model\Client;
 
+use App\Agent\ErrorHandling\RetryMechanism;
+
 /**
  * Abstract base class for model clients with improved streaming capabilities
  */
@@ -10,6 +12,8 @@ abstract class AbstractModelClient implements ModelClientInterface
     protected $apiKey;
     protected $modelName;
     protected $baseUrl;
+    protected $timeout = 60;
+    protected $retryMechanism = null;
     
     public function __construct(string $apiKey, string $modelName, string $baseUrl)
     {
@@ -28,14 +32,61 @@ abstract class AbstractModelClient implements ModelClientInterface
         $this->modelName = $modelName;
     }
     
+    public function getBaseUrl(): string
+    {
+        return $this->baseUrl;
+    }
+    
+    /**
+     * Sets the request timeout in seconds
+     * 
+     * @param float $timeout
+     * @return void
+     */
+    public function setTimeout(float $timeout): void
+    {
+        $this->timeout = $timeout;
+    }
+    
+    /**
+     * Retries failed non-streaming requests through the given mechanism (null disables retries)
+     * 
+     * Streaming requests are not retried: tokens may already have been passed on to the caller.
+     * 
+     * @param RetryMechanism|null $retryMechanism
+     * @return void
+     */
+    public function setRetryMechanism(?RetryMechanism $retryMechanism): void
+    {
+        $this->retryMechanism = $retryMechanism;
+    }
+    
     /**
-     * Sends an HTTP request to the API
+     * Sends an HTTP request to the API, retrying failures when a retry mechanism is set
      * 
      * @param string $endpoint API endpoint
      * @param array $data Request data
      * @return array Response data
      */
     protected function sendRequest(string $endpoint, array $data): array
+    {
+        if ($this->retryMechanism === null) {
+            return $this->sendRequestOnce($endpoint, $data);
+        }
+        
+        return $this->retryMechanism->execute(function () use ($endpoint, $data) {
+            return $this->sendRequestOnce($endpoint, $data);
+        });
+    }
+    
+    /**
+     * Sends a single HTTP request to the API
+     * 
+     * @param string $endpoint API endpoint
+     * @param array $data Request data
+     * @return array Response data
+     */
+    protected function sendRequestOnce(string $endpoint, array $data): array
     {
         $url = rtrim($this->baseUrl, '/') . '/' . ltrim($endpoint, '/');
         
@@ -53,7 +104,7 @@ abstract class AbstractModelClient implements ModelClientInterface
                 ],
                 'method' => 'POST',
                 'content' => $jsonData,
-                'timeout' => 60,
+                'timeout' => $this->timeout,
                 'ignore_errors' => true
             ]
         ];
@@ -127,7 +178,7 @@ abstract class AbstractModelClient implements ModelClientInterface
                 ],
                 'method' => 'POST',
                 'content' => $jsonData,
-                'timeout' => 60
+                'timeout' => $this->timeout
             ]
         ];
         
@@ -7,9 +7,9 @@ namespace App\Model\Client;
  */
 class DeepSeekClient extends AbstractModelClient
 {
-    public function __construct(string $apiKey)
+    public function __construct(string $apiKey, ?string $baseUrl = null)
     {
-        parent::__construct($apiKey, 'deepseek-chat', 'https://api.deepseek.com');
+        parent::__construct($apiKey, 'deepseek-chat', $baseUrl ?: 'https://api.deepseek.com');
     }
     
     public function chatComplete(array $messages, array $options = []): string
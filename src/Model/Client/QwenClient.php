@@ -7,9 +7,9 @@ namespace App\Model\Client;
  */
 class QwenClient extends AbstractModelClient
 {
-    public function __construct(string $apiKey)
+    public function __construct(string $apiKey, ?string $baseUrl = null)
     {
-        parent::__construct($apiKey, 'qwen-plus', 'https://dashscope.aliyuncs.com/compatible-mode/v1');
+        parent::__construct($apiKey, 'qwen-plus', $baseUrl ?: 'https://dashscope.aliyuncs.com/compatible-mode/v1');
     }
     
     public function chatComplete(array $messages, array $options = []): string
@@ -13,6 +13,13 @@ class ModelConfig
         $this->config = [
             'deepseek_api_key' => getenv('DEEPSEEK_API_KEY') ?: '',
             'qwen_api_key' => getenv('QWEN_API_KEY') ?: '',
+            // 指向 OpenAI 兼容的本地服务（例如压测用的模拟模型）时覆盖默认 API 地址
+            'deepseek_base_url' => getenv('DEEPSEEK_BASE_URL') ?: '',
+            'qwen_base_url' => getenv('QWEN_BASE_URL') ?: '',
+            'model_timeout' => getenv('MODEL_TIMEOUT') ?: '',
+            // 非流式请求失败后的重试次数及重试间隔（毫秒），默认不重试
+            'model_retries' => getenv('MODEL_RETRIES') ?: '',
+            'model_retry_delay' => getenv('MODEL_RETRY_DELAY') ?: '',
         ];
         
         // 只合并非空的配置值
@@ -2,9 +2,11 @@
 
 namespace App\Model\Factory;
 
+use App\Model\Client\AbstractModelClient;
 use App\Model\Client\ModelClientInterface;
 use App\Model\Client\DeepSeekClient;
 use App\Model\Client\QwenClient;
+use App\Agent\ErrorHandling\RetryMechanism;
 
 class ModelFactory
 {
@@ -29,14 +31,14 @@ class ModelFactory
                 if (!$apiKey) {
                     throw new \InvalidArgumentException('DeepSeek API key is required');
                 }
-                return new DeepSeekClient($apiKey);
+                return $this->configure(new DeepSeekClient($apiKey, $this->baseUrl('deepseek')));
                 
             case 'qwen':
                 $apiKey = $this->config['qwen_api_key'] ?? getenv('QWEN_API_KEY');
                 if (!$apiKey) {
                     throw new \InvalidArgumentException('Qwen API key is required');
                 }
-                return new QwenClient($apiKey);
+                return $this->configure(new QwenClient($apiKey, $this->baseUrl('qwen')));
                 
             default:
                 // 尝试根据模型名称判断类型
@@ -45,23 +47,57 @@ class ModelFactory
                     if (!$apiKey) {
                         throw new \InvalidArgumentException('DeepSeek API key is required for model: ' . $modelType);
                     }
-                    $client = new DeepSeekClient($apiKey);
+                    $client = new DeepSeekClient($apiKey, $this->baseUrl('deepseek'));
                     $client->setModelName($modelType);
-                    return $client;
+                    return $this->configure($client);
                 } elseif (strpos(strtolower($modelType), 'qwen') !== false) {
                     $apiKey = $this->config['qwen_api_key'] ?? getenv('QWEN_API_KEY');
                     if (!$apiKey) {
                         throw new \InvalidArgumentException('Qwen API key is required for model: ' . $modelType);
                     }
-                    $client = new QwenClient($apiKey);
+                    $client = new QwenClient($apiKey, $this->baseUrl('qwen'));
                     $client->setModelName($modelType);
-                    return $client;
+                    return $this->configure($client);
                 }
                 
                 throw new \InvalidArgumentException("Unsupported model type: $modelType");
         }
     }
     
+    /**
+     * 获取模型的 API 地址覆盖值（配置项 {type}_base_url 或环境变量 {TYPE}_BASE_URL）
+     * 
+     * @param string $modelType 模型类型
+     * @return string|null 未配置时返回 null，使用客户端默认地址
+     */
+    private function baseUrl(string $modelType): ?string
+    {
+        $baseUrl = $this->config[$modelType . '_base_url'] ?? getenv(strtoupper($modelType) . '_BASE_URL');
+        return $baseUrl ?: null;
+    }
+    
+    /**
+     * 应用通用的客户端配置（请求超时、失败重试）
+     * 
+     * @param AbstractModelClient $client
+     * @return ModelClientInterface
+     */
+    private function configure(AbstractModelClient $client): ModelClientInterface
+    {
+        $timeout = $this->config['model_timeout'] ?? getenv('MODEL_TIMEOUT');
+        if ($timeout) {
+            $client->setTimeout((float) $timeout);
+        }
+        
+        // 重试为可选功能：未配置 model_retries / MODEL_RETRIES 时每个请求只发送一次
+        $retries = (int) ($this->config['model_retries'] ?? getenv('MODEL_RETRIES'));
+        if ($retries > 0) {
+            $delay = $this->config['model_retry_delay'] ?? getenv('MODEL_RETRY_DELAY');
+            $client->setRetryMechanism(new RetryMechanism($retries, $delay ? (int) $delay : 1000));
+        }
+        return $client;
+    }
+    
     /**
      * 获取支持的模型类型列表
      * 
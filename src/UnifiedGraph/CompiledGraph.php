@@ -23,6 +23,9 @@ class CompiledGraph
     private $stateClass;
     private $channels;
     private $checkpointSaver;
+    private $nodeTimings = [];
+    private $executionTime = 0.0;
+    private $timingListeners = [];
     
     public function __construct(
         array $nodes,
@@ -46,6 +49,55 @@ class CompiledGraph
         $this->checkpointSaver = $checkpointSaver;
     }
     
+    /**
+     * 注册节点耗时监听器，每个节点执行完成后以 (节点名, 耗时秒数) 调用
+     *
+     * @param callable $listener function (string $node, float $duration): void
+     * @return self
+     */
+    public function onNodeTiming(callable $listener): self
+    {
+        $this->timingListeners[] = $listener;
+        return $this;
+    }
+
+    /**
+     * 获取最近一次执行中每个节点的耗时
+     *
+     * @return array<int, array{node: string, duration: float}> 按执行顺序排列，耗时单位为秒
+     */
+    public function getNodeTimings(): array
+    {
+        return $this->nodeTimings;
+    }
+
+    /**
+     * 获取最近一次执行的总耗时（秒），包括节点之间的图调度开销
+     *
+     * 执行抛出异常或被中断时为截至该时刻的耗时，与 getNodeTimings() 中的部分节点耗时相对应。
+     *
+     * @return float
+     */
+    public function getExecutionTime(): float
+    {
+        return $this->executionTime;
+    }
+
+    /**
+     * 记录节点耗时并通知监听器
+     *
+     * @param string $node 节点名
+     * @param float $duration 耗时（秒）
+     * @return void
+     */
+    private function recordNodeTiming(string $node, float $duration): void
+    {
+        $this->nodeTimings[] = ['node' => $node, 'duration' => $duration];
+        foreach ($this->timingListeners as $listener) {
+            $listener($node, $duration);
+        }
+    }
+
     /**
      * 执行图
      * 
@@ -98,6 +150,30 @@ class CompiledGraph
         ?string $threadId = null,
         array $interruptBefore = [],
         array $interruptAfter = []
+    ): \Generator {
+        $this->nodeTimings = [];
+        $this->executionTime = 0.0;
+        $startTime = microtime(true);
+
+        try {
+            return yield from $this->run($state, $threadId, $interruptBefore, $interruptAfter);
+        } finally {
+            // 执行失败（节点异常、超时、超过最大迭代次数）或中断时同样记录已耗时间
+            $this->executionTime = microtime(true) - $startTime;
+        }
+    }
+
+    /**
+     * 逐个执行节点并返回每一步的状态，参数同 stream()
+     *
+     * @return \Generator<StateInterface>
+     * @throws LangGraphException
+     */
+    private function run(
+        StateInterface $state,
+        ?string $threadId,
+        array $interruptBefore,
+        array $interruptAfter
     ): \Generator {
         // 如果定义了通道且使用的是ChannelsState，则创建带通道的状态
         if (!empty($this->channels) && $state instanceof State && $this->stateClass === ChannelsState::class) {
@@ -138,10 +214,21 @@ class CompiledGraph
             if (isset($this->streamNodes[$currentNode])) {
                 $action = $this->streamNodes[$currentNode];
                 try {
+                    // Forwarded by hand instead of `yield from` so the clock stops while the consumer handles
+                    // each chunk: like regular nodes, only the time spent inside the node is recorded
+                    $nodeStart = microtime(true);
                     $generator = $action($state->getData());
-                    yield from $generator;
+                    $generator->rewind();
+                    $duration = microtime(true) - $nodeStart;
+                    while ($generator->valid()) {
+                        $sent = yield $generator->key() => $generator->current();
+                        $resumed = microtime(true);
+                        $generator->send($sent);
+                        $duration += microtime(true) - $resumed;
+                    }
                     // After streaming, the last yielded value should be the final state from that node.
                     $state = $generator->getReturn() ?? $state; // In case the generator doesn't have a return value
+                    $this->recordNodeTiming($currentNode, $duration);
                 } catch (\Throwable $e) {
                     throw new NodeExecutionException($currentNode, "Error executing streaming node: {$currentNode}", [
                         'node' => $currentNode,
@@ -151,6 +238,7 @@ class CompiledGraph
 
             } elseif (isset($this->nodes[$currentNode])) {
                 $action = $this->nodes[$currentNode];
+                $nodeStart = microtime(true);
                 
                 try {
                     if (is_callable($action)) {
@@ -173,6 +261,8 @@ class CompiledGraph
                     ], 0, $e);
                 }
                 
+                // Measured before yielding, so time spent by the consumer is not attributed to the node
+                $this->recordNodeTiming($currentNode, microtime(true) - $nodeStart);
                 $state->merge(['_currentNode' => $currentNode]);
                 yield $state;
                 
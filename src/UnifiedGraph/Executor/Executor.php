@@ -12,6 +12,7 @@ class Executor
     protected $nodes = [];
     protected $edges = [];
     protected $startNode = null;
+    protected $nodeTimings = [];
     
     public function addNode(NodeInterface $node): void
     {
@@ -32,6 +33,16 @@ class Executor
         $this->startNode = $nodeName;
     }
     
+    /**
+     * 获取最近一次执行中每个节点的耗时
+     * 
+     * @return array 按执行顺序排列的 ['node' => 节点名, 'duration' => 耗时秒数]
+     */
+    public function getNodeTimings(): array
+    {
+        return $this->nodeTimings;
+    }
+    
     public function execute(StateInterface $state): StateInterface
     {
         if ($this->startNode === null) {
@@ -40,6 +51,7 @@ class Executor
         
         $currentNodeName = $this->startNode;
         $visitedNodes = [];
+        $this->nodeTimings = [];
         
         // 执行工作流直到没有可执行的边
         while ($currentNodeName !== null) {
@@ -58,8 +70,10 @@ class Executor
             $node = $this->nodes[$currentNodeName];
             
             // 执行节点
+            $nodeStart = microtime(true);
             $stateData = $node->execute($state->getData());
             $state->setData($stateData);
+            $this->nodeTimings[] = ['node' => $currentNodeName, 'duration' => microtime(true) - $nodeStart];
             
             // 查找下一个节点
             $currentNodeName = $this->getNextNode($currentNodeName, $state);
@@ -76,6 +90,7 @@ class Executor
 
         $currentNodeName = $this->startNode;
         $visitedNodes = [];
+        $this->nodeTimings = [];
 
         while ($currentNodeName !== null) {
             if (in_array($currentNodeName, $visitedNodes)) {
@@ -100,8 +115,10 @@ class Executor
                 $state->setData($lastStateData);
 
             } else {
+                $nodeStart = microtime(true);
                 $stateData = $node->execute($state->getData());
                 $state->setData($stateData);
+                $this->nodeTimings[] = ['node' => $currentNodeName, 'duration' => microtime(true) - $nodeStart];
                 yield $state;
             }
 
@@ -11,6 +11,7 @@ use App\Agent\Memory\ContextManager;
 use App\Agent\Communication\Message;
 use App\Agent\Communication\MessageQueue;
 use App\Agent\ErrorHandling\RetryMechanism;
+use App\Agent\Monitoring\ExecutionTracker;
 use PHPUnit\Framework\TestCase;
 
 class AgentTest extends TestCase
@@ -143,4 +144,48 @@ class AgentTest extends TestCase
         $this->assertEquals("Success on attempt 3", $result);
         $this->assertEquals(3, $attempts);
     }
-}
\ No newline at end of file
+
+    public function testExecutionTrackerTimings()
+    {
+        $tracker = new ExecutionTracker();
+        $tracker->recordTiming('planner', 0.25);
+        $tracker->logStep('planner', 'plan');
+        $tracker->recordTiming('writer', 0.5);
+        $tracker->recordTiming('planner', 0.125);
+        
+        // 按首次出现顺序汇总，logStep 记录不计入耗时
+        $timings = $tracker->getTimings();
+        $this->assertEquals(['planner', 'writer'], array_keys($timings));
+        $this->assertEquals(2, $timings['planner']['count']);
+        $this->assertEquals(0.375, $timings['planner']['duration']);
+        $this->assertEquals(1, $timings['writer']['count']);
+        $this->assertEquals(0.5, $timings['writer']['duration']);
+    }
+    
+    public function testExecutionTrackerServerTiming()
+    {
+        $tracker = new ExecutionTracker();
+        $tracker->recordTiming('planner', 0.25);
+        $tracker->recordTiming('writer', 0.5);
+        $tracker->recordTiming('planner', 0.125);
+        
+        // 额外指标排在前面，重复执行的节点带有次数说明
+        $this->assertEquals(
+            'graph;dur=1000.000, node_planner;dur=375.000;desc="x2", node_writer;dur=500.000',
+            $tracker->toServerTiming(['graph' => 1.0])
+        );
+    }
+    
+    public function testExecutionTrackerServerTimingSanitizesNames()
+    {
+        $tracker = new ExecutionTracker();
+        $tracker->recordTiming('fetch data:v2', 0.5);
+        $tracker->recordTiming('', 0.25);
+        
+        $this->assertEquals(
+            'total_time;dur=125.000, node_fetch_data_v2;dur=500.000, node_unnamed;dur=250.000',
+            $tracker->toServerTiming(['total time' => 0.125])
+        );
+        $this->assertEquals('', (new ExecutionTracker())->toServerTiming());
+    }
+}
@@ -6,6 +6,13 @@ use App\LangGraph\StateGraph;
 use App\LangGraph\Example\ExampleWorkflow;
 use App\LangGraph\Example\ChatbotWorkflow;
 use App\LangGraph\State\GraphState;
+use UnifiedGraph\StateGraph as UnifiedStateGraph;
+use UnifiedGraph\State\State;
+use UnifiedGraph\Executor\Executor;
+use UnifiedGraph\Node\CallableNode;
+use UnifiedGraph\Edge\Edge;
+use UnifiedGraph\Exception\LangGraphException;
+use UnifiedGraph\Exception\NodeExecutionException;
 use PHPUnit\Framework\TestCase;
 
 class LangGraphTest extends TestCase
@@ -96,4 +103,170 @@ class LangGraphTest extends TestCase
         $this->assertEquals('process_b', $data['step']); // 根据实际执行结果调整期望值
         $this->assertArrayNotHasKey('completed', $data); // end节点没有被执行
     }
-}
\ No newline at end of file
+
+    /**
+     * 构建 start -> work -> end 的三节点图
+     */
+    private function buildTimedGraph(): \UnifiedGraph\CompiledGraph
+    {
+        $graph = new UnifiedStateGraph(State::class);
+        $graph->addNode('start', function ($state) {
+            return ['step' => 'start'];
+        });
+        $graph->addNode('work', function ($state) {
+            usleep(2000);
+            return ['step' => 'work'];
+        });
+        $graph->addNode('end', function ($state) {
+            return ['step' => 'end'];
+        });
+        $graph->addEdge('start', 'work');
+        $graph->addEdge('work', 'end');
+        $graph->setEntryPoint('start');
+        $graph->setFinishPoint('end');
+
+        return $graph->compile();
+    }
+
+    public function testNodeTimingsAndListener()
+    {
+        $compiled = $this->buildTimedGraph();
+        $calls = [];
+        $compiled->onNodeTiming(function (string $node, float $duration) use (&$calls) {
+            $calls[] = [$node, $duration];
+        });
+
+        $compiled->execute(new State());
+
+        $timings = $compiled->getNodeTimings();
+        $this->assertEquals(['start', 'work', 'end'], array_column($timings, 'node'));
+        // 监听器对每个节点恰好调用一次，耗时与记录一致
+        $this->assertCount(3, $calls);
+        $this->assertEquals(array_column($timings, 'node'), array_column($calls, 0));
+        $this->assertEquals(array_column($timings, 'duration'), array_column($calls, 1));
+        $this->assertGreaterThanOrEqual(0.002, $timings[1]['duration']);
+        $this->assertGreaterThanOrEqual(array_sum(array_column($timings, 'duration')), $compiled->getExecutionTime());
+    }
+
+    public function testNodeTimingsResetBetweenRuns()
+    {
+        $compiled = $this->buildTimedGraph();
+        $calls = 0;
+        $compiled->onNodeTiming(function () use (&$calls) {
+            $calls++;
+        });
+
+        $compiled->execute(new State());
+        $firstTime = $compiled->getExecutionTime();
+        $compiled->execute(new State());
+
+        // 第二次执行只保留本次的节点耗时，监听器则每次都会被调用
+        $this->assertCount(3, $compiled->getNodeTimings());
+        $this->assertEquals(6, $calls);
+        $this->assertGreaterThan(0.0, $firstTime);
+        $this->assertGreaterThan(0.0, $compiled->getExecutionTime());
+    }
+
+    public function testExecutionTimeRecordedWhenNodeFails()
+    {
+        $graph = new UnifiedStateGraph(State::class);
+        $graph->addNode('start', function ($state) {
+            usleep(1000);
+            return ['step' => 'start'];
+        });
+        $graph->addNode('fail', function ($state) {
+            throw new \RuntimeException('boom');
+        });
+        $graph->addEdge('start', 'fail');
+        $graph->setEntryPoint('start');
+        $compiled = $graph->compile();
+
+        try {
+            $compiled->execute(new State());
+            $this->fail('Expected the failing node to throw');
+        } catch (NodeExecutionException $e) {
+            $this->assertEquals('fail', $e->getNodeKey());
+        }
+
+        // 部分节点耗时与截至失败时的总耗时同时可用
+        $this->assertEquals(['start'], array_column($compiled->getNodeTimings(), 'node'));
+        $this->assertGreaterThanOrEqual($compiled->getNodeTimings()[0]['duration'], $compiled->getExecutionTime());
+        $this->assertGreaterThan(0.0, $compiled->getExecutionTime());
+    }
+
+    public function testExecutionTimeRecordedWhenMaxIterationsReached()
+    {
+        $graph = new UnifiedStateGraph(State::class);
+        $graph->addNode('loop', function ($state) {
+            return ['count' => ($state['count'] ?? 0) + 1];
+        });
+        $graph->addConditionalEdges('loop', function ($state) {
+            return 'again';
+        }, ['again' => 'loop']);
+        $graph->setEntryPoint('loop');
+        $compiled = $graph->compile();
+
+        try {
+            $compiled->execute(new State());
+            $this->fail('Expected the loop to hit the iteration limit');
+        } catch (LangGraphException $e) {
+            $this->assertStringContainsString('Maximum iterations reached', $e->getMessage());
+        }
+
+        $this->assertCount(100, $compiled->getNodeTimings());
+        $this->assertGreaterThan(0.0, $compiled->getExecutionTime());
+    }
+
+    public function testStreamingNodeTimingExcludesConsumerTime()
+    {
+        $graph = new UnifiedStateGraph(State::class);
+        $graph->addNode('tokens', function ($state) {
+            return [];
+        });
+        $graph->addStreamNode('tokens', function (array $data) {
+            usleep(1000);
+            yield 'a';
+            usleep(1000);
+            yield 'b';
+        });
+        $graph->setEntryPoint('tokens');
+        $compiled = $graph->compile();
+
+        $chunks = [];
+        foreach ($compiled->stream(new State()) as $chunk) {
+            $chunks[] = $chunk;
+            // 消费者处理每个分块的时间不计入节点耗时
+            usleep(20000);
+        }
+
+        $this->assertEquals(['a', 'b'], $chunks);
+        $timings = $compiled->getNodeTimings();
+        $this->assertEquals(['tokens'], array_column($timings, 'node'));
+        $this->assertGreaterThanOrEqual(0.002, $timings[0]['duration']);
+        $this->assertLessThan(0.02, $timings[0]['duration']);
+        $this->assertGreaterThanOrEqual(0.04, $compiled->getExecutionTime());
+    }
+
+    public function testExecutorNodeTimings()
+    {
+        $executor = new Executor();
+        $executor->addNode(new CallableNode('a', function ($state) {
+            return ['a' => true];
+        }));
+        $executor->addNode(new CallableNode('b', function ($state) {
+            return ['b' => true];
+        }));
+        $executor->addEdge(new Edge('a', 'b'));
+        $executor->setStartNode('a');
+
+        $executor->execute(new State());
+        $this->assertEquals(['a', 'b'], array_column($executor->getNodeTimings(), 'node'));
+
+        // 每次执行都会重置耗时记录
+        $executor->execute(new State());
+        $this->assertCount(2, $executor->getNodeTimings());
+        foreach ($executor->getNodeTimings() as $timing) {
+            $this->assertGreaterThanOrEqual(0.0, $timing['duration']);
+        }
+    }
+}
@@ -4,10 +4,51 @@ namespace App\Tests\Model;
 
 use App\Model\Factory\ModelFactory;
 use App\Model\Config\ModelConfig;
+use App\Model\Client\AbstractModelClient;
+use App\Model\Client\DeepSeekClient;
+use App\Agent\ErrorHandling\RetryMechanism;
 use PHPUnit\Framework\TestCase;
 
 class ModelTest extends TestCase
 {
+    private $envBackup = [];
+    
+    protected function setUp(): void
+    {
+        // 备份并清除会影响工厂行为的环境变量
+        foreach (['DEEPSEEK_BASE_URL', 'QWEN_BASE_URL', 'MODEL_TIMEOUT', 'MODEL_RETRIES', 'MODEL_RETRY_DELAY'] as $name) {
+            $this->envBackup[$name] = getenv($name);
+            putenv($name);
+        }
+    }
+    
+    protected function tearDown(): void
+    {
+        foreach ($this->envBackup as $name => $value) {
+            putenv($value === false ? $name : "$name=$value");
+        }
+    }
+    
+    /**
+     * 读取客户端的请求超时设置
+     */
+    private function clientTimeout(AbstractModelClient $client): float
+    {
+        $property = new \ReflectionProperty(AbstractModelClient::class, 'timeout');
+        $property->setAccessible(true);
+        return (float) $property->getValue($client);
+    }
+    
+    /**
+     * 读取客户端的重试设置
+     */
+    private function clientRetryMechanism(AbstractModelClient $client): ?RetryMechanism
+    {
+        $property = new \ReflectionProperty(AbstractModelClient::class, 'retryMechanism');
+        $property->setAccessible(true);
+        return $property->getValue($client);
+    }
+    
     public function testModelFactoryCreation()
     {
         // 创建配置
@@ -73,4 +114,124 @@ class ModelTest extends TestCase
         $this->assertArrayHasKey('deepseek_api_key', $allConfig);
         $this->assertArrayHasKey('qwen_api_key', $allConfig);
     }
-}
\ No newline at end of file
+
+    public function testModelFactoryBaseUrlOverride()
+    {
+        $factory = new ModelFactory([
+            'deepseek_api_key' => 'test_key',
+            'qwen_api_key' => 'test_key',
+            'deepseek_base_url' => 'http://127.0.0.1:9000/v1'
+        ]);
+        
+        // 配置了 {type}_base_url 时使用覆盖地址
+        $this->assertEquals('http://127.0.0.1:9000/v1', $factory->createClient('deepseek')->getBaseUrl());
+        $this->assertEquals('http://127.0.0.1:9000/v1', $factory->createClient('deepseek-reasoner')->getBaseUrl());
+        
+        // 未配置时使用客户端默认地址
+        $this->assertEquals('https://dashscope.aliyuncs.com/compatible-mode/v1', $factory->createClient('qwen')->getBaseUrl());
+    }
+    
+    public function testModelFactoryBaseUrlFallsBackToEnvironment()
+    {
+        // 与 ChatGraphController 一致：未设置的 config() 值为 null
+        $config = [
+            'deepseek_api_key' => 'test_key',
+            'qwen_api_key' => 'test_key',
+            'deepseek_base_url' => null,
+            'qwen_base_url' => null,
+            'model_timeout' => null
+        ];
+        
+        // 既无配置也无环境变量时使用默认地址和默认超时
+        $factory = new ModelFactory($config);
+        $client = $factory->createClient('deepseek');
+        $this->assertEquals('https://api.deepseek.com', $client->getBaseUrl());
+        $this->assertEquals(60.0, $this->clientTimeout($client));
+        
+        // 配置为 null 时回退到环境变量
+        putenv('DEEPSEEK_BASE_URL=http://127.0.0.1:9001');
+        putenv('QWEN_BASE_URL=http://127.0.0.1:9002/v1');
+        $factory = new ModelFactory($config);
+        $this->assertEquals('http://127.0.0.1:9001', $factory->createClient('deepseek')->getBaseUrl());
+        $this->assertEquals('http://127.0.0.1:9002/v1', $factory->createClient('qwen')->getBaseUrl());
+        
+        // ModelConfig 同样从环境变量读取地址
+        $modelConfig = new ModelConfig(['deepseek_api_key' => 'test_key']);
+        $this->assertEquals('http://127.0.0.1:9001', $modelConfig->get('deepseek_base_url'));
+        $factory = new ModelFactory($modelConfig->all());
+        $this->assertEquals('http://127.0.0.1:9001', $factory->createClient('deepseek')->getBaseUrl());
+    }
+    
+    public function testModelFactoryTimeout()
+    {
+        // model_timeout 配置项
+        $factory = new ModelFactory([
+            'deepseek_api_key' => 'test_key',
+            'qwen_api_key' => 'test_key',
+            'model_timeout' => '2.5'
+        ]);
+        $this->assertEquals(2.5, $this->clientTimeout($factory->createClient('deepseek')));
+        $this->assertEquals(2.5, $this->clientTimeout($factory->createClient('qwen-max')));
+        
+        // MODEL_TIMEOUT 环境变量（配置为 null 时）
+        putenv('MODEL_TIMEOUT=5');
+        $factory = new ModelFactory([
+            'qwen_api_key' => 'test_key',
+            'model_timeout' => null
+        ]);
+        $this->assertEquals(5.0, $this->clientTimeout($factory->createClient('qwen')));
+        
+        $modelConfig = new ModelConfig(['qwen_api_key' => 'test_key']);
+        $this->assertEquals('5', $modelConfig->get('model_timeout'));
+        $factory = new ModelFactory($modelConfig->all());
+        $this->assertEquals(5.0, $this->clientTimeout($factory->createClient('qwen')));
+    }
+
+    public function testModelFactoryRetries()
+    {
+        // 默认不重试
+        $factory = new ModelFactory(['deepseek_api_key' => 'test_key', 'model_retries' => null]);
+        $this->assertNull($this->clientRetryMechanism($factory->createClient('deepseek')));
+        
+        // model_retries 配置项或 MODEL_RETRIES 环境变量启用重试
+        $factory = new ModelFactory(['deepseek_api_key' => 'test_key', 'model_retries' => '2']);
+        $this->assertInstanceOf(RetryMechanism::class, $this->clientRetryMechanism($factory->createClient('deepseek')));
+        
+        putenv('MODEL_RETRIES=1');
+        $modelConfig = new ModelConfig(['qwen_api_key' => 'test_key']);
+        $factory = new ModelFactory($modelConfig->all());
+        $this->assertInstanceOf(RetryMechanism::class, $this->clientRetryMechanism($factory->createClient('qwen')));
+    }
+    
+    public function testClientRetriesFailedRequests()
+    {
+        // 前两次请求失败、第三次成功的客户端
+        $client = new class('test_key') extends DeepSeekClient {
+            public $attempts = 0;
+            
+            protected function sendRequestOnce(string $endpoint, array $data): array
+            {
+                $this->attempts++;
+                if ($this->attempts < 3) {
+                    throw new \RuntimeException('HTTP Error 503: unavailable');
+                }
+                return ['choices' => [['message' => ['content' => 'ok']]]];
+            }
+        };
+        
+        $client->setRetryMechanism(new RetryMechanism(2, 1));
+        $this->assertEquals('ok', $client->chatComplete([['role' => 'user', 'content' => 'hi']]));
+        $this->assertEquals(3, $client->attempts);
+        
+        // 不重试时第一次失败即抛出异常
+        $client->attempts = 0;
+        $client->setRetryMechanism(null);
+        try {
+            $client->chatComplete([['role' => 'user', 'content' => 'hi']]);
+            $this->fail('Expected the request to fail without retries');
+        } catch (\RuntimeException $e) {
+            $this->assertStringContainsString('503', $e->getMessage());
+        }
+        $this->assertEquals(1, $client->attempts);
+    }
+}